@@ -0,0 +1,43 @@
+"""Адміністративні команди: python -m app.cli snapshot --out ./snapshots"""
+import argparse
+import json
+import sys
+from app.core.config import settings
+from app.core.db import init_db, SessionLocal
+from app.services.snapshot_service import SOURCES, SnapshotUnavailable, SnapshotInProgress, export_snapshot
+
+
+def _snapshot(args) -> int:
+    init_db()
+    try:
+        report = export_snapshot(
+            SessionLocal,
+            args.out,
+            tables=args.tables,
+            chunk_size=args.chunk_size,
+            full=args.full,
+        )
+    except (SnapshotUnavailable, SnapshotInProgress, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(report, indent=2, default=str))
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    snapshot = commands.add_parser("snapshot", help="Export tables to Parquet for offline analytics")
+    snapshot.add_argument("--out", default=settings.snapshot_dir, help="Snapshot directory")
+    snapshot.add_argument("--tables", nargs="+", choices=list(SOURCES), help="Datasets to export (default: all)")
+    snapshot.add_argument("--chunk-size", type=int, default=settings.snapshot_chunk_size, help="Rows per read/row group")
+    snapshot.add_argument("--full", action="store_true", help="Ignore watermarks and export everything")
+    snapshot.set_defaults(handler=_snapshot)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
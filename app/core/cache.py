@@ -0,0 +1,151 @@
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from app.core.config import settings
+
+
+class CacheBackend(ABC):
+    """Сховище байтів за ключем; спільний бекенд (Redis тощо) реалізує ці ж методи"""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+class LRUCacheBackend(CacheBackend):
+    """In-process LRU, безпечний для потоків threadpool"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ProjectDetailCache:
+    """Кеш готового JSON для GET /projects/{id}.
+
+    Запис несе версію проекту, тож навіть пропущена інвалідація не віддасть застарілі дані:
+    такий запис рахується як stale і перебудовується.
+    """
+
+    # версія проекту + час запису
+    _HEADER = struct.Struct(">qd")
+
+    def __init__(self, backend: CacheBackend | None):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.stale = 0
+            self.invalidations = 0
+            self._age_total = 0.0
+            self.max_age = 0.0
+
+    @staticmethod
+    def _key(project_id: int) -> str:
+        return f"project_detail:{project_id}"
+
+    def get(self, project_id: int, version: int) -> bytes | None:
+        if self.backend is None:
+            return None
+        raw = self.backend.get(self._key(project_id))
+        if raw is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        cached_version, stored_at = self._HEADER.unpack_from(raw)
+        if cached_version != version:
+            with self._lock:
+                self.stale += 1
+                self.misses += 1
+            return None
+
+        age = time.time() - stored_at
+        with self._lock:
+            self.hits += 1
+            self._age_total += age
+            self.max_age = max(self.max_age, age)
+        return raw[self._HEADER.size:]
+
+    def set(self, project_id: int, version: int, body: bytes) -> None:
+        if self.backend is not None:
+            self.backend.set(self._key(project_id), self._HEADER.pack(version, time.time()) + body)
+
+    def invalidate(self, project_id: int) -> None:
+        if self.backend is not None:
+            self.backend.delete(self._key(project_id))
+            with self._lock:
+                self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__ if self.backend is not None else None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "stale": self.stale,
+                "invalidations": self.invalidations,
+                "avg_hit_age_seconds": round(self._age_total / self.hits, 3) if self.hits else 0.0,
+                "max_hit_age_seconds": round(self.max_age, 3),
+            }
+
+
+def _default_backend() -> CacheBackend | None:
+    if settings.project_cache_backend == "none":
+        return None
+    return LRUCacheBackend(settings.project_cache_size)
+
+
+project_cache = ProjectDetailCache(_default_backend())
+
+
+def set_project_cache_backend(backend: CacheBackend | None) -> None:
+    """Підмінити бекенд (спільний кеш у проді, локальна заглушка в тестах)"""
+    project_cache.backend = backend
+    project_cache.reset_stats()
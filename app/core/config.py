@@ -5,6 +5,63 @@ class Settings(BaseSettings):
     database_url: str = "sqlite:///./app.db"
     api_key: str = "dev-api-key-12345"
     artic_api_base_url: str = "https://api.artic.edu/api/v1"
+    bulk_chunk_size: int = 100
+    max_places_per_project: int = 10
+    # Скільки місць вбудовується в ProjectDetailOut; решта - через GET /projects/{id}/places
+    project_detail_places_limit: int = 100
+    import_batch_size: int = 500
+    # Довший рядок NDJSON-імпорту не буферизується, а стає помилкою цього рядка
+    import_max_line_bytes: int = 1_048_576
+    # "memory" - in-process LRU, "none" - вимкнено
+    project_cache_backend: str = "memory"
+    project_cache_size: int = 1024
+    idempotency_ttl_seconds: int = 24 * 60 * 60
+    idempotency_purge_interval_seconds: int = 60 * 60
+    # Скільки живе резерв ключа, якщо процес впав, не дочекавшись відповіді
+    idempotency_pending_seconds: int = 60
+    project_job_workers: int = 4
+    project_job_queue_size: int = 1000
+    # Повтор перевірки pending-проекту, поки ArtIC недоступний: 5 с, 10 с, ... до 5 хв
+    project_job_retry_base_seconds: float = 5
+    project_job_retry_max_seconds: float = 300
+    # Групові коміти для PATCH /projects/{id}/places/{place_id}
+    group_commit_enabled: bool = False
+    group_commit_interval_ms: float = 5
+    group_commit_max_batch: int = 100
+    artwork_catalog_flush_interval_seconds: float = 30
+    stats_reconcile_interval_seconds: float = 3600
+    # SSE GET /projects/{id}/events: скільки останніх подій проекту доступні для Last-Event-ID
+    project_events_buffer_size: int = 100
+    project_events_heartbeat_seconds: float = 15
+    # Заголовки X-DB-Queries / X-DB-Time-Ms у відповідях
+    debug: bool = False
+    # Попередження в лог: запит виконав більше SQL-запитів або повторив один запит стільки разів (N+1)
+    query_count_warn_threshold: int = 30
+    query_repeat_warn_threshold: int = 10
+    # Агрегати SQL-запитів за відбитком для GET /admin/slow-queries і план запитів, довших за поріг
+    slow_query_log_enabled: bool = False
+    slow_query_threshold_ms: float = 100
+    slow_query_max_fingerprints: int = 1000
+    # Потоки AnyIO для sync-обробників і залежностей (за замовчуванням AnyIO - 40)
+    threadpool_size: int = 40
+    # Монітор затримки event loop і черги threadpool
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_seconds: float = 0.25
+    loop_stall_threshold_ms: float = 100
+    # Профілювання запиту за заголовком X-Profile (разом з X-API-Key); профілі - в GET /admin/profiles
+    profiling_enabled: bool = True
+    profile_sample_interval_ms: float = 2
+    profile_max_seconds: float = 30
+    profile_store_size: int = 20
+    # Спани запитів, SQL і викликів ArtIC: кільцевий буфер для GET /admin/traces і, за бажанням, JSONL-файл
+    tracing_enabled: bool = False
+    tracing_buffer_size: int = 10000
+    tracing_file: str | None = None
+    # Лічильники й гістограми для GET /metrics
+    metrics_enabled: bool = True
+    # Parquet-знімки для аналітики (потрібен pyarrow)
+    snapshot_dir: str = "./snapshots"
+    snapshot_chunk_size: int = 10000
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,13 +1,146 @@
-from sqlalchemy import create_engine
+import logging
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from sqlalchemy import create_engine, event, inspect, update
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from app.core.config import settings
+from app.core.metrics import db_pool_checkout_wait
+from app.core.slow_queries import slow_query_log
+from app.core.tracing import tracer
 
-engine = create_engine(settings.database_url, connect_args={"check_same_thread": False})
+logger = logging.getLogger(__name__)
+
+
+def timed_pool_class(database_url: str):
+    """Пул діалекту за замовчуванням, що міряє очікування вільного з'єднання"""
+    url = make_url(database_url)
+    base = url.get_dialect().get_pool_class(url)
+
+    class TimedPool(base):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                db_pool_checkout_wait.observe(time.perf_counter() - started)
+
+    return TimedPool
+
+
+@dataclass
+class QueryStats:
+    """SQL-запити одного HTTP-запиту: кількість, сумарний час і повтори однакових запитів"""
+    count: int = 0
+    seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def merge(self, other: "QueryStats") -> None:
+        self.count += other.count
+        self.seconds += other.seconds
+        self.statements.update(other.statements)
+
+
+# Встановлюється middleware на час запиту; threadpool копіює контекст, тож sync-обробники
+# пишуть у той самий об'єкт. Поза запитом (фонові задачі) - None, і нічого не рахується
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+# before/after_cursor_execute викликаються в одному потоці; conn.info не підходить, бо одне
+# з'єднання (StaticPool, SQLite в пам'яті) можуть по черзі використовувати кілька потоків
+_cursor_timer = threading.local()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if tracer.enabled:
+        _cursor_timer.started_ns = time.time_ns()
+    _cursor_timer.started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(_cursor_timer, "started", None)
+    if started is None:
+        return
+    _cursor_timer.started = None
+    seconds = time.perf_counter() - started
+    stats = query_stats.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+    if settings.slow_query_log_enabled:
+        slow_query_log.record(conn, statement, parameters, seconds, executemany, settings.slow_query_threshold_ms)
+    if tracer.enabled:
+        tracer.record("db.query", _cursor_timer.started_ns, seconds, **{"db.statement": statement[:1000]})
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Рахувати запити й час БД рушія в QueryStats поточного запиту, журналі повільних запитів і трасі"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+engine = create_engine(
+    settings.database_url,
+    connect_args={"check_same_thread": False},
+    poolclass=timed_pool_class(settings.database_url),
+)
+instrument_engine(engine)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 class Base(DeclarativeBase):
     pass
 
+# Колонки, додані до вже наявних таблиць: create_all існуючу таблицю не змінює
+_ADDED_COLUMNS = {
+    "projects": {
+        "status": "VARCHAR(16) NOT NULL DEFAULT 'active'",
+        "status_detail": "TEXT",
+        "version": "INTEGER NOT NULL DEFAULT 1",
+        # ADD COLUMN NOT NULL потребує сталого значення; справжній час проставляється нижче
+        "updated_at": "DATETIME NOT NULL DEFAULT '1970-01-01 00:00:00'",
+    },
+    "project_places": {
+        "updated_at": "DATETIME NOT NULL DEFAULT '1970-01-01 00:00:00'",
+    },
+}
+
+def upgrade_schema(connection) -> list[str]:
+    """Довести базу, створену старішою версією, до поточних моделей: колонки й індекси.
+
+    Ідемпотентно: на актуальній базі нічого не змінює. Повертає додані колонки.
+    """
+    inspector = inspect(connection)
+    added = []
+    for table_name, columns in _ADDED_COLUMNS.items():
+        if not inspector.has_table(table_name):
+            continue
+        existing = {c["name"] for c in inspector.get_columns(table_name)}
+        for name, ddl in columns.items():
+            if name not in existing:
+                connection.exec_driver_sql(f"ALTER TABLE {table_name} ADD COLUMN {name} {ddl}")
+                added.append(f"{table_name}.{name}")
+    for table_name in ("projects", "project_places"):
+        if f"{table_name}.updated_at" in added:
+            connection.execute(update(Base.metadata.tables[table_name]).values(updated_at=datetime.now(timezone.utc)))
+    # Індекси наявних таблиць create_all теж не додає
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+    if added:
+        logger.info(f"Upgraded database schema, added columns: {', '.join(added)}")
+    return added
+
 def init_db():
-    from app.models import project, place  # noqa: F401
-    Base.metadata.create_all(bind=engine)
+    from app.models import project, place, idempotency, artwork, stats, search  # noqa: F401
+    with engine.begin() as connection:
+        Base.metadata.create_all(bind=connection)
+        upgrade_schema(connection)
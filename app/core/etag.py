@@ -0,0 +1,19 @@
+import hashlib
+import json
+
+
+def make_etag(project_id: int, version: int, params: dict | None = None) -> str:
+    """params - query-параметри, від яких залежить відповідь: різні сторінки/фільтри - різні ETag"""
+    if params is None:
+        return f'"{project_id}-{version}"'
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    return f'"{project_id}-{version}-{digest}"'
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Перевірка If-None-Match (RFC 9110: слабке порівняння, список або *)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
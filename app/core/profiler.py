@@ -0,0 +1,142 @@
+"""Семплюючий профайлер одного запиту: стеки у форматі collapsed (flamegraph.pl, speedscope).
+
+Більшість обробників - sync і виконуються в потоках AnyIO, тож cProfile в потоці event loop їх
+не побачив би. Натомість окремий потік кожні `interval` секунд читає стеки всіх потоків:
+потік loop - лише коли на ньому виконується задача запиту, інші - якщо вони не простоюють.
+Паралельні запити в потоках теж потрапляють у профіль, тому корінь стеку - ім'я потоку.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from app.core.config import settings
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Потік простоює (чекає на роботу чи лок), якщо найглибший кадр - в одному з цих модулів
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py")
+
+
+def _frame_name(code) -> str:
+    filename = code.co_filename
+    if filename.startswith(_ROOT):
+        filename = os.path.relpath(filename, _ROOT)
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename})"
+
+
+def _collapse(frame) -> list[str]:
+    stack = []
+    while frame is not None:
+        stack.append(_frame_name(frame.f_code))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float, max_seconds: float):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.samples = 0
+        self.stacks: Counter[str] = Counter()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._loop_thread = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.max_seconds
+        own = threading.get_ident()
+        names = {}
+        while not self._stopped.wait(self.interval) and time.monotonic() < deadline:
+            on_loop = asyncio.current_task(self._loop) is self._task
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                if thread_id == self._loop_thread:
+                    if not on_loop:
+                        continue
+                elif frame.f_code.co_filename.endswith(_IDLE_FILES):
+                    continue
+                if thread_id not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack = [names.get(thread_id, str(thread_id)), *_collapse(frame)]
+                self.stacks[";".join(stack)] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+@dataclass
+class StoredProfile:
+    id: str
+    method: str
+    path: str
+    route: str
+    status_code: int
+    duration_ms: float
+    samples: int
+    created_at: datetime
+    collapsed: str = field(repr=False)
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status_code": self.status_code,
+            "duration_ms": self.duration_ms,
+            "samples": self.samples,
+            "created_at": self.created_at,
+        }
+
+
+class ProfileStore:
+    """Останні профілі в пам'яті процесу"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._profiles: OrderedDict[str, StoredProfile] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex[:16]
+
+    def add(self, profile: StoredProfile) -> None:
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.maxsize:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> StoredProfile | None:
+        return self._profiles.get(profile_id)
+
+    def list(self) -> list[dict]:
+        with self._lock:
+            return [p.summary() for p in reversed(self._profiles.values())]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+
+profile_store = ProfileStore(settings.profile_store_size)
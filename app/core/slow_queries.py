@@ -0,0 +1,150 @@
+"""Журнал повільних SQL-запитів: агрегати за відбитком запиту і план для тих, що перевищили поріг.
+
+Відбиток - текст запиту без літералів і з однаковою формою для IN-списків і багаторядкових VALUES,
+тож `IN (?, ?)` і `IN (?, ?, ?)` потрапляють в один рядок звіту. План знімається один раз на
+відбиток, на першому повільному виконанні.
+"""
+import logging
+import re
+import threading
+from collections import OrderedDict
+from app.core.config import settings
+
+logger = logging.getLogger("app.db")
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_VALUES_ROWS = re.compile(r"\bVALUES\s*(\([\s?,]*\))(?:\s*,\s*\([\s?,]*\))*", re.I)
+_WHITESPACE = re.compile(r"\s+")
+
+_EXPLAINABLE = ("select", "with", "update", "delete", "insert")
+
+
+def fingerprint(statement: str) -> str:
+    """Нормалізований текст запиту, однаковий для запитів, що відрізняються лише значеннями"""
+    sql = _COMMENTS.sub(" ", statement)
+    sql = _STRINGS.sub("?", sql)
+    sql = _PLACEHOLDERS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    sql = _IN_LISTS.sub("IN (...)", sql)
+    sql = _VALUES_ROWS.sub(r"VALUES \1, ...", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def explain(conn, statement: str, parameters) -> list[str]:
+    """План запиту окремим DBAPI-курсором того ж з'єднання: без подій рушія і в тій самій транзакції.
+
+    Звичайний EXPLAIN (без ANALYZE) запит не виконує.
+    """
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        # SQLite: (id, parent, notused, detail); PostgreSQL та інші - один стовпець з рядком плану
+        return [str(row[-1]) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+class _Entry:
+    __slots__ = ("calls", "total", "max", "slow_calls", "plan", "plan_ms")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slow_calls = 0
+        self.plan: list[str] | None = None
+        self.plan_ms: float | None = None
+
+
+class SlowQueryLog:
+    _SORT_KEYS = {
+        "total": lambda e: e.total,
+        "mean": lambda e: e.total / e.calls,
+        "max": lambda e: e.max,
+        "calls": lambda e: e.calls,
+        "slow": lambda e: e.slow_calls,
+    }
+
+    def __init__(self, max_fingerprints: int = 1000):
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            # Порядок - від найдавніше баченого відбитка до останнього
+            self._entries: OrderedDict[str, _Entry] = OrderedDict()
+            self.evicted = 0
+
+    def _entry(self, key: str) -> _Entry:
+        entry = self._entries.get(key)
+        if entry is None:
+            if len(self._entries) >= self.max_fingerprints:
+                # Витісняємо найдавніше бачений відбиток. Не найдешевший: новий відбиток з малим total
+                # витіснявся б першим і ніколи не набрав би статистики
+                self._entries.popitem(last=False)
+                self.evicted += 1
+            entry = self._entries[key] = _Entry()
+        else:
+            self._entries.move_to_end(key)
+        return entry
+
+    def record(self, conn, statement: str, parameters, seconds: float, executemany: bool, threshold_ms: float) -> None:
+        key = fingerprint(statement)
+        slow = seconds * 1000 >= threshold_ms
+        with self._lock:
+            entry = self._entry(key)
+            entry.calls += 1
+            entry.total += seconds
+            entry.max = max(entry.max, seconds)
+            if slow:
+                entry.slow_calls += 1
+            need_plan = slow and entry.plan is None
+            if need_plan:
+                # Резервуємо, щоб паралельні повільні виконання не знімали план удруге
+                entry.plan = []
+        if not slow:
+            return
+
+        logger.warning(f"Slow query {seconds * 1000:.1f} ms: {key[:200]}")
+        if not need_plan:
+            return
+        if executemany or not statement.lstrip().lower().startswith(_EXPLAINABLE):
+            plan = []
+        else:
+            try:
+                plan = explain(conn, statement, parameters)
+            except Exception as e:
+                plan = [f"EXPLAIN failed: {e}"]
+        with self._lock:
+            entry.plan = plan
+            entry.plan_ms = round(seconds * 1000, 3)
+
+    def report(self, sort: str = "total", limit: int = 20) -> list[dict]:
+        with self._lock:
+            entries = sorted(self._entries.items(), key=lambda item: self._SORT_KEYS[sort](item[1]), reverse=True)[:limit]
+            return [
+                {
+                    "fingerprint": key,
+                    "calls": e.calls,
+                    "total_ms": round(e.total * 1000, 3),
+                    "mean_ms": round(e.total * 1000 / e.calls, 3),
+                    "max_ms": round(e.max * 1000, 3),
+                    "slow_calls": e.slow_calls,
+                    "plan": e.plan or None,
+                    "plan_ms": e.plan_ms,
+                }
+                for key, e in entries
+            ]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"fingerprints": len(self._entries), "evicted": self.evicted}
+
+
+slow_query_log = SlowQueryLog(settings.slow_query_max_fingerprints)
@@ -0,0 +1,187 @@
+"""Локальне трасування: спани запиту, SQL-запитів, викликів ArtIC і функцій project_service.
+
+Без зовнішнього колектора: готові спани лягають у кільцевий буфер (GET /admin/traces) і,
+якщо задано TRACING_FILE, дописуються JSON-рядками у файл. Контекст трасування передається
+заголовком W3C `traceparent`: вхідний продовжує трасу клієнта, вихідний іде в ArtIC.
+Вимкнений трасувальник коштує одну перевірку прапорця на спан.
+"""
+import functools
+import inspect
+import json
+import random
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from app.core.config import settings
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    name: str
+    start_us: int
+    duration_ms: float = 0.0
+    status: str = "ok"
+    attributes: dict = field(default_factory=dict)
+    # Без батька в цьому процесі (запит, фонова задача); parent_id може вказувати на віддалений спан
+    local_root: bool = False
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_us": self.start_us,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+# Поточний спан; threadpool копіює контекст, тож sync-код обробника бачить спан запиту
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str] | None:
+    """(trace_id, parent span_id) із заголовка traceparent; None - якщо заголовок невалідний"""
+    match = _TRACEPARENT.match(value.strip().lower()) if value else None
+    if match is None or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return match.group(1), match.group(2)
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Tracer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.configure(enabled=False)
+
+    def configure(self, enabled: bool, buffer_size: int = 10000, file_path: str | None = None) -> None:
+        with self._lock:
+            self.enabled = enabled
+            self._spans: deque[Span] = deque(maxlen=buffer_size)
+            self._file_path = file_path
+            self._file = None
+
+    def start_span(self, name: str, parent: tuple[str, str] | None = None, **attributes) -> Span:
+        """Новий спан-нащадок поточного; parent - (trace_id, span_id) віддаленого батька"""
+        current = current_span.get()
+        if current is not None:
+            trace_id, parent_id = current.trace_id, current.span_id
+        elif parent is not None:
+            trace_id, parent_id = parent
+        else:
+            trace_id, parent_id = _new_id(128), None
+        return Span(
+            trace_id, _new_id(64), parent_id, name, time.time_ns() // 1000,
+            attributes=attributes, local_root=current is None,
+        )
+
+    @contextmanager
+    def span(self, name: str, parent: tuple[str, str] | None = None, **attributes):
+        """Спан навколо блоку коду; вкладені спани (і SQL-запити) стають його нащадками"""
+        if not self.enabled:
+            yield None
+            return
+        span = self.start_span(name, parent, **attributes)
+        token = current_span.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.attributes["error"] = type(e).__name__
+            raise
+        finally:
+            span.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+            current_span.reset(token)
+            self.export(span)
+
+    def record(self, name: str, started_ns: int, seconds: float, **attributes) -> None:
+        """Готовий спан-лист (SQL-запит) під поточним спаном; поза трасою нічого не пише"""
+        current = current_span.get()
+        if current is None:
+            return
+        span = Span(current.trace_id, _new_id(64), current.span_id, name, started_ns // 1000, round(seconds * 1000, 3), attributes=attributes)
+        self.export(span)
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+            if self._file_path is None:
+                return
+            if self._file is None:
+                self._file = open(self._file_path, "a", encoding="utf-8")
+            self._file.write(json.dumps(span.to_dict(), separators=(",", ":")) + "\n")
+            # Локальний корінь закінчується останнім: скидаємо буфер файлу раз на запит,
+            # зокрема й тоді, коли траса прийшла від клієнта в traceparent
+            if span.local_root:
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def traces(self, limit: int = 20) -> list[dict]:
+        """Останні траси з буфера: локальний кореневий спан і кількість спанів"""
+        with self._lock:
+            spans = list(self._spans)
+        traces: OrderedDict[str, dict] = OrderedDict()
+        for span in reversed(spans):
+            trace = traces.setdefault(span.trace_id, {"trace_id": span.trace_id, "root": None, "spans": 0})
+            trace["spans"] += 1
+            if trace["root"] is None and span.local_root:
+                trace["root"] = {"name": span.name, "start_us": span.start_us, "duration_ms": span.duration_ms, "status": span.status}
+        return list(traces.values())[:limit]
+
+    def trace(self, trace_id: str) -> list[dict]:
+        with self._lock:
+            spans = [s for s in self._spans if s.trace_id == trace_id]
+        return [s.to_dict() for s in sorted(spans, key=lambda s: s.start_us)]
+
+
+tracer = Tracer()
+tracer.configure(settings.tracing_enabled, settings.tracing_buffer_size, settings.tracing_file)
+
+
+def traced(name: str | None = None):
+    """Декоратор: виклик функції (sync чи async) - окремий спан"""
+
+    def decorate(func):
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not tracer.enabled:
+                    return await func(*args, **kwargs)
+                with tracer.span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorate
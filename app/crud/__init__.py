@@ -1,4 +1,8 @@
 from . import project
 from . import place
+from . import idempotency
+from . import search
+from . import artwork
+from . import stats
 
-__all__ = ["project", "place"]
+__all__ = ["project", "place", "idempotency", "search", "artwork", "stats"]
@@ -0,0 +1,29 @@
+from collections.abc import Iterator
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app.models import Artwork, ProjectPlace
+
+
+def upsert_many(db: Session, rows: list[dict]) -> None:
+    stmt = insert(Artwork)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Artwork.id],
+        set_={"title": stmt.excluded.title, "artist_title": stmt.excluded.artist_title, "updated_at": stmt.excluded.updated_at},
+    )
+    db.execute(stmt, rows)
+    db.commit()
+
+def iter_catalog(db: Session, batch_size: int = 1000) -> Iterator[tuple[str, str | None, str | None]]:
+    """Каталог плюс назви з місць, яких у каталозі ще немає (збережені до появи каталогу)"""
+    stmt = select(Artwork.id, Artwork.title, Artwork.artist_title).execution_options(yield_per=batch_size)
+    yield from db.execute(stmt)
+
+    places = (
+        select(ProjectPlace.external_id, ProjectPlace.title)
+        .where(ProjectPlace.title.is_not(None), ProjectPlace.external_id.not_in(select(Artwork.id)))
+        .distinct()
+        .execution_options(yield_per=batch_size)
+    )
+    for external_id, title in db.execute(places):
+        yield external_id, title, None
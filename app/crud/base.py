@@ -1,5 +1,6 @@
 from typing import TypeVar, Type
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
 
 ModelType = TypeVar("ModelType")
 
@@ -17,6 +18,17 @@ def get(db: Session, model: Type[ModelType], id: int) -> ModelType | None:
     return db.get(model, id)
 
 
+def order_by_param(columns: dict[str, ColumnElement], sort: str, tiebreaker: ColumnElement) -> list:
+    """Перетворити параметр sort ("name" / "-name") на ORDER BY зі стабільним tiebreaker-ом"""
+    descending = sort.startswith("-")
+    column = columns[sort.lstrip("-")]
+    if column is tiebreaker:
+        return [column.desc() if descending else column.asc()]
+    if descending:
+        return [column.desc(), tiebreaker.desc()]
+    return [column.asc(), tiebreaker.asc()]
+
+
 def delete(db: Session, instance: ModelType) -> None:
     """Видалити запис"""
     db.delete(instance)
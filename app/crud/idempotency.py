@@ -0,0 +1,61 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, update
+from sqlalchemy.dialects.sqlite import insert
+from app.models import IdempotencyKey
+
+
+def get_valid(db: Session, key: str, scope: str, now: datetime) -> IdempotencyKey | None:
+    stmt = select(IdempotencyKey).where(
+        IdempotencyKey.key == key,
+        IdempotencyKey.scope == scope,
+        IdempotencyKey.expires_at > now,
+    )
+    return db.scalars(stmt).first()
+
+# status_code зарезервованого ключа, відповідь на який ще рахується
+PENDING = 0
+
+def reserve(db: Session, key: str, scope: str, request_hash: str, now: datetime, expires_at: datetime) -> bool:
+    """Зайняти ключ до виконання запиту; False - вже є чинний запис (готовий чи зарезервований).
+
+    Прострочений запис, ще не видалений purge_expired, замінюється.
+    """
+    stmt = insert(IdempotencyKey).values(
+        key=key,
+        scope=scope,
+        request_hash=request_hash,
+        status_code=PENDING,
+        body="",
+        expires_at=expires_at,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.key, IdempotencyKey.scope],
+        set_={name: stmt.excluded[name] for name in ("request_hash", "status_code", "body", "expires_at")},
+        where=IdempotencyKey.expires_at <= now,
+    )
+    reserved = db.execute(stmt).rowcount == 1
+    db.commit()
+    return reserved
+
+def complete(db: Session, key: str, scope: str, status_code: int, body: str, expires_at: datetime) -> None:
+    db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.key == key, IdempotencyKey.scope == scope)
+        .values(status_code=status_code, body=body, expires_at=expires_at)
+    )
+    db.commit()
+
+def release(db: Session, key: str, scope: str) -> None:
+    """Зняти резерв після помилки: повтор з тим самим ключем виконається заново"""
+    db.execute(delete(IdempotencyKey).where(
+        IdempotencyKey.key == key,
+        IdempotencyKey.scope == scope,
+        IdempotencyKey.status_code == PENDING,
+    ))
+    db.commit()
+
+def purge_expired(db: Session, now: datetime) -> int:
+    result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now))
+    db.commit()
+    return result.rowcount
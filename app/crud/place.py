@@ -1,25 +1,113 @@
+from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
-from app.models import ProjectPlace
+from sqlalchemy import select, func, insert, delete, exists, and_, Select
+from app.models import Project, ProjectPlace
+from .base import order_by_param
 
+SORT_COLUMNS = {"id": ProjectPlace.id, "visited_at": ProjectPlace.visited_at}
 
-def list_for_project(db: Session, project_id: int, limit: int, offset: int) -> list[ProjectPlace]:
+
+def list_for_project_stmt(
+    project_id: int,
+    visited: bool | None = None,
+    visited_from: datetime | None = None,
+    visited_to: datetime | None = None,
+    sort: str = "-id",
+) -> Select:
     stmt = (
         select(ProjectPlace)
         .where(ProjectPlace.project_id == project_id)
-        .order_by(ProjectPlace.id.desc())
+        .order_by(*order_by_param(SORT_COLUMNS, sort, ProjectPlace.id))
+    )
+    if visited is not None:
+        stmt = stmt.where(ProjectPlace.visited == visited)
+    if visited_from is not None:
+        stmt = stmt.where(ProjectPlace.visited_at >= visited_from)
+    if visited_to is not None:
+        stmt = stmt.where(ProjectPlace.visited_at <= visited_to)
+    return stmt
+
+def list_for_project(db: Session, project_id: int, limit: int, offset: int, **filters) -> list[ProjectPlace]:
+    stmt = list_for_project_stmt(project_id, **filters).limit(limit).offset(offset)
+    return list(db.scalars(stmt).all())
+
+def list_for_projects_stmt(project_ids: list[int], limit: int) -> Select:
+    """Перші limit місць (за id) кожного з проектів.
+
+    Для кожного проекту - окремий LIMIT по ix_project_places_project_id, тож великі проекти
+    не читаються цілком.
+    """
+    first_ids = (
+        select(ProjectPlace.id)
+        .where(ProjectPlace.project_id == Project.id)
+        .order_by(ProjectPlace.id)
         .limit(limit)
-        .offset(offset)
+        .correlate(Project)
+    )
+    return (
+        select(ProjectPlace)
+        .join(Project, ProjectPlace.id.in_(first_ids.scalar_subquery()))
+        .where(Project.id.in_(project_ids))
+        .order_by(ProjectPlace.project_id, ProjectPlace.id)
+    )
+
+def list_for_projects(db: Session, project_ids: list[int], limit: int) -> list[ProjectPlace]:
+    return list(db.scalars(list_for_projects_stmt(project_ids, limit)).all())
+
+def count_for_projects(db: Session, project_ids: list[int]) -> dict[int, int]:
+    stmt = (
+        select(ProjectPlace.project_id, func.count())
+        .where(ProjectPlace.project_id.in_(project_ids))
+        .group_by(ProjectPlace.project_id)
+    )
+    return dict(db.execute(stmt).all())
+
+def get_many_for_project(db: Session, project_id: int, place_ids: list[int]) -> list[ProjectPlace]:
+    stmt = select(ProjectPlace).where(
+        ProjectPlace.project_id == project_id,
+        ProjectPlace.id.in_(place_ids),
     )
     return list(db.scalars(stmt).all())
 
+def get_many_by_ids(db: Session, place_ids: list[int]) -> list[ProjectPlace]:
+    return list(db.scalars(select(ProjectPlace).where(ProjectPlace.id.in_(place_ids))).all())
+
 def count_for_project(db: Session, project_id: int) -> int:
     stmt = select(func.count()).select_from(ProjectPlace).where(ProjectPlace.project_id == project_id)
     return int(db.scalar(stmt) or 0)
 
 def exists_external(db: Session, project_id: int, external_id: str) -> bool:
-    stmt = select(func.count()).select_from(ProjectPlace).where(
+    stmt = select(exists().where(
         ProjectPlace.project_id == project_id,
         ProjectPlace.external_id == external_id,
-    )
-    return (db.scalar(stmt) or 0) > 0
+    ))
+    return bool(db.scalar(stmt))
+
+def is_completed_stmt(project_id: int) -> Select:
+    # Обидва EXISTS - пошук по префіксу ix_project_places_project_visited, без обходу місць
+    return select(and_(
+        exists().where(ProjectPlace.project_id == project_id),
+        ~exists().where(ProjectPlace.project_id == project_id, ProjectPlace.visited.is_(False)),
+    ))
+
+def is_completed(db: Session, project_id: int) -> bool:
+    """Є хоча б одне місце і всі відвідані"""
+    return bool(db.scalar(is_completed_stmt(project_id)))
+
+def has_visited(db: Session, project_id: int) -> bool:
+    stmt = select(exists().where(ProjectPlace.project_id == project_id, ProjectPlace.visited.is_(True)))
+    return bool(db.scalar(stmt))
+
+def list_stats_rows(db: Session, project_id: int):
+    """Лише поля, потрібні статистиці при видаленні проекту (без ORM-об'єктів)"""
+    stmt = select(ProjectPlace.external_id, ProjectPlace.visited, ProjectPlace.visited_at).where(ProjectPlace.project_id == project_id)
+    return db.execute(stmt).all()
+
+def delete_for_project(db: Session, project_id: int) -> None:
+    """Видалити всі місця проекту одним запитом (без commit)"""
+    db.execute(delete(ProjectPlace).where(ProjectPlace.project_id == project_id))
+
+def bulk_insert(db: Session, rows: list[dict]) -> None:
+    """Вставити багато місць одним executemany"""
+    if rows:
+        db.execute(insert(ProjectPlace), rows)
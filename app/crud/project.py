@@ -1,8 +1,86 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+import sys
+from collections.abc import Iterator
+from datetime import date, datetime
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import select, insert, Select
 from app.models.project import Project
+from .base import order_by_param
 
+SORT_COLUMNS = {"id": Project.id, "name": Project.name, "start_date": Project.start_date}
 
-def list_all(db: Session, limit: int, offset: int) -> list[Project]:
-    stmt = select(Project).order_by(Project.id.desc()).limit(limit).offset(offset)
+
+def list_stmt(
+    fields: list[str],
+    completed: bool | None = None,
+    start_date_from: date | None = None,
+    start_date_to: date | None = None,
+    name_prefix: str | None = None,
+    sort: str = "-id",
+) -> Select:
+    columns = [getattr(Project, name) for name in fields]
+    stmt = select(*columns).order_by(*order_by_param(SORT_COLUMNS, sort, Project.id))
+    if completed is not None:
+        stmt = stmt.where(Project.completed == completed)
+    if start_date_from is not None:
+        stmt = stmt.where(Project.start_date >= start_date_from)
+    if start_date_to is not None:
+        stmt = stmt.where(Project.start_date <= start_date_to)
+    if name_prefix:
+        # Діапазон замість LIKE 'x%': індекс по name працює незалежно від collation
+        stmt = stmt.where(Project.name >= name_prefix)
+        upper = _prefix_upper_bound(name_prefix)
+        if upper is not None:
+            stmt = stmt.where(Project.name < upper)
+    return stmt
+
+def _prefix_upper_bound(prefix: str) -> str | None:
+    """Найменший рядок, більший за всі рядки з префіксом prefix; None - такого немає (лише U+10FFFF)"""
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    code = ord(prefix[-1]) + 1
+    # Сурогати не кодуються в UTF-8: наступний символ після U+D7FF - U+E000
+    if 0xD800 <= code <= 0xDFFF:
+        code = 0xE000
+    return prefix[:-1] + chr(code)
+
+def list_all(db: Session, limit: int, offset: int, fields: list[str], **filters) -> list[dict]:
+    """Сторінка проектів лише з потрібними колонками (без завантаження ORM-об'єктів і місць)"""
+    stmt = list_stmt(fields, **filters).limit(limit).offset(offset)
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+def get_many(db: Session, project_ids) -> list[Project]:
+    stmt = select(Project).where(Project.id.in_(project_ids))
     return list(db.scalars(stmt).all())
+
+def get_rows(db: Session, project_ids, fields: list[str]) -> dict[int, dict]:
+    """Колонки fields для набору id одним запитом (id має бути серед fields)"""
+    stmt = select(*[getattr(Project, name) for name in fields]).where(Project.id.in_(project_ids))
+    return {row["id"]: dict(row) for row in db.execute(stmt).mappings()}
+
+def get_version(db: Session, project_id: int) -> int | None:
+    """Лише версія проекту (пошук по PK, без завантаження місць)"""
+    return db.scalar(select(Project.version).where(Project.id == project_id))
+
+def get_status(db: Session, project_id: int):
+    """Статус і причину помилки без завантаження проекту з місцями"""
+    return db.execute(select(Project.status, Project.status_detail).where(Project.id == project_id)).first()
+
+def bulk_insert(db: Session, rows: list[dict]) -> list[int]:
+    """Вставити багато проектів одним executemany; id повертаються в порядку rows"""
+    stmt = insert(Project).returning(Project.id, sort_by_parameter_order=True)
+    return list(db.scalars(stmt, rows).all())
+
+def iter_batches_with_places(db: Session, batch_size: int, since: datetime | None = None) -> Iterator[list[Project]]:
+    """Пройти всі проекти пачками через yield_per (server-side cursor там, де він є)"""
+    stmt = (
+        select(Project)
+        .options(selectinload(Project.places))
+        .order_by(Project.id)
+        .execution_options(yield_per=batch_size)
+    )
+    if since is not None:
+        stmt = stmt.where(Project.updated_at >= since)
+
+    for batch in db.scalars(stmt).partitions():
+        yield list(batch)
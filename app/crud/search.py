@@ -0,0 +1,55 @@
+import functools
+import re
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.models.search import PROJECTS_FTS, PLACES_FTS
+
+# Ваги колонок для bm25: назва проекту важливіша за опис і тексти місць
+_PROJECT_WEIGHTS = "10.0, 2.0"
+_PLACE_WEIGHTS = "4.0, 1.0"
+
+_TERM_HITS = f"""
+        SELECT rowid AS project_id, {{term}} AS term, bm25({PROJECTS_FTS}, {_PROJECT_WEIGHTS}) AS score
+        FROM {PROJECTS_FTS} WHERE {PROJECTS_FTS} MATCH :term_{{term}}
+        UNION ALL
+        SELECT pp.project_id, {{term}}, bm25({PLACES_FTS}, {_PLACE_WEIGHTS})
+        FROM {PLACES_FTS} JOIN project_places pp ON pp.id = {PLACES_FTS}.rowid
+        WHERE {PLACES_FTS} MATCH :term_{{term}}"""
+
+
+@functools.lru_cache
+def _search_sql(terms: int):
+    """Кожне слово шукається окремо: проект проходить, якщо всі слова знайшлись у ньому чи його місцях,
+    хай і в різних рядках ("paris bedroom" - назва проекту і назва місця)"""
+    hits = "\n        UNION ALL".join(_TERM_HITS.format(term=i) for i in range(terms))
+    return text(f"""
+    WITH hits AS ({hits}
+    )
+    SELECT project_id, SUM(score) AS score
+    FROM hits
+    GROUP BY project_id
+    HAVING COUNT(DISTINCT term) = {terms}
+    ORDER BY score, project_id
+    LIMIT :limit OFFSET :offset
+""")
+
+
+def match_terms(q: str) -> list[str]:
+    """Текст користувача -> вирази FTS5 MATCH по одному на слово, останнє - як префікс.
+
+    Кожне слово береться в лапки, тож синтаксис FTS5 (OR, NEAR, *, :) у запиті не інтерпретується.
+    """
+    quoted = [f'"{term}"' for term in re.findall(r"\w+", q)]
+    if quoted:
+        quoted[-1] += "*"
+    return list(dict.fromkeys(quoted))
+
+
+def search_projects(db: Session, q: str, limit: int, offset: int) -> list[tuple[int, float]]:
+    """(project_id, score) за релевантністю; менший score - краще (сума bm25 по словах)"""
+    terms = match_terms(q)
+    if not terms:
+        return []
+    params = {f"term_{i}": term for i, term in enumerate(terms)}
+    rows = db.execute(_search_sql(len(terms)), {**params, "limit": limit, "offset": offset})
+    return [(row.project_id, row.score) for row in rows]
@@ -0,0 +1,24 @@
+from sqlalchemy import Table, select, and_, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+
+
+def fetch_after(
+    db: Session,
+    table: Table,
+    key: ColumnElement,
+    after: tuple | None,
+    limit: int,
+    where: ColumnElement | None = None,
+) -> list[dict]:
+    """Наступні limit рядків за курсором (key, id) - keyset-пагінація без OFFSET"""
+    pk = table.c.id
+    stmt = select(table).order_by(key, pk).limit(limit)
+    if key is not pk:
+        stmt = stmt.where(key.is_not(None))
+    if where is not None:
+        stmt = stmt.where(where)
+    if after is not None:
+        last_key, last_pk = after
+        stmt = stmt.where(or_(key > last_key, and_(key == last_key, pk > last_pk)))
+    return [dict(row) for row in db.execute(stmt).mappings()]
@@ -0,0 +1,85 @@
+from datetime import date
+from sqlalchemy import select, func, delete, cast, Date, Integer
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app.models import Project, ProjectPlace, Artwork, StatsCounter, DailyVisits, ArtworkPlaceCount
+
+COUNTERS = ("projects_total", "projects_completed", "places_total", "places_visited")
+
+
+def add_counters(db: Session, deltas: dict[str, int]) -> None:
+    stmt = insert(StatsCounter)
+    stmt = stmt.on_conflict_do_update(index_elements=[StatsCounter.name], set_={"value": StatsCounter.value + stmt.excluded.value})
+    db.execute(stmt, [{"name": name, "value": value} for name, value in deltas.items()])
+
+def add_daily_visits(db: Session, deltas: dict[date, int]) -> None:
+    stmt = insert(DailyVisits)
+    stmt = stmt.on_conflict_do_update(index_elements=[DailyVisits.day], set_={"visits": DailyVisits.visits + stmt.excluded.visits})
+    db.execute(stmt, [{"day": day, "visits": value} for day, value in deltas.items()])
+
+def add_artwork_places(db: Session, deltas: dict[str, int]) -> None:
+    stmt = insert(ArtworkPlaceCount)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ArtworkPlaceCount.external_id],
+        set_={"places": ArtworkPlaceCount.places + stmt.excluded.places},
+    )
+    db.execute(stmt, [{"external_id": external_id, "places": value} for external_id, value in deltas.items()])
+
+def get_counters(db: Session) -> dict[str, int]:
+    values = dict(db.execute(select(StatsCounter.name, StatsCounter.value)).all())
+    return {name: values.get(name, 0) for name in COUNTERS}
+
+def get_daily_visits(db: Session, since: date) -> list[tuple[date, int]]:
+    stmt = select(DailyVisits.day, DailyVisits.visits).where(DailyVisits.day >= since, DailyVisits.visits > 0).order_by(DailyVisits.day)
+    return list(db.execute(stmt).all())
+
+def get_top_artworks(db: Session, limit: int) -> list:
+    stmt = (
+        select(ArtworkPlaceCount.external_id, Artwork.title, ArtworkPlaceCount.places)
+        .outerjoin(Artwork, Artwork.id == ArtworkPlaceCount.external_id)
+        .where(ArtworkPlaceCount.places > 0)
+        .order_by(ArtworkPlaceCount.places.desc(), ArtworkPlaceCount.external_id)
+        .limit(limit)
+    )
+    return list(db.execute(stmt).all())
+
+def lock_for_write(db: Session) -> None:
+    """Взяти блокування запису до першого читання (SQLite: BEGIN IMMEDIATE).
+
+    Без нього pysqlite відкриває транзакцію лише на першому DELETE/INSERT, і SELECT-и перед ним
+    бачать стан, який паралельна операція встигає змінити до перезапису.
+    """
+    connection = db.connection()
+    if connection.dialect.name == "sqlite" and not connection.connection.dbapi_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+def compute_actual(db: Session) -> tuple[dict[str, int], dict[date, int], dict[str, int]]:
+    """Агрегати повним скануванням - лише для звірки"""
+    projects_total, projects_completed = db.execute(
+        select(func.count(), func.coalesce(func.sum(cast(Project.completed, Integer)), 0))
+    ).one()
+    places_total, places_visited = db.execute(
+        select(func.count(), func.coalesce(func.sum(cast(ProjectPlace.visited, Integer)), 0))
+    ).one()
+    counters = {
+        "projects_total": projects_total,
+        "projects_completed": projects_completed,
+        "places_total": places_total,
+        "places_visited": places_visited,
+    }
+    visit_day = func.date(ProjectPlace.visited_at, type_=Date)
+    days = dict(db.execute(
+        select(visit_day, func.count()).where(ProjectPlace.visited.is_(True), ProjectPlace.visited_at.is_not(None)).group_by(visit_day)
+    ).all())
+    artworks = dict(db.execute(select(ProjectPlace.external_id, func.count()).group_by(ProjectPlace.external_id)).all())
+    return counters, days, artworks
+
+def replace_all(db: Session, counters: dict[str, int], days: dict[date, int], artworks: dict[str, int]) -> None:
+    for model in (StatsCounter, DailyVisits, ArtworkPlaceCount):
+        db.execute(delete(model))
+    if counters:
+        db.execute(insert(StatsCounter), [{"name": k, "value": v} for k, v in counters.items()])
+    if days:
+        db.execute(insert(DailyVisits), [{"day": k, "visits": v} for k, v in days.items()])
+    if artworks:
+        db.execute(insert(ArtworkPlaceCount), [{"external_id": k, "places": v} for k, v in artworks.items()])
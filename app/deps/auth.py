@@ -1,10 +1,14 @@
-from fastapi import HTTPException, Security, status
+from fastapi import HTTPException, Request, Security, status
 from fastapi.security import APIKeyHeader
 from app.core.config import settings
+from .batch import batch_context
 
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
-async def verify_api_key(api_key: str = Security(api_key_header)):
+async def verify_api_key(request: Request, api_key: str = Security(api_key_header)):
+    # Під-запити POST /batch уже пройшли перевірку разом з батчем
+    if batch_context(request) is not None:
+        return settings.api_key
     if not api_key:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
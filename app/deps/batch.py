@@ -0,0 +1,8 @@
+from fastapi import Request
+
+# Ключ ASGI scope, яким POST /batch позначає свої під-запити
+BATCH_SCOPE_KEY = "app.batch"
+
+def batch_context(request: Request) -> dict | None:
+    """Контекст батча для під-запиту (None для звичайних запитів)"""
+    return request.scope.get(BATCH_SCOPE_KEY)
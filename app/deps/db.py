@@ -1,6 +1,18 @@
+from fastapi import Request
 from app.core.db import SessionLocal
+from .batch import batch_context
+
+def get_session_factory():
+    """Фабрика сесій для фонових задач, що живуть довше за запит"""
+    return SessionLocal
+
+def get_db(request: Request):
+    # Змінюючі під-запити POST /batch працюють у сесії батча
+    batch = batch_context(request)
+    if batch is not None and batch.get("db") is not None:
+        yield batch["db"]
+        return
 
-def get_db():
     db = SessionLocal()
     try:
         yield db
@@ -1,20 +1,72 @@
+import asyncio
+import logging
+import anyio.to_thread
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.core.db import init_db
+from app.core.config import settings
+from app.core.db import init_db, SessionLocal
+from app.core.tracing import tracer
 from app.routes import api_router
+from app.middleware import ActiveRequestsMiddleware, MetricsMiddleware, ProfilingMiddleware, QueryStatsMiddleware, TracingMiddleware
+from app.services.idempotency_service import purge_loop
+from app.services.project_jobs import project_jobs, pending_project_ids
+from app.services.group_commit import group_committer
+from app.services.artwork_catalog import artwork_catalog
+from app.services.stats_service import reconcile_loop
+from app.services.loop_monitor import loop_monitor
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    if settings.loop_monitor_enabled:
+        loop_monitor.start(settings.loop_monitor_interval_seconds, settings.loop_stall_threshold_ms)
     init_db()
+    project_jobs.start(settings.project_job_workers, settings.project_job_queue_size)
+    # pending-проекти, що не встигли обробитись до рестарту
+    for project_id in pending_project_ids(SessionLocal):
+        if not project_jobs.has_capacity():
+            logger.warning("Job queue is full, remaining pending projects stay pending until next restart")
+            break
+        project_jobs.enqueue(project_id, SessionLocal)
+
+    logger.info(f"Artwork catalog loaded: {artwork_catalog.load(SessionLocal)} artworks")
+
+    if settings.group_commit_enabled:
+        group_committer.start(settings.group_commit_interval_ms, settings.group_commit_max_batch)
+
+    background = [
+        asyncio.create_task(purge_loop(SessionLocal, settings.idempotency_purge_interval_seconds)),
+        asyncio.create_task(artwork_catalog.flush_loop(SessionLocal, settings.artwork_catalog_flush_interval_seconds)),
+        asyncio.create_task(reconcile_loop(SessionLocal, settings.stats_reconcile_interval_seconds)),
+    ]
     yield
-    # Shutdown (якщо потрібно)
+    # Shutdown
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
+    await loop_monitor.stop()
+    await project_jobs.stop()
+    await group_committer.stop()
+    await asyncio.to_thread(artwork_catalog.flush, SessionLocal)
+    tracer.close()
 
 
 def create_app() -> FastAPI:
     app = FastAPI(title="Travel Planner API", lifespan=lifespan)
     app.include_router(api_router)
+    app.add_middleware(QueryStatsMiddleware)
+    if settings.loop_monitor_enabled:
+        app.add_middleware(ActiveRequestsMiddleware)
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+    if settings.tracing_enabled:
+        app.add_middleware(TracingMiddleware)
+    if settings.profiling_enabled:
+        app.add_middleware(ProfilingMiddleware)
     return app
 
 
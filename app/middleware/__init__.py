@@ -0,0 +1,7 @@
+from .active_requests import ActiveRequestsMiddleware
+from .metrics import MetricsMiddleware
+from .profiling import ProfilingMiddleware
+from .query_stats import QueryStatsMiddleware
+from .tracing import TracingMiddleware
+
+__all__ = ["ActiveRequestsMiddleware", "MetricsMiddleware", "ProfilingMiddleware", "QueryStatsMiddleware", "TracingMiddleware"]
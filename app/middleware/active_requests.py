@@ -0,0 +1,27 @@
+import asyncio
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Задача asyncio -> scope HTTP-запиту, який вона зараз обробляє (для атрибуції зависань loop)
+active_requests: dict[asyncio.Task, Scope] = {}
+
+
+class ActiveRequestsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        task = asyncio.current_task()
+        # Послідовні під-запити батча виконуються в задачі батча: після них повертаємо батч
+        previous = active_requests.get(task)
+        active_requests[task] = scope
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if previous is None:
+                active_requests.pop(task, None)
+            else:
+                active_requests[task] = previous
@@ -0,0 +1,48 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import http_requests, http_request_duration, http_requests_in_flight
+
+
+def route_template(scope: Scope) -> str:
+    """Шаблон маршруту з повним префіксом роутера; "unmatched" - якщо маршрут не знайдено"""
+    # FastAPI тримає підключені роутери вкладеними: scope["route"].path - шлях без префікса,
+    # повний шаблон є в контексті ефективного маршруту
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(context, "path", None) or getattr(scope.get("route"), "path", None)
+    return path or "unmatched"
+
+
+class MetricsMiddleware:
+    """Лічильники й гістограма затримки HTTP-запитів за шаблоном маршруту.
+
+    Чистий ASGI (без BaseHTTPMiddleware): не буферизує тіло і не ламає потокові відповіді.
+    Мітка route - шаблон ("/projects/{project_id}"), а не шлях, щоб кардинальність не росла.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            template = route_template(scope)
+            method = scope["method"]
+            http_requests.inc(method, template, str(status_code))
+            http_request_duration.observe(elapsed, method, template)
@@ -0,0 +1,66 @@
+import hmac
+import time
+from datetime import datetime, timezone
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.profiler import SamplingProfiler, StoredProfile, profile_store
+from .metrics import route_template
+
+
+def _profile_requested(scope: Scope) -> bool:
+    """X-Profile разом з правильним X-API-Key; без X-Profile - лише один прохід по заголовках"""
+    requested = False
+    api_key = None
+    for name, value in scope["headers"]:
+        if name == b"x-profile":
+            requested = value not in (b"", b"0", b"false")
+        elif name == b"x-api-key":
+            api_key = value
+    if not requested or api_key is None:
+        return False
+    return hmac.compare_digest(api_key, settings.api_key.encode())
+
+
+class ProfilingMiddleware:
+    """Семплює стеки запиту з заголовком X-Profile і зберігає профіль для GET /admin/profiles/{id}.
+
+    У відповідь додається X-Profile-Id; тіло відповіді не змінюється.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = profile_store.new_id()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile_id
+            await send(message)
+
+        profiler = SamplingProfiler(settings.profile_sample_interval_ms / 1000, settings.profile_max_seconds)
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            profile_store.add(StoredProfile(
+                id=profile_id,
+                method=scope["method"],
+                path=scope["path"],
+                route=route_template(scope),
+                status_code=status_code,
+                duration_ms=round((time.perf_counter() - started) * 1000, 3),
+                samples=profiler.samples,
+                created_at=datetime.now(timezone.utc),
+                collapsed=profiler.collapsed(),
+            ))
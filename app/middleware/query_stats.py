@@ -0,0 +1,57 @@
+import logging
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.db import QueryStats, query_stats
+from .metrics import route_template
+
+logger = logging.getLogger("app.db")
+
+
+class QueryStatsMiddleware:
+    """Кількість SQL-запитів і час БД на HTTP-запит: у лог, а в debug-режимі ще й у заголовки.
+
+    Під-запити POST /batch проходять через цей же middleware: їхня статистика додається до батча.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        parent = query_stats.get()
+        token = query_stats.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.debug:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(stats.count)
+                    headers["X-DB-Time-Ms"] = f"{stats.seconds * 1000:.2f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            query_stats.reset(token)
+            if parent is not None:
+                parent.merge(stats)
+            self._log(scope, status_code, stats)
+
+    @staticmethod
+    def _log(scope: Scope, status_code: int, stats: QueryStats) -> None:
+        route = f"{scope['method']} {route_template(scope)}"
+        logger.info(f"{route} {status_code}: {stats.count} queries, {stats.seconds * 1000:.2f} ms in DB")
+        if stats.count > settings.query_count_warn_threshold:
+            logger.warning(f"{route} ran {stats.count} SQL statements (threshold {settings.query_count_warn_threshold})")
+        if stats.statements:
+            statement, repeats = stats.statements.most_common(1)[0]
+            if repeats > settings.query_repeat_warn_threshold:
+                logger.warning(f"{route} repeated one statement {repeats} times, possible N+1: {statement[:200]}")
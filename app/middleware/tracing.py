@@ -0,0 +1,38 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.tracing import parse_traceparent, tracer
+from .metrics import route_template
+
+
+class TracingMiddleware:
+    """Кореневий спан HTTP-запиту; вхідний traceparent продовжує трасу клієнта.
+
+    У відповідь додається traceparent цього спану: за його trace_id трасу видно в GET /admin/traces/{trace_id}.
+    Під-запити POST /batch стають нащадками спану батча.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        parent = parse_traceparent(Headers(scope=scope).get("traceparent"))
+        method = scope["method"]
+        with tracer.span(f"HTTP {method}", parent, **{"http.method": method, "http.target": scope["path"]}) as span:
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.attributes["http.status_code"] = message["status"]
+                    if message["status"] >= 500:
+                        span.status = "error"
+                    MutableHeaders(scope=message)["traceparent"] = span.traceparent()
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                template = route_template(scope)
+                span.name = f"HTTP {method} {template}"
+                span.attributes["http.route"] = template
@@ -1,4 +1,8 @@
 from .project import Project
 from .place import ProjectPlace
+from .idempotency import IdempotencyKey
+from .artwork import Artwork
+from .stats import StatsCounter, DailyVisits, ArtworkPlaceCount
+from . import search  # noqa: F401  FTS5-індекс і тригери
 
-__all__ = ["Project", "ProjectPlace"]
+__all__ = ["Project", "ProjectPlace", "IdempotencyKey", "Artwork", "StatsCounter", "DailyVisits", "ArtworkPlaceCount"]
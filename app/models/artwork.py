@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, DateTime
+from app.core.db import Base
+
+class Artwork(Base):
+    """Локальний каталог артефактів ArtIC, що вже траплялись у відповідях API"""
+    __tablename__ = "artworks"
+
+    # id артефакту в ArtIC (те саме, що external_id місця)
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    title: Mapped[str | None] = mapped_column(String(300), nullable=True)
+    artist_title: Mapped[str | None] = mapped_column(String(300), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
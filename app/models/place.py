@@ -1,11 +1,18 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Text, Boolean, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import String, Text, Boolean, DateTime, ForeignKey, UniqueConstraint, Index
 from app.core.db import Base
 
 class ProjectPlace(Base):
     __tablename__ = "project_places"
-    __table_args__ = (UniqueConstraint("project_id", "external_id", name="uq_project_external"),)
+    __table_args__ = (
+        UniqueConstraint("project_id", "external_id", name="uq_project_external"),
+        # Фільтри місць проекту: visited (+ діапазон visited_at) і сортування/діапазон по visited_at
+        Index("ix_project_places_project_visited", "project_id", "visited", "visited_at"),
+        Index("ix_project_places_project_visited_at", "project_id", "visited_at"),
+        # Сторінки місць великого проекту в порядку id без сортування всіх його місць
+        Index("ix_project_places_project_id", "project_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
@@ -16,5 +23,13 @@ class ProjectPlace(Base):
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
     visited: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     visited_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Час останньої зміни рядка: водяний знак інкрементального знімка
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        index=True,
+    )
 
     project = relationship("Project", back_populates="places")
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime, timezone
 from typing import TYPE_CHECKING
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Text, Boolean, Date
+from sqlalchemy import String, Text, Boolean, Date, DateTime, Integer, Index
 from app.core.db import Base
 
 if TYPE_CHECKING:
@@ -11,15 +11,36 @@ if TYPE_CHECKING:
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Фільтри списку: completed + діапазон start_date, окремо діапазон start_date, префікс name
+        Index("ix_projects_completed_start_date", "completed", "start_date"),
+        Index("ix_projects_start_date", "start_date"),
+        Index("ix_projects_name", "name"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     start_date: Mapped[date | None] = mapped_column(Date, nullable=True)
     completed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # pending - місця ще перевіряються фоновим воркером; active; failed - перевірка не пройшла
+    status: Mapped[str] = mapped_column(String(16), default="active", nullable=False)
+    status_detail: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Монотонно зростає при кожній зміні проекту чи його місць; з нього будується ETag
+    version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        index=True,
+    )
 
     places: Mapped[list["ProjectPlace"]] = relationship(
         back_populates="project",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        # Місць може бути тисячі: вантажимо їх лише на вимогу, видаляє їх remove_project одним запитом
+        lazy="select",
+        passive_deletes=True,
+        # Явний порядок: без нього SQLite віддає місця в порядку обраного індексу
+        order_by="ProjectPlace.id",
     )
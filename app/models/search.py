@@ -0,0 +1,64 @@
+"""Повнотекстовий індекс SQLite FTS5 над проектами і місцями.
+
+Дві external-content таблиці (текст не дублюється, лише індекс) синхронізуються тригерами,
+тож індекс актуальний для будь-якого шляху запису: ORM, bulk insert, імпорт. Тригери на
+UPDATE спрацьовують лише для індексованих колонок - перемикання visited індекс не чіпає.
+"""
+from sqlalchemy import event
+from app.core.db import Base
+
+PROJECTS_FTS = "projects_fts"
+PLACES_FTS = "project_places_fts"
+
+_DDL = [
+    f"CREATE VIRTUAL TABLE {PROJECTS_FTS} USING fts5("
+    "name, description, content='projects', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE VIRTUAL TABLE {PLACES_FTS} USING fts5("
+    "title, notes, content='project_places', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+
+    f"""CREATE TRIGGER IF NOT EXISTS projects_fts_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO {PROJECTS_FTS}(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS projects_fts_ad AFTER DELETE ON projects BEGIN
+        INSERT INTO {PROJECTS_FTS}({PROJECTS_FTS}, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS projects_fts_au AFTER UPDATE OF name, description ON projects BEGIN
+        INSERT INTO {PROJECTS_FTS}({PROJECTS_FTS}, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {PROJECTS_FTS}(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+
+    f"""CREATE TRIGGER IF NOT EXISTS project_places_fts_ai AFTER INSERT ON project_places BEGIN
+        INSERT INTO {PLACES_FTS}(rowid, title, notes) VALUES (new.id, new.title, new.notes);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS project_places_fts_ad AFTER DELETE ON project_places BEGIN
+        INSERT INTO {PLACES_FTS}({PLACES_FTS}, rowid, title, notes) VALUES ('delete', old.id, old.title, old.notes);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS project_places_fts_au AFTER UPDATE OF title, notes ON project_places BEGIN
+        INSERT INTO {PLACES_FTS}({PLACES_FTS}, rowid, title, notes) VALUES ('delete', old.id, old.title, old.notes);
+        INSERT INTO {PLACES_FTS}(rowid, title, notes) VALUES (new.id, new.title, new.notes);
+    END""",
+]
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_search_index(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (PROJECTS_FTS,)
+    ).first()
+    if exists:
+        return
+    for statement in _DDL:
+        connection.exec_driver_sql(statement)
+    # Існуюча база: проіндексувати вже збережені рядки
+    connection.exec_driver_sql(f"INSERT INTO {PROJECTS_FTS}({PROJECTS_FTS}) VALUES ('rebuild')")
+    connection.exec_driver_sql(f"INSERT INTO {PLACES_FTS}({PLACES_FTS}) VALUES ('rebuild')")
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def drop_search_index(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    for table in (PROJECTS_FTS, PLACES_FTS):
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {table}")
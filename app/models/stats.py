@@ -0,0 +1,27 @@
+from datetime import date
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, Date
+from app.core.db import Base
+
+# Зведені таблиці для GET /stats: оновлюються інкрементально разом зі змінами,
+# періодично звіряються з projects/project_places
+
+class StatsCounter(Base):
+    __tablename__ = "stats_counters"
+
+    # projects_total, projects_completed, places_total, places_visited
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+class DailyVisits(Base):
+    __tablename__ = "stats_daily_visits"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    visits: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+class ArtworkPlaceCount(Base):
+    __tablename__ = "stats_artwork_places"
+
+    external_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    # Індекс: топ артефактів - це ORDER BY places DESC LIMIT n без сканування
+    places: Mapped[int] = mapped_column(Integer, default=0, nullable=False, index=True)
@@ -1,9 +1,19 @@
 from fastapi import APIRouter
 from .health import router as health_router
+from .metrics import router as metrics_router
 from .projects import router as projects_router
 from .places import router as places_router
+from .admin import router as admin_router
+from .batch import router as batch_router
+from .artworks import router as artworks_router
+from .stats import router as stats_router
 
 api_router = APIRouter()
 api_router.include_router(health_router, tags=["health"])
+api_router.include_router(metrics_router, tags=["metrics"])
 api_router.include_router(projects_router, prefix="/projects", tags=["projects"])
 api_router.include_router(places_router, prefix="/projects", tags=["places"])
+api_router.include_router(admin_router, prefix="/admin", tags=["admin"])
+api_router.include_router(artworks_router, prefix="/artworks", tags=["artworks"])
+api_router.include_router(stats_router, prefix="/stats", tags=["stats"])
+api_router.include_router(batch_router, prefix="/batch", tags=["batch"])
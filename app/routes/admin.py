@@ -0,0 +1,394 @@
+import asyncio
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import PlainTextResponse
+from app.deps.auth import verify_api_key
+from app.core.config import settings
+from app.deps.db import get_session_factory
+from app.core.cache import project_cache
+from app.core.slow_queries import slow_query_log
+from app.core.profiler import profile_store
+from app.core.tracing import tracer
+from app.services.project_jobs import project_jobs
+from app.services.group_commit import group_committer
+from app.services.project_events import project_events
+from app.services.loop_monitor import loop_monitor
+from app.services.snapshot_service import SnapshotUnavailable, SnapshotInProgress, export_snapshot
+
+router = APIRouter(dependencies=[Depends(verify_api_key)])
+
+@router.get(
+    "/cache",
+    summary="Project detail cache statistics",
+    description="Hit ratio, stale entries detected by version check, invalidations and age of served entries for the GET /projects/{id} response cache.",
+    responses={
+        200: {
+            "description": "Cache statistics",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "backend": "LRUCacheBackend",
+                        "hits": 950,
+                        "misses": 50,
+                        "hit_ratio": 0.95,
+                        "stale": 0,
+                        "invalidations": 48,
+                        "avg_hit_age_seconds": 12.4,
+                        "max_hit_age_seconds": 301.7
+                    }
+                }
+            }
+        }
+    }
+)
+def cache_stats():
+    return project_cache.stats()
+
+@router.get(
+    "/jobs",
+    summary="Background project job queue",
+    description="Depth and throughput of the queue that validates places of projects created with `async=true`. `retried` counts jobs postponed because ArtIC was unavailable.",
+    responses={
+        200: {
+            "description": "Queue statistics",
+            "content": {
+                "application/json": {
+                    "example": {"queue_depth": 3, "max_size": 1000, "workers": 4, "in_progress": 4, "processed": 120, "failed": 2, "retried": 6, "waiting_retry": 1}
+                }
+            }
+        }
+    }
+)
+def job_stats():
+    return project_jobs.stats()
+
+@router.get(
+    "/group-commit",
+    summary="Place update group commit",
+    description="How many PATCH place updates were committed together: batches, mutations and average batch size.",
+    responses={
+        200: {
+            "description": "Group commit statistics",
+            "content": {
+                "application/json": {
+                    "example": {"enabled": True, "batches": 21, "mutations": 1000, "avg_batch_size": 47.62}
+                }
+            }
+        }
+    }
+)
+def group_commit_stats():
+    return group_committer.stats()
+
+@router.get(
+    "/events",
+    summary="Project event streams",
+    description="Open `GET /projects/{id}/events` subscriptions, projects with buffered events and events published since start.",
+    responses={
+        200: {
+            "description": "Event bus statistics",
+            "content": {
+                "application/json": {
+                    "example": {"channels": 120, "subscribers": 3400, "buffered_events": 5200, "published": 18000}
+                }
+            }
+        }
+    }
+)
+def event_stats():
+    return project_events.stats()
+
+@router.get(
+    "/runtime",
+    summary="Event loop lag and threadpool usage",
+    description=(
+        "Event loop lag measured by the lifespan monitor, stalls above `LOOP_STALL_THRESHOLD_MS` with the route and "
+        "code location that blocked the loop, and usage of the AnyIO threadpool (`THREADPOOL_SIZE`) that runs sync handlers."
+    ),
+    responses={
+        200: {
+            "description": "Runtime statistics",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "running": True,
+                        "last_lag_ms": 0.412,
+                        "max_lag_ms": 830.2,
+                        "stalls": 3,
+                        "last_stall": {
+                            "lag_ms": 830.2,
+                            "route": "POST /projects/import",
+                            "location": "app/services/project_service.py:412 in store_projects"
+                        },
+                        "threadpool_size": 40,
+                        "threadpool_busy": 12,
+                        "threadpool_waiting": 0,
+                        "threadpool_max_busy": 40,
+                        "threadpool_saturations": 1,
+                        "active_requests": {"GET /projects/{project_id}": 10, "GET /admin/runtime": 1}
+                    }
+                }
+            }
+        }
+    }
+)
+def runtime_stats():
+    return loop_monitor.stats()
+
+@router.get(
+    "/slow-queries",
+    summary="Slow query log",
+    description=(
+        "SQL statements aggregated by fingerprint (literals and IN-list lengths normalized away): calls and latency. "
+        "Statements that took at least `SLOW_QUERY_THRESHOLD_MS` get the `EXPLAIN QUERY PLAN` (SQLite) or `EXPLAIN` "
+        "output captured on their first slow execution. Collected only with `SLOW_QUERY_LOG_ENABLED=true`."
+    ),
+    responses={
+        200: {
+            "description": "Statements ordered by the requested key",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "enabled": True,
+                        "threshold_ms": 100,
+                        "fingerprints": 42,
+                        "evicted": 0,
+                        "statements": [
+                            {
+                                "fingerprint": "SELECT project_places.id, project_places.title FROM project_places WHERE project_places.title LIKE ? ORDER BY project_places.id LIMIT ? OFFSET ?",
+                                "calls": 120,
+                                "total_ms": 18450.2,
+                                "mean_ms": 153.752,
+                                "max_ms": 412.9,
+                                "slow_calls": 97,
+                                "plan": ["SCAN project_places"],
+                                "plan_ms": 131.4
+                            }
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+def slow_queries(
+    sort: Literal["total", "mean", "max", "calls", "slow"] = Query("total", description="Order by total time, mean time, max time, calls or slow calls"),
+    limit: int = Query(20, ge=1, le=500),
+):
+    return {
+        "enabled": settings.slow_query_log_enabled,
+        "threshold_ms": settings.slow_query_threshold_ms,
+        **slow_query_log.stats(),
+        "statements": slow_query_log.report(sort, limit),
+    }
+
+@router.delete(
+    "/slow-queries",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Reset slow query log",
+    description="Drop collected aggregates and plans, e.g. after adding an index.",
+)
+def reset_slow_queries():
+    slow_query_log.reset()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+@router.get(
+    "/profiles",
+    summary="Stored request profiles",
+    description=(
+        "Profiles of requests sent with `X-Profile: 1` and a valid `X-API-Key`, newest first. "
+        "The profiled response carries `X-Profile-Id`; download the stacks from `/admin/profiles/{profile_id}`."
+    ),
+    responses={
+        200: {
+            "description": "Profile summaries",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "id": "3f9c1e0a7b2d4c51",
+                            "method": "POST",
+                            "path": "/projects",
+                            "route": "/projects",
+                            "status_code": 201,
+                            "duration_ms": 812.4,
+                            "samples": 398,
+                            "created_at": "2025-03-01T12:00:00Z"
+                        }
+                    ]
+                }
+            }
+        }
+    }
+)
+def list_profiles():
+    return profile_store.list()
+
+@router.get(
+    "/profiles/{profile_id}",
+    summary="Download request profile",
+    description=(
+        "Sampled wall-clock stacks in collapsed format (`thread;frame;frame count` per line), "
+        "ready for `flamegraph.pl` or speedscope. Stacks of the event loop thread are recorded only while it runs "
+        "the profiled request; busy worker threads are recorded as is, so concurrent requests may appear too."
+    ),
+    response_class=PlainTextResponse,
+    responses={
+        200: {
+            "description": "Collapsed stacks",
+            "content": {
+                "text/plain": {
+                    "example": "AnyIO worker thread;run (threading.py);list_projects (app/routes/projects.py);execute (session.py) 42\n"
+                }
+            }
+        },
+        404: {
+            "description": "Profile not found or already evicted",
+            "content": {"application/json": {"example": {"detail": "Profile not found"}}}
+        }
+    }
+)
+def get_profile(profile_id: str):
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(404, "Profile not found")
+    return PlainTextResponse(
+        profile.collapsed,
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile.id}.collapsed"'},
+    )
+
+@router.get(
+    "/traces",
+    summary="Recent traces",
+    description=(
+        "Traces still in the in-memory span buffer, newest first, with their root span. Collected only with "
+        "`TRACING_ENABLED=true`; every traced response carries a `traceparent` header with its trace id."
+    ),
+    responses={
+        200: {
+            "description": "Trace summaries",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "trace_id": "4bf92f3577b34da6a3ce929d0e0e4736",
+                            "root": {"name": "HTTP POST /projects", "start_us": 1740830400000000, "duration_ms": 812.4, "status": "ok"},
+                            "spans": 31
+                        }
+                    ]
+                }
+            }
+        }
+    }
+)
+def list_traces(limit: int = Query(20, ge=1, le=500)):
+    return tracer.traces(limit)
+
+@router.get(
+    "/traces/{trace_id}",
+    summary="Trace spans",
+    description=(
+        "All buffered spans of a trace ordered by start time: the HTTP request, `project_service` functions, "
+        "ArtIC calls (`artic.get_artwork`) and SQL statements (`db.query`). Use `parent_id` to rebuild the tree."
+    ),
+    responses={
+        200: {
+            "description": "Spans",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "trace_id": "4bf92f3577b34da6a3ce929d0e0e4736",
+                            "span_id": "00f067aa0ba902b7",
+                            "parent_id": None,
+                            "name": "HTTP POST /projects",
+                            "start_us": 1740830400000000,
+                            "duration_ms": 812.4,
+                            "status": "ok",
+                            "attributes": {"http.method": "POST", "http.route": "/projects", "http.status_code": 201}
+                        },
+                        {
+                            "trace_id": "4bf92f3577b34da6a3ce929d0e0e4736",
+                            "span_id": "b7ad6b7169203331",
+                            "parent_id": "5c1f0a2e9d8b7a61",
+                            "name": "artic.get_artwork",
+                            "start_us": 1740830400001200,
+                            "duration_ms": 78.9,
+                            "status": "ok",
+                            "attributes": {"external_id": "27992", "http.status_code": 200}
+                        }
+                    ]
+                }
+            }
+        },
+        404: {
+            "description": "Trace not in the buffer",
+            "content": {"application/json": {"example": {"detail": "Trace not found"}}}
+        }
+    }
+)
+def get_trace(trace_id: str):
+    spans = tracer.trace(trace_id)
+    if not spans:
+        raise HTTPException(404, "Trace not found")
+    return spans
+
+@router.post(
+    "/snapshot",
+    summary="Export Parquet snapshot",
+    description=(
+        "Export `projects`, `project_places`, places partitioned by `visited_date` and the artwork catalog "
+        "to zstd-compressed Parquet files under `SNAPSHOT_DIR`. Rows are read in keyset chunks, each in its own short "
+        "transaction, so API writes are not blocked. Incremental by default: every run writes a new partition with "
+        "rows changed since the stored `updated_at` watermark, so the latest partition holds the current version of a row; "
+        "`full=true` exports everything again. "
+        "Requires the optional `pyarrow` dependency."
+    ),
+    responses={
+        200: {
+            "description": "Rows and files written per dataset",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "project_places": {
+                            "rows": 1200,
+                            "files": ["project_places/part-20250301T120000000000.parquet"],
+                            "watermark": {"key": 5400, "id": 5400}
+                        },
+                        "place_visits": {
+                            "rows": 35,
+                            "files": ["place_visits/visited_date=2025-03-01/part-20250301T120000000000.parquet"],
+                            "watermark": {"key": "2025-03-01T11:58:02", "id": 5391}
+                        }
+                    }
+                }
+            }
+        },
+        409: {
+            "description": "Another snapshot is running",
+            "content": {"application/json": {"example": {"detail": "Another snapshot is already running"}}}
+        },
+        501: {
+            "description": "pyarrow is not installed",
+            "content": {"application/json": {"example": {"detail": "Parquet snapshots require pyarrow (pip install pyarrow)"}}}
+        }
+    }
+)
+async def create_snapshot(
+    tables: list[Literal["projects", "project_places", "place_visits", "artworks"]] | None = Query(None, description="Datasets to export (default: all)"),
+    full: bool = Query(False, description="Ignore watermarks and export everything"),
+    session_factory = Depends(get_session_factory),
+):
+    try:
+        return await asyncio.to_thread(
+            export_snapshot,
+            session_factory,
+            settings.snapshot_dir,
+            tables=tables,
+            chunk_size=settings.snapshot_chunk_size,
+            full=full,
+        )
+    except SnapshotInProgress as e:
+        raise HTTPException(409, str(e))
+    except SnapshotUnavailable as e:
+        raise HTTPException(501, str(e))
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, Query
+from app.deps.auth import verify_api_key
+from app.schemas import ArtworkSearchResultOut
+from app.services.artwork_catalog import artwork_catalog
+
+router = APIRouter(dependencies=[Depends(verify_api_key)])
+
+@router.get(
+    "/search",
+    response_model=list[ArtworkSearchResultOut],
+    summary="Autocomplete artworks from the local catalog",
+    description="Searches titles and artists of artworks already seen in ArtIC responses, without calling ArtIC. "
+                "The last word is matched as a prefix and small typos are tolerated (trigram similarity). "
+                "Use the returned `external_id` when adding a place.",
+    responses={
+        200: {
+            "description": "Matching artworks, best first",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "external_id": "27992",
+                            "title": "A Sunday on La Grande Jatte — 1884",
+                            "artist_title": "Georges Seurat",
+                            "score": 1.5
+                        }
+                    ]
+                }
+            }
+        }
+    }
+)
+def search_artworks(
+    q: str = Query(..., min_length=1, max_length=200, description="Part of the title or artist name"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of artworks to return"),
+):
+    return artwork_catalog.search(q, limit)
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+from app.deps.auth import verify_api_key
+from app.deps.db import get_db
+from app.schemas import BatchRequest, BatchResponse
+from app.services.batch_service import run_batch
+
+router = APIRouter(dependencies=[Depends(verify_api_key)])
+
+@router.post(
+    "",
+    response_model=BatchResponse,
+    summary="Execute several API requests in one round trip",
+    description="Runs an ordered list of sub-requests against the regular endpoints in-process. "
+                "Authentication is checked once for the whole batch, so sub-requests do not need `X-API-Key`. "
+                "Modifying sub-requests run one after another in a single database session; "
+                "consecutive GET sub-requests run concurrently and see all earlier changes. "
+                "A failing sub-request does not stop the batch: its status and error body are returned in place. "
+                "Up to 50 sub-requests; nested `/batch` calls and `/projects/{id}/events` streams are rejected.",
+    responses={
+        200: {
+            "description": "Responses in the order of the sub-requests",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "responses": [
+                            {"status": 200, "headers": {"content-type": "application/json", "etag": "\"1-3\""}, "body": {"id": 1, "name": "Chicago Art Tour", "places": []}},
+                            {"status": 404, "headers": {"content-type": "application/json"}, "body": {"detail": "Place not found"}},
+                            {"status": 200, "headers": {"content-type": "application/json"}, "body": {"id": 2, "project_id": 1, "visited": True}}
+                        ]
+                    }
+                }
+            }
+        },
+        422: {
+            "description": "Invalid batch (too many sub-requests, nested /batch, event streams)",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Nested batch requests are not allowed"}
+                }
+            }
+        }
+    }
+)
+async def batch(payload: BatchRequest, request: Request, db: Session = Depends(get_db)):
+    return {"responses": await run_batch(request, db, payload.requests)}
@@ -0,0 +1,31 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.services.metrics_service import render_metrics
+
+router = APIRouter()
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Prometheus metrics",
+    description="Metrics in the Prometheus text exposition format: per-route request counts and latency histograms, "
+                "in-flight requests, DB pool checkout waits, ArtIC call latency and outcomes, cache hit ratio and "
+                "background queues. Intended for a local scraper; does not require an API key.",
+    responses={
+        200: {
+            "description": "Metrics",
+            "content": {
+                "text/plain": {
+                    "example": '# HELP http_requests_total HTTP requests by route template and status code.\n'
+                               '# TYPE http_requests_total counter\n'
+                               'http_requests_total{method="GET",route="/projects/{project_id}",status="200"} 1042\n'
+                               '# HELP project_cache_hit_ratio Share of project detail lookups served from cache.\n'
+                               '# TYPE project_cache_hit_ratio gauge\n'
+                               'project_cache_hit_ratio 0.93\n'
+                }
+            }
+        }
+    }
+)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from datetime import datetime
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Request, Response, Header
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from app.deps.db import get_db
+from app.deps.db import get_db, get_session_factory
 from app.deps.auth import verify_api_key
-from app.schemas import PlaceCreate, PlaceUpdate, PlaceOut
+from app.schemas import PlaceCreate, PlaceUpdate, PlacesBulkUpdate, PlaceOut
+from app.core.etag import make_etag, etag_matches
 from app.crud import place as place_crud
+from app.crud import project as project_crud
 from app.crud.base import get
 from app.models import ProjectPlace, Project
-from app.services.project_service import add_place, update_place
+from app.services.project_service import add_place, update_place, update_places
+from app.services.idempotency_service import run_idempotent, request_hash
+from app.services.group_commit import group_committer
 
 router = APIRouter(dependencies=[Depends(verify_api_key)])
 
@@ -15,7 +22,8 @@ router = APIRouter(dependencies=[Depends(verify_api_key)])
     response_model=PlaceOut,
     status_code=status.HTTP_201_CREATED,
     summary="Add a place to a project",
-    description="Add a new place to an existing project. The place must exist in ArtIC API. Maximum 10 places per project.",
+    description="Add a new place to an existing project. The place must exist in ArtIC API. At most `MAX_PLACES_PER_PROJECT` places per project (10 by default). "
+                "Send an `Idempotency-Key` header to make retries safe: a repeated key returns the stored first response.",
     responses={
         201: {
             "description": "Place added successfully",
@@ -23,6 +31,7 @@ router = APIRouter(dependencies=[Depends(verify_api_key)])
                 "application/json": {
                     "example": {
                         "id": 1,
+                        "project_id": 1,
                         "external_id": "27992",
                         "title": "A Sunday on La Grande Jatte",
                         "notes": "Must see - famous painting",
@@ -49,7 +58,8 @@ router = APIRouter(dependencies=[Depends(verify_api_key)])
                 "application/json": {
                     "examples": {
                         "limit_reached": {"detail": "Project already has 10 places"},
-                        "duplicate": {"detail": "Place already exists in this project"}
+                        "duplicate": {"detail": "Place already exists in this project"},
+                        "idempotency_in_progress": {"detail": "A request with this Idempotency-Key is still in progress"}
                     }
                 }
             }
@@ -59,18 +69,24 @@ router = APIRouter(dependencies=[Depends(verify_api_key)])
 async def add_project_place(
     project_id: int = Path(..., description="ID of the project"),
     payload: PlaceCreate = ...,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=255, description="Retries with the same key return the first response"),
     db: Session = Depends(get_db)
 ):
-    project = base_get(db, Project, project_id)
-    if not project:
-        raise HTTPException(404, "Project not found")
-    return await add_place(db, project, payload.external_id, payload.notes)
+    async def handler():
+        project = get(db, Project, project_id)
+        if not project:
+            raise HTTPException(404, "Project not found")
+        place = await add_place(db, project, payload.external_id, payload.notes)
+        return status.HTTP_201_CREATED, PlaceOut.model_validate(place).model_dump(mode="json")
+
+    return await run_idempotent(db, idempotency_key, f"POST /projects/{project_id}/places", request_hash(payload), handler)
 
 @router.get(
     "/{project_id}/places",
     response_model=list[PlaceOut],
     summary="List all places in a project",
-    description="Get a paginated list of all places in a specific project.",
+    description="Get a paginated list of all places in a specific project. The response carries an `ETag` of the project version; send it back in `If-None-Match` to get 304 when nothing changed. "
+                "Filter by `visited` and `visited_from`/`visited_to`, order with `sort`; both are served by indexes on `project_places`.",
     responses={
         200: {
             "description": "List of places",
@@ -79,6 +95,7 @@ async def add_project_place(
                     "example": [
                         {
                             "id": 1,
+                            "project_id": 1,
                             "external_id": "27992",
                             "title": "A Sunday on La Grande Jatte",
                             "notes": "Must see",
@@ -87,6 +104,7 @@ async def add_project_place(
                         },
                         {
                             "id": 2,
+                            "project_id": 1,
                             "external_id": "28560",
                             "title": "The Bedroom",
                             "notes": "Check hours",
@@ -97,6 +115,9 @@ async def add_project_place(
                 }
             }
         },
+        304: {
+            "description": "Not modified: the `If-None-Match` header matches the current ETag"
+        },
         404: {
             "description": "Project not found",
             "content": {
@@ -108,15 +129,35 @@ async def add_project_place(
     }
 )
 def list_project_places(
+    request: Request,
+    response: Response,
     project_id: int = Path(..., description="ID of the project"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of places to return"),
     offset: int = Query(0, ge=0, description="Number of places to skip"),
+    visited: bool | None = Query(None, description="Only visited (true) or not visited (false) places"),
+    visited_from: datetime | None = Query(None, description="Places visited at or after this time"),
+    visited_to: datetime | None = Query(None, description="Places visited at or before this time"),
+    sort: Literal["id", "-id", "visited_at", "-visited_at"] = Query("-id", description="Sort field, `-` for descending"),
     db: Session = Depends(get_db)
 ):
-    project = base_get(db, Project, project_id)
-    if not project:
+    version = project_crud.get_version(db, project_id)
+    if version is None:
         raise HTTPException(404, "Project not found")
-    return place_crud.list_for_project(db, project_id, limit=min(limit, 100), offset=offset)
+
+    params = {
+        "limit": min(limit, 100),
+        "offset": offset,
+        "visited": visited,
+        "visited_from": visited_from,
+        "visited_to": visited_to,
+        "sort": sort,
+    }
+    etag = make_etag(project_id, version, params)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return place_crud.list_for_project(db, project_id, **params)
 
 @router.get(
     "/{project_id}/places/{place_id}",
@@ -130,6 +171,7 @@ def list_project_places(
                 "application/json": {
                     "example": {
                         "id": 1,
+                        "project_id": 1,
                         "external_id": "27992",
                         "title": "A Sunday on La Grande Jatte",
                         "notes": "Must see - famous painting",
@@ -163,7 +205,8 @@ def get_project_place(
     "/{project_id}/places/{place_id}",
     response_model=PlaceOut,
     summary="Update a place",
-    description="Update place information (notes, visited status). When marked as visited, visited_at is automatically set.",
+    description="Update place information (notes, visited status). When marked as visited, visited_at is automatically set. "
+                "With group commit enabled the change is committed together with concurrent updates; the response is sent only after that commit.",
     responses={
         200: {
             "description": "Place updated successfully",
@@ -171,6 +214,7 @@ def get_project_place(
                 "application/json": {
                     "example": {
                         "id": 1,
+                        "project_id": 1,
                         "external_id": "27992",
                         "title": "A Sunday on La Grande Jatte",
                         "notes": "Visited on 2024-06-15. Amazing!",
@@ -190,13 +234,19 @@ def get_project_place(
         }
     }
 )
-def patch_project_place(
+async def patch_project_place(
     project_id: int = Path(..., description="ID of the project"),
     place_id: int = Path(..., description="ID of the place"),
     payload: PlaceUpdate = ...,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    session_factory = Depends(get_session_factory)
 ):
-    project = base_get(db, Project, project_id)
+    if group_committer.running:
+        return await group_committer.submit(session_factory, project_id, place_id, payload.notes, payload.visited)
+    return await run_in_threadpool(_patch_project_place, db, project_id, place_id, payload)
+
+def _patch_project_place(db: Session, project_id: int, place_id: int, payload: PlaceUpdate):
+    project = get(db, Project, project_id)
     if not project:
         raise HTTPException(404, "Project not found")
 
@@ -205,3 +255,59 @@ def patch_project_place(
         raise HTTPException(404, "Place not found")
 
     return update_place(db, project, place, payload.notes, payload.visited)
+
+@router.patch(
+    "/{project_id}/places",
+    response_model=list[PlaceOut],
+    summary="Update many places at once",
+    description="Apply notes and visited changes to several places of a project in a single transaction. Places are returned in request order.",
+    responses={
+        200: {
+            "description": "Places updated successfully",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "id": 1,
+                            "project_id": 1,
+                            "external_id": "27992",
+                            "title": "A Sunday on La Grande Jatte",
+                            "notes": "Must see",
+                            "visited": True,
+                            "visited_at": "2024-06-15T10:30:00"
+                        }
+                    ]
+                }
+            }
+        },
+        404: {
+            "description": "Project or places not found",
+            "content": {
+                "application/json": {
+                    "examples": {
+                        "project_not_found": {"detail": "Project not found"},
+                        "places_not_found": {"detail": "Places not found: 7, 8"}
+                    }
+                }
+            }
+        },
+        409: {
+            "description": "Duplicate place id in request",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Duplicate place id in request"}
+                }
+            }
+        }
+    }
+)
+def patch_project_places(
+    project_id: int = Path(..., description="ID of the project"),
+    payload: PlacesBulkUpdate = ...,
+    db: Session = Depends(get_db)
+):
+    project = get(db, Project, project_id)
+    if not project:
+        raise HTTPException(404, "Project not found")
+
+    return update_places(db, project, payload.places)
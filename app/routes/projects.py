@@ -1,12 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from datetime import date, datetime
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Request, Response, Header
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from app.deps.db import get_db
+from app.deps.db import get_db, get_session_factory
 from app.deps.auth import verify_api_key
-from app.schemas import ProjectCreate, ProjectUpdate, ProjectOut, ProjectDetailOut
+from app.schemas import (
+    ProjectCreate, ProjectUpdate, ProjectOut, ProjectListItemOut, ProjectSearchResultOut, ProjectDetailOut, ProjectBulkCreate, ProjectBulkResult,
+    ImportProgressOut, ProjectJobAccepted, ProjectJobStatus,
+)
+from app.core.config import settings
+from app.core.cache import project_cache
+from app.core.etag import make_etag, etag_matches
 from app.models import Project
-from app.crud import project as project_crud
-from app.crud.base import get, delete
-from app.services.project_service import can_delete, create_project_with_places
+from app.crud import project as project_crud, place as place_crud, search as search_crud
+from app.crud.base import get
+from app.services.project_service import can_delete, remove_project, create_project_with_places, create_projects_bulk, create_pending_project, touch_project, project_detail
+from app.services.project_jobs import project_jobs
+from app.services.export_service import iter_projects_ndjson, gzip_stream
+from app.services.import_service import import_projects_ndjson, get_progress
+from app.services.idempotency_service import run_idempotent, request_hash
+from app.services.project_events import project_events
 
 router = APIRouter(dependencies=[Depends(verify_api_key)])
 
@@ -15,7 +29,10 @@ router = APIRouter(dependencies=[Depends(verify_api_key)])
     response_model=ProjectDetailOut,
     status_code=status.HTTP_201_CREATED,
     summary="Create a new travel project",
-    description="Create a new travel project with places. Project must have at least 1 place and maximum 10 places.",
+    description="Create a new travel project with places. Project must have at least 1 place and at most `MAX_PLACES_PER_PROJECT` places (10 by default). "
+                "Send an `Idempotency-Key` header to make retries safe: a repeated key returns the stored first response. "
+                "With `async=true` the project is stored as `pending` and 202 is returned immediately; places are validated in the background "
+                "and the project becomes `active` or `failed` (see `status_url`).",
     responses={
         201: {
             "description": "Project created successfully",
@@ -27,20 +44,32 @@ router = APIRouter(dependencies=[Depends(verify_api_key)])
                         "description": "Exploring art museums in Chicago",
                         "start_date": "2024-06-01",
                         "completed": False,
+                        "status": "active",
                         "places": [
                             {
                                 "id": 1,
+                                "project_id": 1,
                                 "external_id": "27992",
                                 "title": "A Sunday on La Grande Jatte",
                                 "notes": "Must see - famous painting",
                                 "visited": False,
                                 "visited_at": None
                             }
-                        ]
+                        ],
+                        "places_total": 1
                     }
                 }
             }
         },
+        202: {
+            "description": "Accepted for background validation (`async=true`)",
+            "model": ProjectJobAccepted,
+            "content": {
+                "application/json": {
+                    "example": {"id": 1, "status": "pending", "status_url": "/projects/1/status"}
+                }
+            }
+        },
         422: {
             "description": "Validation error",
             "content": {
@@ -49,6 +78,22 @@ router = APIRouter(dependencies=[Depends(verify_api_key)])
                 }
             }
         },
+        409: {
+            "description": "A request with the same `Idempotency-Key` is still in progress",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "A request with this Idempotency-Key is still in progress"}
+                }
+            }
+        },
+        503: {
+            "description": "Background job queue is full (`async=true`)",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Project job queue is full, retry later"}
+                }
+            }
+        },
         404: {
             "description": "Place not found in ArtIC API",
             "content": {
@@ -59,20 +104,185 @@ router = APIRouter(dependencies=[Depends(verify_api_key)])
         }
     }
 )
-async def create_project(payload: ProjectCreate, db: Session = Depends(get_db)):
-    project = Project(name=payload.name, description=payload.description, start_date=payload.start_date)
-    
-    # Project must have at least 1 place (requirement: minimum 1, maximum 10)
-    if not payload.places:
-        raise HTTPException(422, "Project must have at least 1 place")
-    
-    return await create_project_with_places(db, project, payload.places)
+async def create_project(
+    payload: ProjectCreate,
+    async_mode: bool = Query(False, alias="async", description="Validate places in the background and return 202 with a job URL"),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=255, description="Retries with the same key return the first response"),
+    db: Session = Depends(get_db),
+    session_factory = Depends(get_session_factory)
+):
+    async def handler():
+        project = Project(name=payload.name, description=payload.description, start_date=payload.start_date)
+
+        # Project must have at least 1 place (requirement: minimum 1, maximum 10)
+        if not payload.places:
+            raise HTTPException(422, "Project must have at least 1 place")
+
+        if async_mode:
+            # Перевіряємо місце в черзі до запису, щоб не лишати pending-проекти без задачі
+            if not project_jobs.has_capacity():
+                raise HTTPException(503, "Project job queue is full, retry later", headers={"Retry-After": "5"})
+            project = create_pending_project(db, project, payload.places)
+            project_jobs.enqueue(project.id, session_factory)
+            return status.HTTP_202_ACCEPTED, {
+                "id": project.id,
+                "status": project.status,
+                "status_url": f"/projects/{project.id}/status",
+            }
+
+        project = await create_project_with_places(db, project, payload.places)
+        return status.HTTP_201_CREATED, project_detail(db, project).model_dump(mode="json")
+
+    return await run_idempotent(db, idempotency_key, "POST /projects", request_hash(payload, async_mode=async_mode), handler)
+
+@router.post(
+    "/bulk",
+    response_model=ProjectBulkResult,
+    summary="Create many travel projects",
+    description="Create up to 1000 projects in one request. All external_ids of the batch are resolved in ArtIC together and projects are inserted in chunked transactions. Every item gets its own status; "
+                "if ArtIC is unavailable, every otherwise valid item gets 503 and can be retried.",
+    responses={
+        200: {
+            "description": "Per-item results",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "created": 1,
+                        "failed": 1,
+                        "results": [
+                            {"index": 0, "status_code": 201, "id": 12, "detail": None},
+                            {"index": 1, "status_code": 404, "id": None, "detail": "Place with external_id '123' not found in ArtIC API. Please check the ID is valid."}
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+async def create_projects(payload: ProjectBulkCreate, db: Session = Depends(get_db)):
+    results = await create_projects_bulk(db, payload.projects)
+    created = sum(1 for r in results if r["status_code"] == 201)
+    return {"created": created, "failed": len(results) - created, "results": results}
+
+@router.post(
+    "/import",
+    response_model=ImportProgressOut,
+    summary="Import projects from NDJSON",
+    description="Stream an NDJSON body with one `ProjectCreate` per line (places may carry `title`). Records are parsed incrementally and inserted in transactions of `batch_size` rows. "
+                "The report's `last_line` is the last line whose batch has been committed; pass `resume_from=last_line + 1` to continue an interrupted import. "
+                "If ArtIC is unavailable the import stops with 503 and status `failed` before the unresolved batch, so resuming retries it. "
+                "With `import_id` the progress is also readable via `GET /projects/import/{import_id}` while the import runs.",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {
+                    "schema": {"type": "string"},
+                    "example": '{"name": "Chicago Art Tour", "places": [{"external_id": "27992", "title": "A Sunday on La Grande Jatte"}]}\n'
+                }
+            }
+        }
+    },
+    responses={
+        200: {
+            "description": "Import report",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "import_id": "nightly-2024-06-01",
+                        "status": "completed",
+                        "last_line": 3,
+                        "imported": 2,
+                        "failed": 1,
+                        "errors": [{"line": 2, "detail": "Project must have at least 1 place"}],
+                        "rows_per_sec": 1520.4,
+                        "detail": None
+                    }
+                }
+            }
+        },
+        503: {
+            "description": "ArtIC API unavailable, the import stopped after the last committed batch",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "import_id": "nightly-2024-06-01",
+                        "status": "failed",
+                        "last_line": 500,
+                        "imported": 498,
+                        "failed": 2,
+                        "errors": [{"line": 2, "detail": "Project must have at least 1 place"}],
+                        "rows_per_sec": 1480.2,
+                        "detail": "ArtIC API is unavailable, resume from line 501"
+                    }
+                }
+            }
+        }
+    }
+)
+async def import_projects(
+    request: Request,
+    batch_size: int = Query(settings.import_batch_size, ge=1, le=10000, description="Rows per transaction"),
+    skip_validation: bool = Query(False, description="Do not check places that already have a title in ArtIC"),
+    resume_from: int = Query(1, ge=1, description="First line to import (1-based); earlier lines are skipped"),
+    import_id: str | None = Query(None, max_length=100, description="Client-chosen ID to poll progress"),
+    db: Session = Depends(get_db)
+):
+    progress = await import_projects_ndjson(
+        db,
+        request.stream(),
+        batch_size=batch_size,
+        skip_validation=skip_validation,
+        resume_from=resume_from,
+        import_id=import_id,
+    )
+    if progress["status"] == "failed":
+        content = ImportProgressOut.model_validate(progress).model_dump(mode="json")
+        return JSONResponse(content, status_code=503, headers={"Retry-After": "5"})
+    return progress
+
+@router.get(
+    "/import/{import_id}",
+    response_model=ImportProgressOut,
+    summary="Get import progress",
+    description="Progress of a recent import started with `import_id`.",
+    responses={
+        404: {
+            "description": "Import not found",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Import not found"}
+                }
+            }
+        }
+    }
+)
+def get_import_progress(import_id: str = Path(..., description="ID passed to POST /projects/import")):
+    progress = get_progress(import_id)
+    if progress is None:
+        raise HTTPException(404, "Import not found")
+    return progress
+
+def _parse_fields(fields: str | None) -> list[str]:
+    if fields is None:
+        return list(ProjectOut.model_fields)
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(ProjectOut.model_fields)
+    if unknown:
+        raise HTTPException(422, f"Unknown fields: {', '.join(sorted(unknown))}")
+    # id потрібен завжди: за ним підтягуються місця і клієнт розрізняє проекти
+    return [name for name in ProjectOut.model_fields if name == "id" or name in requested]
 
 @router.get(
     "",
-    response_model=list[ProjectOut],
+    response_model=list[ProjectListItemOut],
+    response_model_exclude_unset=True,
     summary="List all travel projects",
-    description="Get a paginated list of all travel projects. Returns projects ordered by ID (newest first).",
+    description="Get a paginated list of all travel projects. Returns projects ordered by ID (newest first). "
+                "`fields` limits the returned (and selected) columns, `id` is always included. "
+                "`include=places` embeds the first `PROJECT_DETAIL_PLACES_LIMIT` places (by id) of every project on the page "
+                "and `places_total`, loaded with one extra query. "
+                "Filters (`completed`, `start_date_from`/`start_date_to`, case-sensitive `name_prefix`) and `sort` are served by indexes.",
     responses={
         200: {
             "description": "List of projects",
@@ -84,33 +294,143 @@ async def create_project(payload: ProjectCreate, db: Session = Depends(get_db)):
                             "name": "Chicago Art Tour",
                             "description": "Exploring art museums",
                             "start_date": "2024-06-01",
-                            "completed": False
+                            "completed": False,
+                            "status": "active"
                         },
                         {
                             "id": 2,
                             "name": "Paris Museums",
                             "description": None,
                             "start_date": None,
-                            "completed": True
+                            "completed": True,
+                            "status": "active"
                         }
                     ]
                 }
             }
+        },
+        422: {
+            "description": "Unknown field in `fields`",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Unknown fields: budget"}
+                }
+            }
         }
     }
 )
 def list_projects(
     limit: int = Query(20, ge=1, le=100, description="Maximum number of projects to return"),
     offset: int = Query(0, ge=0, description="Number of projects to skip"),
+    fields: str | None = Query(None, description="Comma-separated project fields to return, e.g. `name,completed`"),
+    include: Literal["places"] | None = Query(None, description="Embed related objects: `places`"),
+    completed: bool | None = Query(None, description="Only completed (true) or not completed (false) projects"),
+    start_date_from: date | None = Query(None, description="Projects starting on or after this date"),
+    start_date_to: date | None = Query(None, description="Projects starting on or before this date"),
+    name_prefix: str | None = Query(None, min_length=1, max_length=200, description="Projects whose name starts with this text (case-sensitive)"),
+    sort: Literal["id", "-id", "name", "-name", "start_date", "-start_date"] = Query("-id", description="Sort field, `-` for descending"),
     db: Session = Depends(get_db)
 ):
-    return project_crud.list_all(db, limit=min(limit, 100), offset=offset)
+    projects = project_crud.list_all(
+        db,
+        limit=min(limit, 100),
+        offset=offset,
+        fields=_parse_fields(fields),
+        completed=completed,
+        start_date_from=start_date_from,
+        start_date_to=start_date_to,
+        name_prefix=name_prefix,
+        sort=sort,
+    )
+    if include == "places" and projects:
+        by_project = {p["id"]: p for p in projects}
+        totals = place_crud.count_for_projects(db, list(by_project))
+        for project in projects:
+            project["places"] = []
+            project["places_total"] = totals.get(project["id"], 0)
+        for place in place_crud.list_for_projects(db, list(by_project), settings.project_detail_places_limit):
+            by_project[place.project_id]["places"].append(place)
+    return projects
+
+@router.get(
+    "/search",
+    response_model=list[ProjectSearchResultOut],
+    summary="Full-text search over projects and their places",
+    description="Searches project names and descriptions and place titles and notes. "
+                "All words must match (the last one as a prefix), each anywhere in the project or its places, "
+                "so `paris bedroom` finds a project named Paris with a place titled The Bedroom; projects are ranked by relevance, "
+                "with matches in the project name weighted highest.",
+    responses={
+        200: {
+            "description": "Matching projects, most relevant first",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "id": 1,
+                            "name": "Chicago Art Tour",
+                            "description": "Exploring art museums",
+                            "start_date": "2024-06-01",
+                            "completed": False,
+                            "status": "active",
+                            "score": 7.31
+                        }
+                    ]
+                }
+            }
+        }
+    }
+)
+def search_projects(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of projects to return"),
+    offset: int = Query(0, ge=0, description="Number of projects to skip"),
+    db: Session = Depends(get_db)
+):
+    hits = search_crud.search_projects(db, q, limit=limit, offset=offset)
+    if not hits:
+        return []
+    rows = project_crud.get_rows(db, [project_id for project_id, _ in hits], list(ProjectOut.model_fields))
+    # bm25 від'ємний: менше - краще; назовні віддаємо "більше - краще"
+    return [{**rows[project_id], "score": round(-score, 4)} for project_id, score in hits if project_id in rows]
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export all projects with places as NDJSON",
+    description="Stream every project with its places as one JSON object per line, ordered by ID. Use `since` for incremental exports (projects changed at or after the given time) and `gzip=true` to download a gzip-compressed file.",
+    responses={
+        200: {
+            "description": "NDJSON stream",
+            "content": {
+                "application/x-ndjson": {
+                    "example": '{"id": 1, "name": "Chicago Art Tour", "description": null, "start_date": null, "completed": false, "status": "active", "places": [], "updated_at": "2024-06-01T10:00:00"}\n'
+                },
+                "application/gzip": {}
+            }
+        }
+    }
+)
+def export_projects(
+    since: datetime | None = Query(None, description="Only projects changed at or after this time (ISO 8601)"),
+    gzip: bool = Query(False, description="Compress the stream with gzip"),
+    batch_size: int = Query(500, ge=1, le=5000, description="Rows fetched from the database per batch"),
+    db: Session = Depends(get_db)
+):
+    chunks = iter_projects_ndjson(db, batch_size=batch_size, since=since)
+    if gzip:
+        return StreamingResponse(
+            gzip_stream(chunks),
+            media_type="application/gzip",
+            headers={"Content-Disposition": 'attachment; filename="projects.ndjson.gz"'},
+        )
+    return StreamingResponse(chunks, media_type="application/x-ndjson")
 
 @router.get(
     "/{project_id}",
     response_model=ProjectDetailOut,
     summary="Get a single travel project",
-    description="Get detailed information about a specific travel project including all its places.",
+    description="Get detailed information about a specific travel project with its first `PROJECT_DETAIL_PLACES_LIMIT` places (by id) and `places_total`; page through the rest with `GET /projects/{id}/places`. The response carries an `ETag`; send it back in `If-None-Match` to get 304 when nothing changed.",
     responses={
         200: {
             "description": "Project details",
@@ -122,20 +442,26 @@ def list_projects(
                         "description": "Exploring art museums",
                         "start_date": "2024-06-01",
                         "completed": False,
+                        "status": "active",
                         "places": [
                             {
                                 "id": 1,
+                                "project_id": 1,
                                 "external_id": "27992",
                                 "title": "A Sunday on La Grande Jatte",
                                 "notes": "Must see",
                                 "visited": False,
                                 "visited_at": None
                             }
-                        ]
+                        ],
+                        "places_total": 1
                     }
                 }
             }
         },
+        304: {
+            "description": "Not modified: the `If-None-Match` header matches the current ETag"
+        },
         404: {
             "description": "Project not found",
             "content": {
@@ -146,11 +472,114 @@ def list_projects(
         }
     }
 )
-def get_project(project_id: int = Path(..., description="ID of the project to retrieve"), db: Session = Depends(get_db)):
-    project = get(db, Project, project_id)
-    if not project:
+def get_project(
+    request: Request,
+    project_id: int = Path(..., description="ID of the project to retrieve"),
+    db: Session = Depends(get_db)
+):
+    # Спочатку лише версія по PK: на 304 не завантажуємо місця і нічого не серіалізуємо
+    version = project_crud.get_version(db, project_id)
+    if version is None:
+        raise HTTPException(404, "Project not found")
+
+    etag = make_etag(project_id, version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    # Готовий JSON з кешу: без завантаження місць і серіалізації
+    body = project_cache.get(project_id, version)
+    if body is None:
+        project = get(db, Project, project_id)
+        if not project:
+            raise HTTPException(404, "Project not found")
+        body = project_detail(db, project).model_dump_json().encode()
+        project_cache.set(project_id, version, body)
+
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+@router.get(
+    "/{project_id}/status",
+    response_model=ProjectJobStatus,
+    summary="Get project creation status",
+    description="Cheap status check for projects created with `async=true`: `pending`, `active` or `failed` with the failure reason.",
+    responses={
+        200: {
+            "description": "Project status",
+            "content": {
+                "application/json": {
+                    "example": {"id": 1, "status": "failed", "detail": "Place with external_id '123' not found in ArtIC API. Please check the ID is valid."}
+                }
+            }
+        },
+        404: {
+            "description": "Project not found",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Project not found"}
+                }
+            }
+        }
+    }
+)
+def get_project_status(project_id: int = Path(..., description="ID of the project"), db: Session = Depends(get_db)):
+    row = project_crud.get_status(db, project_id)
+    if row is None:
         raise HTTPException(404, "Project not found")
-    return project
+    return {"id": project_id, "status": row.status, "detail": row.status_detail}
+
+async def _event_stream(project_id: int, last_event_id: str | None):
+    # Перший кадр одразу віддає заголовки; клієнт перепідключається через 3 с
+    yield "retry: 3000\n\n"
+    async for event in project_events.subscribe(project_id, last_event_id, settings.project_events_heartbeat_seconds):
+        yield ": keep-alive\n\n" if event is None else event.frame
+
+@router.get(
+    "/{project_id}/events",
+    summary="Stream project changes (SSE)",
+    description="Server-Sent Events stream of changes to the project instead of polling `GET /projects/{id}`. "
+                "Events: `place_added`, `place_updated` (the place and the project `completed` flag), `project_updated` "
+                "(project fields) and `project_deleted`, after which the stream ends. "
+                "Reconnect with `Last-Event-ID` to receive the events missed in between; if they are no longer buffered "
+                "or the id comes from before a server restart, the stream starts with a `reset` event and the client should re-read the project.",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Event stream",
+            "content": {
+                "text/event-stream": {
+                    "example": 'retry: 3000\n\n'
+                               'id: 62f1c0a3b2e10-42\nevent: place_updated\n'
+                               'data: {"project_id":1,"completed":false,"place":{"id":2,"project_id":1,"external_id":"28560",'
+                               '"title":"The Bedroom","notes":null,"visited":true,"visited_at":"2024-06-15T10:30:00"}}\n\n'
+                }
+            }
+        },
+        404: {
+            "description": "Project not found",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Project not found"}
+                }
+            }
+        }
+    }
+)
+async def project_events_stream(
+    project_id: int = Path(..., description="ID of the project"),
+    last_event_id: str | None = Header(None, alias="Last-Event-ID", max_length=64, description="ID of the last received event"),
+    db: Session = Depends(get_db),
+):
+    try:
+        if project_crud.get_status(db, project_id) is None:
+            raise HTTPException(404, "Project not found")
+    finally:
+        # Потік живе годинами: сесія і з'єднання не повинні триматись до його кінця
+        db.close()
+    return StreamingResponse(
+        _event_stream(project_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @router.patch(
     "/{project_id}",
@@ -168,7 +597,9 @@ def get_project(project_id: int = Path(..., description="ID of the project to re
                         "description": "Updated description",
                         "start_date": "2024-07-01",
                         "completed": False,
-                        "places": []
+                        "status": "active",
+                        "places": [],
+                        "places_total": 0
                     }
                 }
             }
@@ -199,9 +630,12 @@ def update_project(
     if payload.start_date is not None:
         project.start_date = payload.start_date
 
+    touch_project(project)
     db.commit()
+    project_cache.invalidate(project_id)
     db.refresh(project)
-    return project
+    project_events.publish(project_id, "project_updated", ProjectOut.model_validate(project).model_dump(mode="json"))
+    return project_detail(db, project)
 
 @router.delete(
     "/{project_id}",
@@ -236,5 +670,5 @@ def delete_project(project_id: int = Path(..., description="ID of the project to
         raise HTTPException(404, "Project not found")
     if not can_delete(project):
         raise HTTPException(409, "Cannot delete project with visited places")
-    delete(db, project)
+    remove_project(db, project)
     return None
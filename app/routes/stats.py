@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.deps.auth import verify_api_key
+from app.deps.db import get_db
+from app.schemas import StatsOut
+from app.services.stats_service import get_stats
+
+router = APIRouter(dependencies=[Depends(verify_api_key)])
+
+@router.get(
+    "",
+    response_model=StatsOut,
+    summary="Project and visit statistics",
+    description="Totals, completion rate, visits per day and the most added artworks. "
+                "Served from summary tables that are updated together with every change and "
+                "periodically reconciled with the data, so the cost does not depend on the number of projects.",
+    responses={
+        200: {
+            "description": "Statistics",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "projects_total": 120,
+                        "projects_completed": 30,
+                        "completion_rate": 0.25,
+                        "places_total": 540,
+                        "places_visited": 210,
+                        "visits_per_day": [{"day": "2024-06-01", "visits": 12}, {"day": "2024-06-02", "visits": 7}],
+                        "top_artworks": [{"external_id": "27992", "title": "A Sunday on La Grande Jatte — 1884", "places": 41}]
+                    }
+                }
+            }
+        }
+    }
+)
+def stats(
+    days: int = Query(30, ge=1, le=365, description="Number of recent days in `visits_per_day`"),
+    top: int = Query(10, ge=1, le=100, description="Number of artworks in `top_artworks`"),
+    db: Session = Depends(get_db)
+):
+    return get_stats(db, days=days, top=top)
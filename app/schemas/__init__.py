@@ -1,7 +1,19 @@
-from .project import ProjectCreate, ProjectUpdate, ProjectOut, ProjectDetailOut
-from .place import PlaceCreate, PlaceUpdate, PlaceOut
+from .project import (
+    ProjectCreate, ProjectUpdate, ProjectOut, ProjectListItemOut, ProjectSearchResultOut, ProjectDetailOut,
+    ProjectBulkCreate, ProjectBulkItemResult, ProjectBulkResult, ProjectExportOut,
+    ProjectImport, ImportErrorOut, ImportProgressOut, ProjectJobAccepted, ProjectJobStatus,
+)
+from .place import PlaceCreate, PlaceImport, PlaceUpdate, PlaceBulkUpdateItem, PlacesBulkUpdate, PlaceOut
+from .artwork import ArtworkSearchResultOut
+from .stats import DailyVisitsOut, TopArtworkOut, StatsOut
+from .batch import BatchSubRequest, BatchRequest, BatchSubResponse, BatchResponse
 
 __all__ = [
-    "ProjectCreate", "ProjectUpdate", "ProjectOut", "ProjectDetailOut",
-    "PlaceCreate", "PlaceUpdate", "PlaceOut",
+    "ProjectCreate", "ProjectUpdate", "ProjectOut", "ProjectListItemOut", "ProjectSearchResultOut", "ProjectDetailOut",
+    "ProjectBulkCreate", "ProjectBulkItemResult", "ProjectBulkResult", "ProjectExportOut",
+    "ProjectImport", "ImportErrorOut", "ImportProgressOut", "ProjectJobAccepted", "ProjectJobStatus",
+    "PlaceCreate", "PlaceImport", "PlaceUpdate", "PlaceBulkUpdateItem", "PlacesBulkUpdate", "PlaceOut",
+    "ArtworkSearchResultOut",
+    "DailyVisitsOut", "TopArtworkOut", "StatsOut",
+    "BatchSubRequest", "BatchRequest", "BatchSubResponse", "BatchResponse",
 ]
@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+
+class ArtworkSearchResultOut(BaseModel):
+    external_id: str = Field(..., examples=["27992"], description="ArtIC artwork ID, usable as `external_id` of a place")
+    title: str | None
+    artist_title: str | None
+    score: float = Field(..., description="Similarity, higher is better")
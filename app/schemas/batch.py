@@ -0,0 +1,46 @@
+import re
+from typing import Any, Literal
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+
+# Ім'я заголовка - token з RFC 9110; значення - видимі latin-1 символи, пробіл і таб
+_HEADER_NAME = re.compile(r"[!#$%&'*+\-.^_`|~0-9A-Za-z]+")
+_HEADER_VALUE = re.compile(r"[\t\x20-\x7e\x80-\xff]*")
+
+class BatchSubRequest(BaseModel):
+    method: Literal["GET", "POST", "PATCH", "DELETE"] = Field(..., examples=["GET"])
+    path: str = Field(..., pattern=r"^/", examples=["/projects/1"], description="Path of an existing endpoint, query string allowed")
+    body: Any | None = Field(None, examples=[{"visited": True}])
+    headers: dict[str, str] = Field(default_factory=dict, examples=[{"If-None-Match": "\"1-3\""}])
+
+    @field_validator("headers")
+    @classmethod
+    def validate_headers(cls, headers: dict[str, str]) -> dict[str, str]:
+        for name, value in headers.items():
+            if not _HEADER_NAME.fullmatch(name):
+                raise ValueError(f"Invalid header name: {name!r}")
+            if not _HEADER_VALUE.fullmatch(value):
+                raise ValueError(f"Header {name} must contain only latin-1 characters without control characters")
+        return headers
+
+class BatchRequest(BaseModel):
+    requests: list[BatchSubRequest] = Field(..., min_length=1, max_length=50)
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "requests": [
+                    {"method": "GET", "path": "/projects/1"},
+                    {"method": "GET", "path": "/projects/1/places/2"},
+                    {"method": "PATCH", "path": "/projects/1/places/2", "body": {"visited": True}}
+                ]
+            }
+        }
+    )
+
+class BatchSubResponse(BaseModel):
+    status: int
+    headers: dict[str, str]
+    body: Any | None
+
+class BatchResponse(BaseModel):
+    responses: list[BatchSubResponse]
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from datetime import datetime
+from app.core.config import settings
 
 class PlaceCreate(BaseModel):
     external_id: str = Field(..., min_length=1, examples=["27992"], description="Numeric ID from ArtIC API (e.g., 27992, 28560)")
@@ -14,6 +15,9 @@ class PlaceCreate(BaseModel):
         }
     )
 
+class PlaceImport(PlaceCreate):
+    title: str | None = Field(None, max_length=300, examples=["A Sunday on La Grande Jatte"])
+
 class PlaceUpdate(BaseModel):
     notes: str | None = Field(None, examples=["Visited on 2024-06-15. Amazing!"])
     visited: bool | None = Field(None, examples=[True])
@@ -27,8 +31,44 @@ class PlaceUpdate(BaseModel):
         }
     )
 
+class PlaceBulkUpdateItem(PlaceUpdate):
+    id: int = Field(..., examples=[1], description="ID of the place in the project")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "id": 1,
+                "notes": "Visited on 2024-06-15. Amazing!",
+                "visited": True
+            }
+        }
+    )
+
+class PlacesBulkUpdate(BaseModel):
+    places: list[PlaceBulkUpdateItem] = Field(..., min_length=1, description="At most `MAX_PLACES_PER_PROJECT` places")
+
+    # Ліміт - з налаштувань, тож не max_length; перевіряється до валідації кожного елемента
+    @field_validator("places", mode="before")
+    @classmethod
+    def limit_places(cls, places):
+        if isinstance(places, list) and len(places) > settings.max_places_per_project:
+            raise ValueError(f"At most {settings.max_places_per_project} places can be updated at once")
+        return places
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "places": [
+                    {"id": 1, "visited": True},
+                    {"id": 2, "notes": "Closed on Mondays", "visited": False}
+                ]
+            }
+        }
+    )
+
 class PlaceOut(BaseModel):
     id: int
+    project_id: int
     external_id: str
     title: str | None
     notes: str | None
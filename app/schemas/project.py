@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
-from datetime import date
-from .place import PlaceCreate, PlaceOut
+from datetime import date, datetime
+from .place import PlaceCreate, PlaceImport, PlaceOut
 
 class ProjectCreate(BaseModel):
     name: str = Field(..., min_length=1, max_length=200, examples=["Chicago Art Tour"])
@@ -22,6 +22,23 @@ class ProjectCreate(BaseModel):
         }
     )
 
+class ProjectImport(ProjectCreate):
+    places: list[PlaceImport] | None = None
+
+class ProjectBulkCreate(BaseModel):
+    projects: list[ProjectCreate] = Field(..., min_length=1, max_length=1000)
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "projects": [
+                    {"name": "Chicago Art Tour", "places": [{"external_id": "27992"}]},
+                    {"name": "Impressionists", "places": [{"external_id": "28560"}, {"external_id": "16568"}]}
+                ]
+            }
+        }
+    )
+
 class ProjectUpdate(BaseModel):
     name: str | None = Field(None, min_length=1, max_length=200, examples=["Updated Chicago Art Tour"])
     description: str | None = Field(None, examples=["Updated description"])
@@ -43,8 +60,63 @@ class ProjectOut(BaseModel):
     description: str | None
     start_date: date | None
     completed: bool
+    status: str
 
     model_config = ConfigDict(from_attributes=True)
 
+class ProjectListItemOut(BaseModel):
+    """Елемент GET /projects: лише поля з ?fields= і places з ?include=places"""
+    id: int
+    name: str | None = None
+    description: str | None = None
+    start_date: date | None = None
+    completed: bool | None = None
+    status: str | None = None
+    places: list[PlaceOut] | None = None
+    places_total: int | None = None
+
+class ProjectSearchResultOut(ProjectOut):
+    score: float = Field(..., description="Relevance, higher is better")
+
 class ProjectDetailOut(ProjectOut):
+    places: list[PlaceOut] = Field(..., description="First places by id, at most `PROJECT_DETAIL_PLACES_LIMIT`; page through the rest with GET /projects/{id}/places")
+    places_total: int = Field(..., description="Number of all places in the project")
+
+class ProjectExportOut(ProjectOut):
     places: list[PlaceOut]
+    updated_at: datetime
+
+class ProjectJobAccepted(BaseModel):
+    id: int
+    status: str
+    status_url: str
+
+class ProjectJobStatus(BaseModel):
+    id: int
+    status: str
+    detail: str | None = None
+
+class ProjectBulkItemResult(BaseModel):
+    index: int
+    status_code: int
+    id: int | None = None
+    detail: str | None = None
+
+class ProjectBulkResult(BaseModel):
+    created: int
+    failed: int
+    results: list[ProjectBulkItemResult]
+
+class ImportErrorOut(BaseModel):
+    line: int
+    detail: str
+
+class ImportProgressOut(BaseModel):
+    import_id: str | None = None
+    status: str
+    last_line: int
+    imported: int
+    failed: int
+    errors: list[ImportErrorOut]
+    rows_per_sec: float
+    detail: str | None = None
@@ -0,0 +1,20 @@
+from datetime import date
+from pydantic import BaseModel
+
+class DailyVisitsOut(BaseModel):
+    day: date
+    visits: int
+
+class TopArtworkOut(BaseModel):
+    external_id: str
+    title: str | None
+    places: int
+
+class StatsOut(BaseModel):
+    projects_total: int
+    projects_completed: int
+    completion_rate: float
+    places_total: int
+    places_visited: int
+    visits_per_day: list[DailyVisitsOut]
+    top_artworks: list[TopArtworkOut]
@@ -1,22 +1,106 @@
+import asyncio
 import httpx
 import logging
+import time
 from app.core.config import settings
+from app.core.metrics import artic_requests, artic_request_duration
+from app.core.tracing import current_span, traced, tracer
+from .artwork_catalog import artwork_catalog
 
 logger = logging.getLogger(__name__)
 
+# Скільки id ArtIC віддає за один запит /artworks?ids=...
+ARTWORKS_BATCH_SIZE = 100
+
+class ArticUnavailable(Exception):
+    """ArtIC не відповів (мережа, таймаут, 5xx, 429): про наявність id нічого не відомо"""
+
+def _outcome(status_code: int) -> str:
+    if status_code == 200:
+        return "ok"
+    if status_code == 404:
+        return "not_found"
+    return "client_error" if status_code < 500 else "server_error"
+
+async def _timed_get(client: httpx.AsyncClient, endpoint: str, url: str, **kwargs) -> httpx.Response:
+    """GET до ArtIC із затримкою та результатом у метриках"""
+    span = current_span.get() if tracer.enabled else None
+    if span is not None:
+        kwargs["headers"] = {**kwargs.get("headers", {}), "traceparent": span.traceparent()}
+    started = time.perf_counter()
+    try:
+        r = await client.get(url, **kwargs)
+    except httpx.TimeoutException:
+        artic_requests.inc(endpoint, "timeout")
+        raise
+    except httpx.RequestError:
+        artic_requests.inc(endpoint, "network_error")
+        raise
+    finally:
+        artic_request_duration.observe(time.perf_counter() - started, endpoint)
+    artic_requests.inc(endpoint, _outcome(r.status_code))
+    return r
+
 async def get_artwork(external_id: str) -> dict | None:
     url = f"{settings.artic_api_base_url}/artworks/{external_id}"
-    async with httpx.AsyncClient(timeout=10) as client:
-        try:
-            r = await client.get(url)
-        except httpx.RequestError as e:
-            logger.warning(f"Failed to fetch artwork {external_id} from ArtIC API: {e}")
-            return None
+    with tracer.span("artic.get_artwork", external_id=external_id) as span:
+        async with httpx.AsyncClient(timeout=10) as client:
+            try:
+                r = await _timed_get(client, "artwork", url)
+            except httpx.RequestError as e:
+                logger.warning(f"Failed to fetch artwork {external_id} from ArtIC API: {e}")
+                return None
+        if span is not None:
+            span.attributes["http.status_code"] = r.status_code
 
     if r.status_code == 200:
-        return (r.json().get("data") or {})
+        data = r.json().get("data") or {}
+        artwork_catalog.add([data])
+        return data
     if r.status_code == 404:
         return None
     if r.status_code == 400:
         return None
     return None
+
+@traced("artic.get_artworks_batch")
+async def _get_artworks_batch(client: httpx.AsyncClient, external_ids: list[str]) -> dict[str, dict]:
+    url = f"{settings.artic_api_base_url}/artworks"
+    try:
+        r = await _timed_get(client, "artworks", url, params={"ids": ",".join(external_ids), "fields": "id,title,artist_title", "limit": len(external_ids)})
+    except httpx.RequestError as e:
+        logger.warning(f"Failed to fetch artworks {external_ids} from ArtIC API: {e}")
+        raise ArticUnavailable(str(e)) from e
+
+    if r.status_code >= 500 or r.status_code == 429:
+        logger.warning(f"Failed to fetch artworks {external_ids} from ArtIC API: HTTP {r.status_code}")
+        raise ArticUnavailable(f"ArtIC API responded with HTTP {r.status_code}")
+    if r.status_code != 200:
+        return {}
+    return {str(a["id"]): a for a in (r.json().get("data") or []) if a and "id" in a}
+
+async def get_artworks(external_ids: list[str], strict: bool = False) -> dict[str, dict]:
+    """Отримати багато артефактів пачками; відсутні id просто не потрапляють у результат.
+
+    strict - якщо якусь пачку не вдалося отримати, кинути ArticUnavailable, а не вважати її id відсутніми.
+    """
+    # ArtIC приймає лише числові id, решта все одно не знайдеться
+    ids = sorted({i for i in external_ids if i.isdigit()})
+    if not ids:
+        return {}
+
+    chunks = [ids[i:i + ARTWORKS_BATCH_SIZE] for i in range(0, len(ids), ARTWORKS_BATCH_SIZE)]
+    async with httpx.AsyncClient(timeout=10) as client:
+        results = await asyncio.gather(*(_get_artworks_batch(client, chunk) for chunk in chunks), return_exceptions=True)
+
+    artworks = {}
+    for batch in results:
+        if isinstance(batch, ArticUnavailable):
+            if strict:
+                raise batch
+            continue
+        if isinstance(batch, BaseException):
+            raise batch
+        artworks.update(batch)
+    artwork_catalog.add(artworks.values())
+    return artworks
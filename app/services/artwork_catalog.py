@@ -0,0 +1,241 @@
+import asyncio
+import bisect
+import heapq
+import itertools
+import logging
+import re
+import threading
+import unicodedata
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from sqlalchemy.orm import sessionmaker
+from app.crud import artwork as artwork_crud
+
+logger = logging.getLogger(__name__)
+
+# Мінімальна триграмна схожість слова для нечіткого збігу; 0.5 пропускає одну-дві помилки
+MIN_SIMILARITY = 0.5
+# Ваги збігу слова: точний, префікс (автодоповнення "mona l" -> "Mona Lisa"), нечіткий - схожість
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.9
+# Скільки слів словника розгортає короткий префікс
+MAX_PREFIX_EXPANSIONS = 100
+# Коротші слова не шукаються нечітко: у них майже всі триграми змінює одна помилка
+MIN_FUZZY_LENGTH = 4
+
+
+def _words(text: str | None) -> list[str]:
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.findall(r"\w+", text.casefold())
+
+def _trigrams(word: str) -> set[str]:
+    # Як у pg_trgm: два пробіли на початку, один у кінці
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ArtworkIndex:
+    """In-memory індекс назв і авторів; оновлюється по одному артефакту.
+
+    Слова документів ведуть на множини артефактів, а префіксний (відсортований словник) і
+    триграмний пошук іде по словнику, а не по документах: він на порядки менший за каталог.
+    Результат - артефакти, де знайдено кожне слово запиту (останнє - як префікс).
+    """
+
+    def __init__(self):
+        self._docs: dict[str, tuple[str | None, str | None, frozenset[str]]] = {}
+        self._postings: dict[str, set[str]] = {}
+        self._sorted_words: list[str] = []
+        self._word_grams: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _add_word(self, word: str) -> None:
+        bisect.insort(self._sorted_words, word)
+        for gram in _trigrams(word):
+            self._word_grams.setdefault(gram, set()).add(word)
+
+    def _remove_word(self, word: str) -> None:
+        del self._postings[word]
+        del self._sorted_words[bisect.bisect_left(self._sorted_words, word)]
+        for gram in _trigrams(word):
+            self._word_grams[gram].discard(word)
+
+    def add(self, artwork_id: str, title: str | None, artist_title: str | None) -> bool:
+        """Додати або оновити артефакт; False, якщо нічого не змінилось"""
+        words = frozenset(_words(title) + _words(artist_title))
+        with self._lock:
+            current = self._docs.get(artwork_id)
+            if current is not None and current[:2] == (title, artist_title):
+                return False
+            old_words = current[2] if current is not None else frozenset()
+            for word in old_words - words:
+                self._postings[word].discard(artwork_id)
+                if not self._postings[word]:
+                    self._remove_word(word)
+            for word in words - old_words:
+                if word not in self._postings:
+                    self._postings[word] = set()
+                    self._add_word(word)
+                self._postings[word].add(artwork_id)
+            self._docs[artwork_id] = (title, artist_title, words)
+        return True
+
+    def _candidates(self, word: str, prefix: bool) -> dict[str, float]:
+        """Слова словника, що відповідають слову запиту, з вагою збігу"""
+        matches: dict[str, float] = {}
+        if word in self._postings:
+            matches[word] = EXACT_SCORE
+        if prefix:
+            start = bisect.bisect_left(self._sorted_words, word)
+            for candidate in itertools.islice(self._sorted_words, start, start + MAX_PREFIX_EXPANSIONS):
+                if not candidate.startswith(word):
+                    break
+                matches.setdefault(candidate, PREFIX_SCORE)
+        # Нечіткий пошук - лише коли слово не знайдено як є: він найдорожчий
+        if not matches and len(word) >= MIN_FUZZY_LENGTH:
+            grams = _trigrams(word)
+            shared = Counter()
+            for gram in grams:
+                shared.update(self._word_grams.get(gram, ()))
+            # Менше спільних триграм не дасть MIN_SIMILARITY навіть для найкоротшого слова
+            min_shared = MIN_SIMILARITY * len(grams) / 2
+            for candidate, count in shared.items():
+                if count < min_shared:
+                    continue
+                # Коефіцієнт Дайса по триграмах
+                similarity = 2 * count / (len(grams) + len(candidate) + 1)
+                if similarity >= MIN_SIMILARITY and similarity > matches.get(candidate, 0.0):
+                    matches[candidate] = similarity
+        return matches
+
+    def search(self, q: str, limit: int) -> list[dict]:
+        words = _words(q)
+        if not words:
+            return []
+
+        with self._lock:
+            per_word = [self._candidates(w, prefix=i == len(words) - 1) for i, w in enumerate(words)]
+            if not all(per_word):
+                return []
+            # Починаємо з найвужчого слова, решту перетинаємо з уже знайденими артефактами
+            per_word.sort(key=lambda matches: sum(len(self._postings[w]) for w in matches))
+
+            # Артефакти групуються за сумарною вагою: множини замість поелементного підрахунку,
+            # бо часте слово може бути в десятках тисяч артефактів
+            groups: dict[float, set[str]] | None = None
+            for matches in per_word:
+                tiers: dict[float, set[str]] = {}
+                seen: set[str] = set()
+                for candidate, score in sorted(matches.items(), key=lambda m: -m[1]):
+                    docs = self._postings[candidate] - seen
+                    seen |= docs
+                    tiers.setdefault(score, set()).update(docs)
+                if groups is None:
+                    groups = tiers
+                else:
+                    merged: dict[float, set[str]] = {}
+                    for total, docs in groups.items():
+                        for score, tier_docs in tiers.items():
+                            matched = docs & tier_docs
+                            if matched:
+                                merged.setdefault(total + score, set()).update(matched)
+                    groups = merged
+                if not groups:
+                    return []
+
+            results = []
+            for total in sorted(groups, reverse=True):
+                # Серед однакових за вагою - стабільний порядок за id
+                for artwork_id in heapq.nsmallest(limit - len(results), groups[total]):
+                    title, artist_title, _ = self._docs[artwork_id]
+                    results.append({
+                        "external_id": artwork_id,
+                        "title": title,
+                        "artist_title": artist_title,
+                        "score": round(total / len(words), 3),
+                    })
+                if len(results) >= limit:
+                    break
+            return results
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"artworks": len(self._docs), "words": len(self._postings)}
+
+
+class ArtworkCatalog:
+    """Каталог артефактів, що наповнюється з відповідей ArtIC.
+
+    Індекс оновлюється одразу, а в таблицю artworks нові записи пишуться пачками фоновою
+    задачею, щоб виклик ArtIC не чекав на БД. При старті індекс відновлюється з таблиці.
+    """
+
+    def __init__(self):
+        self.index = ArtworkIndex()
+        self._pending: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def add(self, artworks: Iterable[dict]) -> None:
+        now = datetime.now(timezone.utc)
+        for artwork in artworks:
+            if not artwork or artwork.get("id") is None:
+                continue
+            artwork_id = str(artwork["id"])
+            title, artist_title = artwork.get("title"), artwork.get("artist_title")
+            if self.index.add(artwork_id, title, artist_title):
+                with self._lock:
+                    self._pending[artwork_id] = {"id": artwork_id, "title": title, "artist_title": artist_title, "updated_at": now}
+
+    def search(self, q: str, limit: int) -> list[dict]:
+        return self.index.search(q, limit)
+
+    def load(self, session_factory: sessionmaker) -> int:
+        db = session_factory()
+        try:
+            for artwork_id, title, artist_title in artwork_crud.iter_catalog(db):
+                self.index.add(artwork_id, title, artist_title)
+        finally:
+            db.close()
+        return len(self.index)
+
+    def flush(self, session_factory: sessionmaker) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        db = session_factory()
+        try:
+            artwork_crud.upsert_many(db, list(pending.values()))
+        except Exception:
+            # Повернемо в чергу, якщо тим часом не прийшла новіша версія
+            with self._lock:
+                for artwork_id, row in pending.items():
+                    self._pending.setdefault(artwork_id, row)
+            raise
+        finally:
+            db.close()
+        return len(pending)
+
+    async def flush_loop(self, session_factory: sessionmaker, interval_seconds: float) -> None:
+        """Фоновий запис нових артефактів у таблицю (запускається в lifespan)"""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await asyncio.to_thread(self.flush, session_factory)
+            except Exception:
+                logger.exception("Failed to persist artwork catalog")
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = len(self._pending)
+        return {**self.index.stats(), "pending_writes": pending}
+
+
+artwork_catalog = ArtworkCatalog()
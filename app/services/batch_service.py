@@ -0,0 +1,108 @@
+import asyncio
+import json
+import logging
+from fastapi import HTTPException, Request
+from sqlalchemy.orm import Session
+from app.deps.batch import BATCH_SCOPE_KEY
+from app.schemas import BatchSubRequest
+
+logger = logging.getLogger(__name__)
+
+# Під-запити, які можна виконувати паралельно: вони не змінюють даних
+READ_ONLY_METHODS = {"GET"}
+
+def _sub_scope(parent: Request, sub: BatchSubRequest, body: bytes, db: Session | None) -> dict:
+    path, _, query = sub.path.partition("?")
+    headers = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in sub.headers.items()]
+    if sub.body is not None:
+        headers.append((b"content-type", b"application/json"))
+    headers.append((b"content-length", str(len(body)).encode()))
+    return {
+        "type": "http",
+        # 2.4: StreamingResponse не слухає receive() на розрив з'єднання
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": parent.scope.get("http_version", "1.1"),
+        "method": sub.method,
+        "scheme": parent.url.scheme,
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": parent.scope.get("root_path", ""),
+        "query_string": query.encode(),
+        "headers": headers,
+        "client": parent.scope.get("client"),
+        "server": parent.scope.get("server"),
+        "state": dict(parent.scope.get("state") or {}),
+        BATCH_SCOPE_KEY: {"db": db},
+    }
+
+async def _dispatch(parent: Request, sub: BatchSubRequest, db: Session | None) -> dict:
+    """Виконати під-запит через ASGI-застосунок (ті ж роутери, валідація і залежності)"""
+    body = json.dumps(sub.body).encode() if sub.body is not None else b""
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Тіло вже віддане; далі чекаємо, поки застосунок не закінчить
+        await asyncio.Future()
+
+    response = {"status": 500, "headers": {}, "chunks": []}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {k.decode("latin-1"): v.decode("latin-1") for k, v in message.get("headers", [])}
+        elif message["type"] == "http.response.body":
+            response["chunks"].append(message.get("body", b""))
+
+    try:
+        await parent.app(_sub_scope(parent, sub, body, db), receive, send)
+    except Exception:
+        # ServerErrorMiddleware уже віддав 500 і прокидає виняток далі: він стосується лише цього під-запиту
+        logger.exception(f"Batch sub-request {sub.method} {sub.path} failed")
+        if db is not None:
+            db.rollback()
+        if not response["chunks"]:
+            return {"status": 500, "headers": {}, "body": {"detail": "Internal Server Error"}}
+
+    raw = b"".join(response["chunks"])
+    headers = response["headers"]
+    headers.pop("content-length", None)
+    if not raw:
+        content = None
+    elif headers.get("content-type", "").startswith("application/json"):
+        content = json.loads(raw)
+    else:
+        content = raw.decode()
+    return {"status": response["status"], "headers": headers, "body": content}
+
+async def run_batch(parent: Request, db: Session, requests: list[BatchSubRequest]) -> list[dict]:
+    """Виконати під-запити по порядку.
+
+    Змінюючі запити йдуть послідовно в сесії батча. Суміжні GET-и виконуються паралельно,
+    кожен у власній сесії (Session не потокобезпечна), і бачать усі попередні зміни батча.
+    Помилка під-запиту не зупиняє решту: вона повертається його статусом.
+    """
+    for sub in requests:
+        path = sub.path.split("?")[0].rstrip("/")
+        if path == "/batch":
+            raise HTTPException(422, "Nested batch requests are not allowed")
+        # SSE-потік не завершується сам, батч чекав би на нього вічно
+        if path.startswith("/projects/") and path.endswith("/events"):
+            raise HTTPException(422, "Event streams are not allowed in a batch")
+
+    results: list[dict] = []
+    i = 0
+    while i < len(requests):
+        if requests[i].method not in READ_ONLY_METHODS:
+            results.append(await _dispatch(parent, requests[i], db))
+            i += 1
+            continue
+        j = i
+        while j < len(requests) and requests[j].method in READ_ONLY_METHODS:
+            j += 1
+        results.extend(await asyncio.gather(*(_dispatch(parent, sub, None) for sub in requests[i:j])))
+        i = j
+    return results
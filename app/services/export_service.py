@@ -0,0 +1,27 @@
+import zlib
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from sqlalchemy.orm import Session
+from app.crud import project as project_crud
+from app.schemas import ProjectExportOut
+
+def iter_projects_ndjson(db: Session, batch_size: int, since: datetime | None = None) -> Iterator[bytes]:
+    if since is not None and since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+
+    for batch in project_crud.iter_batches_with_places(db, batch_size, since):
+        yield b"".join(
+            ProjectExportOut.model_validate(project).model_dump_json().encode() + b"\n"
+            for project in batch
+        )
+        # Не даємо identity map рости разом з таблицею (expunge каскадиться на places)
+        for project in batch:
+            db.expunge(project)
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip-контейнер
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from fastapi import HTTPException
+from sqlalchemy.orm import sessionmaker
+from app.schemas import PlaceOut
+from .project_service import apply_place_mutations
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitter:
+    """Групові коміти для PATCH місць.
+
+    Запити кладуть зміну в чергу і чекають на спільний коміт, який відбувається кожні
+    interval_ms або щойно набралось max_batch змін. Відповідь віддається лише після того,
+    як транзакція пакета закомічена: підтверджена зміна так само довговічна, як і без
+    групування, змінюється тільки затримка (до interval_ms). Якщо коміт пакета впав,
+    помилку отримують усі запити цього пакета.
+    """
+
+    def __init__(self):
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self.interval = 0.0
+        self.max_batch = 0
+        self.batches = 0
+        self.mutations = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self, interval_ms: float, max_batch: int) -> None:
+        self.interval = interval_ms / 1000
+        self.max_batch = max_batch
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        # Те, що лишилось у черзі, комітимо перед зупинкою
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        if pending:
+            await self._flush(pending)
+        self._queue = None
+
+    async def submit(self, session_factory: sessionmaker, project_id: int, place_id: int, notes, visited) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((session_factory, (project_id, place_id, notes, visited), future))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            batch = []
+            try:
+                batch.append(await self._queue.get())
+                deadline = time.monotonic() + self.interval
+                while len(batch) < self.max_batch:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                if batch:
+                    await self._flush(batch)
+                raise
+            # shield: зупинка не повинна лишити запити пакета без відповіді
+            await asyncio.shield(self._flush(batch))
+
+    async def _flush(self, batch: list) -> None:
+        # Зазвичай фабрика одна; різні (тести, кілька БД) комітяться окремо
+        by_factory: dict[sessionmaker, list] = {}
+        for item in batch:
+            by_factory.setdefault(item[0], []).append(item)
+
+        for session_factory, items in by_factory.items():
+            try:
+                results = await asyncio.to_thread(self._commit, session_factory, [m for _, m, _ in items])
+            except Exception as e:
+                logger.exception("Group commit failed")
+                results = [e] * len(items)
+
+            for (_, _, future), result in zip(items, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+        self.batches += 1
+        self.mutations += len(batch)
+
+    @staticmethod
+    def _commit(session_factory: sessionmaker, mutations: list) -> list:
+        db = session_factory()
+        try:
+            results = apply_place_mutations(db, mutations)
+            # Серіалізуємо в потоці, поки сесія відкрита
+            return [r if isinstance(r, HTTPException) else PlaceOut.model_validate(r).model_dump(mode="json") for r in results]
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.running,
+            "batches": self.batches,
+            "mutations": self.mutations,
+            "avg_batch_size": round(self.mutations / self.batches, 2) if self.batches else 0.0,
+        }
+
+
+group_committer = GroupCommitter()
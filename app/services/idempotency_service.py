@@ -0,0 +1,123 @@
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.config import settings
+from app.crud import idempotency as idempotency_crud
+
+logger = logging.getLogger(__name__)
+
+# Запити, що виконуються зараз у цьому процесі: дублікати чекають на них, а не рахують заново
+_in_flight: dict[tuple[str, str], asyncio.Future] = {}
+
+def request_hash(payload, **params) -> str:
+    """SHA-256 тіла запиту і query-параметрів, що змінюють відповідь (наприклад, async)"""
+    data = payload.model_dump_json()
+    if params:
+        data += json.dumps(params, sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+def _replay(status_code: int, body: str) -> JSONResponse:
+    return JSONResponse(content=json.loads(body), status_code=status_code, headers={"Idempotent-Replayed": "true"})
+
+async def run_idempotent(
+    db: Session,
+    key: str | None,
+    scope: str,
+    payload_hash: str,
+    handler: Callable[[], Awaitable[tuple[int, object]]],
+):
+    """Виконати handler один раз на (key, scope) і віддавати збережену відповідь на повтори.
+
+    handler повертає (status_code, JSON-сумісне тіло). Ключ резервується в БД до виконання handler:
+    дублікат в іншому процесі отримує 409, поки перший запит не завершився. Зберігаються лише
+    успішні відповіді: помилки (наприклад, недоступність ArtIC) можна повторити з тим самим ключем.
+    """
+    if key is None:
+        status_code, body = await handler()
+        return JSONResponse(content=body, status_code=status_code)
+
+    while True:
+        now = datetime.now(timezone.utc)
+        stored = idempotency_crud.get_valid(db, key, scope, now)
+        # Не тримаємо з'єднання, поки handler ходить в ArtIC
+        db.rollback()
+        if stored is not None and stored.status_code != idempotency_crud.PENDING:
+            if stored.request_hash != payload_hash:
+                raise HTTPException(422, "Idempotency-Key was already used with a different request body")
+            return _replay(stored.status_code, stored.body)
+
+        in_flight = _in_flight.get((key, scope))
+        if in_flight is not None:
+            try:
+                stored_hash, status_code, body = await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    raise
+                # Перший запит скасовано (клієнт відключився) - перевіряємо заново і, можливо, виконуємо самі
+                continue
+            if stored_hash != payload_hash:
+                raise HTTPException(422, "Idempotency-Key was already used with a different request body")
+            return _replay(status_code, body)
+
+        if stored is not None:
+            # Ключ зарезервовано іншим процесом
+            if stored.request_hash != payload_hash:
+                raise HTTPException(422, "Idempotency-Key was already used with a different request body")
+            raise HTTPException(409, "A request with this Idempotency-Key is still in progress", headers={"Retry-After": "1"})
+
+        expires_at = now + timedelta(seconds=settings.idempotency_pending_seconds)
+        if idempotency_crud.reserve(db, key, scope, payload_hash, now, expires_at):
+            break
+        # Інший процес зарезервував ключ між читанням і вставкою - читаємо ще раз
+
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[(key, scope)] = future
+    try:
+        try:
+            status_code, content = await handler()
+        except Exception as e:
+            db.rollback()
+            idempotency_crud.release(db, key, scope)
+            future.set_exception(e)
+            # Виняток забере хтось із тих, хто чекає; інакше не логуємо "never retrieved"
+            future.exception()
+            raise
+
+        body = json.dumps(content)
+        idempotency_crud.complete(
+            db, key, scope, status_code, body,
+            datetime.now(timezone.utc) + timedelta(seconds=settings.idempotency_ttl_seconds),
+        )
+        future.set_result((payload_hash, status_code, body))
+        return JSONResponse(content=content, status_code=status_code)
+    finally:
+        if not future.done():
+            # Скасування: знімаємо резерв, тоді ті, хто чекає, виконають запит самі
+            future.cancel()
+            db.rollback()
+            idempotency_crud.release(db, key, scope)
+        _in_flight.pop((key, scope), None)
+
+def purge_expired_keys(session_factory: sessionmaker) -> int:
+    db = session_factory()
+    try:
+        return idempotency_crud.purge_expired(db, datetime.now(timezone.utc))
+    finally:
+        db.close()
+
+async def purge_loop(session_factory: sessionmaker, interval_seconds: float) -> None:
+    """Фонова чистка прострочених ключів (запускається в lifespan)"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            purged = await asyncio.to_thread(purge_expired_keys, session_factory)
+            if purged:
+                logger.info(f"Purged {purged} expired idempotency keys")
+        except Exception:
+            logger.exception("Failed to purge expired idempotency keys")
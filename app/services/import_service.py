@@ -0,0 +1,148 @@
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.schemas import ProjectImport
+from .artic_service import ArticUnavailable
+from .project_service import validate_places_payload, resolve_places_batch, store_projects
+
+logger = logging.getLogger(__name__)
+
+# Скільки помилок повертати клієнту і скільки останніх імпортів пам'ятати
+MAX_REPORTED_ERRORS = 100
+MAX_TRACKED_IMPORTS = 100
+
+_progress: OrderedDict[str, dict] = OrderedDict()
+
+def get_progress(import_id: str) -> dict | None:
+    return _progress.get(import_id)
+
+def _new_progress(import_id: str | None, resume_from: int) -> dict:
+    progress = {
+        "import_id": import_id,
+        "status": "running",
+        # Останній рядок, до якого все закомічено; з last_line + 1 можна продовжити
+        "last_line": resume_from - 1,
+        "imported": 0,
+        "failed": 0,
+        "errors": [],
+        "rows_per_sec": 0.0,
+        "detail": None,
+    }
+    if import_id is not None:
+        _progress[import_id] = progress
+        _progress.move_to_end(import_id)
+        while len(_progress) > MAX_TRACKED_IMPORTS:
+            _progress.popitem(last=False)
+    return progress
+
+def _add_error(progress: dict, line: int, detail: str) -> None:
+    progress["failed"] += 1
+    if len(progress["errors"]) < MAX_REPORTED_ERRORS:
+        progress["errors"].append({"line": line, "detail": detail})
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[tuple[int, bytes | None]]:
+    """Розбити потік байтів на рядки (нумерація з 1), не читаючи тіло цілком.
+
+    Рядок, довший за max_line_bytes, не накопичується: його байти відкидаються до кінця рядка,
+    а замість вмісту повертається None.
+    """
+    buffer = b""
+    oversized = False
+    line_no = 0
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            line = chunk[start:end]
+            line_no += 1
+            if oversized or len(buffer) + len(line) > max_line_bytes:
+                yield line_no, None
+            else:
+                yield line_no, buffer + line
+            buffer, oversized, start = b"", False, end + 1
+        tail = chunk[start:]
+        if not oversized:
+            if len(buffer) + len(tail) > max_line_bytes:
+                buffer, oversized = b"", True
+            else:
+                buffer += tail
+    if oversized:
+        yield line_no + 1, None
+    elif buffer:
+        yield line_no + 1, buffer
+
+async def _flush(db: Session, batch: list, progress: dict, skip_validation: bool) -> None:
+    resolved, errors = await resolve_places_batch(batch, trust_titles=skip_validation)
+    for line, e in errors:
+        _add_error(progress, line, e.detail)
+
+    if resolved:
+        try:
+            store_projects(db, [(payload, places, titles) for _, payload, places, titles in resolved])
+        except SQLAlchemyError:
+            logger.exception("Failed to store imported projects batch")
+            for line, _, _, _ in resolved:
+                _add_error(progress, line, "Failed to store project")
+        else:
+            progress["imported"] += len(resolved)
+
+async def import_projects_ndjson(
+    db: Session,
+    chunks: AsyncIterator[bytes],
+    batch_size: int,
+    skip_validation: bool = False,
+    resume_from: int = 1,
+    import_id: str | None = None,
+) -> dict:
+    progress = _new_progress(import_id, resume_from)
+    started = time.perf_counter()
+    batch: list = []
+    last_line = resume_from - 1
+
+    try:
+        async for line_no, raw in iter_lines(chunks, settings.import_max_line_bytes):
+            if line_no < resume_from:
+                continue
+            last_line = line_no
+            if raw is None:
+                _add_error(progress, line_no, f"Line is longer than {settings.import_max_line_bytes} bytes")
+                continue
+            if not raw.strip():
+                continue
+
+            try:
+                payload = ProjectImport.model_validate_json(raw)
+                batch.append((line_no, payload, validate_places_payload(payload.places)))
+            except ValidationError as e:
+                _add_error(progress, line_no, str(e.errors(include_url=False, include_input=False)))
+            except HTTPException as e:
+                _add_error(progress, line_no, e.detail)
+
+            if len(batch) >= batch_size:
+                await _flush(db, batch, progress, skip_validation)
+                batch = []
+                progress["last_line"] = last_line
+                progress["rows_per_sec"] = round(progress["imported"] / (time.perf_counter() - started), 1)
+                logger.info(f"Import {import_id or '-'}: committed up to line {last_line}, {progress['imported']} imported")
+
+        if batch:
+            await _flush(db, batch, progress, skip_validation)
+        progress["last_line"] = last_line
+        progress["status"] = "completed"
+    except ArticUnavailable:
+        # Пачку не розв'язано: last_line лишається на останньому коміті, з нього імпорт продовжується
+        progress["status"] = "failed"
+        progress["detail"] = f"ArtIC API is unavailable, resume from line {progress['last_line'] + 1}"
+    except Exception:
+        progress["status"] = "failed"
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        progress["rows_per_sec"] = round(progress["imported"] / elapsed, 1) if elapsed > 0 else 0.0
+
+    return progress
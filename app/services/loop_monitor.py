@@ -0,0 +1,168 @@
+"""Затримка event loop і завантаження threadpool AnyIO (запускається в lifespan).
+
+Корутина кожні `interval` секунд засинає і міряє, наскільки пізніше прокинулась: це lag,
+який бачать усі запити. Поки loop заблокований, корутина нічого не дізнається, тож окремий
+потік-сторож помічає пропущений heartbeat і записує, яка задача зараз виконується на loop:
+її маршрут (з активних запитів) і найглибший кадр коду застосунку.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import anyio.to_thread
+from app.core.metrics import event_loop_lag
+from app.middleware.active_requests import active_requests
+from app.middleware.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _app_frame(thread_id: int | None) -> str | None:
+    """Найглибший кадр з коду app/ у стеку потоку: "app/services/x.py:12 in f" """
+    frame = sys._current_frames().get(thread_id) if thread_id is not None else None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and filename != __file__:
+            path = os.path.relpath(filename, os.path.dirname(_APP_DIR))
+            return f"{path}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class LoopMonitor:
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._limiter: anyio.CapacityLimiter | None = None
+        self._heartbeat = 0.0
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._stall: dict | None = None
+        self._saturated = False
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.stalls = 0
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+        self.last_stall: dict | None = None
+        self.threadpool_saturations = 0
+        self.max_threads_busy = 0
+
+    @staticmethod
+    def _route(scope: dict | None) -> str | None:
+        return f"{scope['method']} {route_template(scope)}" if scope else None
+
+    def active_routes(self) -> dict[str, int]:
+        routes: dict[str, int] = {}
+        for scope in list(active_requests.values()):
+            route = self._route(scope)
+            routes[route] = routes.get(route, 0) + 1
+        return routes
+
+    def start(self, interval: float, stall_threshold_ms: float) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        # Лімітер AnyIO, через який Starlette запускає sync-обробники і залежності
+        self._limiter = anyio.to_thread.current_default_thread_limiter()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._run(interval, stall_threshold_ms / 1000))
+        self._watchdog = threading.Thread(
+            target=self._watch, args=(interval, stall_threshold_ms / 1000), name="loop-watchdog", daemon=True,
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    async def _run(self, interval: float, threshold: float) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            lag = max(loop.time() - expected, 0.0)
+            self._heartbeat = time.monotonic()
+            self._observe_lag(lag, threshold)
+            self._observe_threadpool()
+
+    def _observe_lag(self, lag: float, threshold: float) -> None:
+        event_loop_lag.observe(lag)
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        if lag < threshold:
+            return
+        stall, self._stall = self._stall or {}, None
+        self.stalls += 1
+        self.last_stall = {
+            "lag_ms": round(lag * 1000, 1),
+            "route": stall.get("route"),
+            "location": stall.get("location"),
+        }
+        logger.warning(
+            f"Event loop stalled for {lag * 1000:.0f} ms"
+            f" while running {stall.get('route') or 'no request'}"
+            f" ({stall.get('location') or 'location unknown'})"
+        )
+
+    def _observe_threadpool(self) -> None:
+        limiter = self._limiter
+        busy = limiter.borrowed_tokens
+        waiting = limiter.statistics().tasks_waiting
+        self.max_threads_busy = max(self.max_threads_busy, busy)
+        saturated = waiting > 0
+        if saturated and not self._saturated:
+            self.threadpool_saturations += 1
+            logger.warning(
+                f"Threadpool saturated: {busy}/{int(limiter.total_tokens)} threads busy, {waiting} tasks waiting;"
+                f" active requests: {self.active_routes()}"
+            )
+        self._saturated = saturated
+
+    def _watch(self, interval: float, threshold: float) -> None:
+        """Потік-сторож: знімає маршрут і кадр, поки loop ще заблокований"""
+        while not self._stopped.wait(interval / 2):
+            blocked_for = time.monotonic() - self._heartbeat - interval
+            if blocked_for < threshold or self._stall is not None:
+                continue
+            # current_task лише читає словник поточних задач; з іншого потоку це безпечно під GIL
+            task = asyncio.current_task(self._loop)
+            self._stall = {
+                "route": self._route(active_requests.get(task)),
+                "location": _app_frame(self._loop_thread),
+            }
+            logger.warning(
+                f"Event loop blocked for over {blocked_for * 1000:.0f} ms"
+                f" by {self._stall['route'] or 'no request'} ({self._stall['location'] or 'location unknown'})"
+            )
+
+    def stats(self) -> dict:
+        limiter = self._limiter
+        return {
+            "running": self._task is not None,
+            "last_lag_ms": round(self.last_lag * 1000, 3),
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+            "stalls": self.stalls,
+            "last_stall": self.last_stall,
+            "threadpool_size": int(limiter.total_tokens) if limiter else None,
+            "threadpool_busy": limiter.borrowed_tokens if limiter else None,
+            "threadpool_waiting": limiter.statistics().tasks_waiting if limiter else None,
+            "threadpool_max_busy": self.max_threads_busy,
+            "threadpool_saturations": self.threadpool_saturations,
+            "active_requests": self.active_routes(),
+        }
+
+
+loop_monitor = LoopMonitor()
@@ -0,0 +1,52 @@
+"""Метрики компонентів, що вже рахують власну статистику: читаються лише під час scrape"""
+from app.core.cache import project_cache
+from app.core.metrics import registry
+from .project_jobs import project_jobs
+from .group_commit import group_committer
+from .project_events import project_events
+from .artwork_catalog import artwork_catalog
+from .loop_monitor import loop_monitor
+
+
+def _project_cache():
+    stats = project_cache.stats()
+    yield "project_cache_hits_total", "counter", "GET /projects/{id} responses served from cache.", [({}, stats["hits"])]
+    yield "project_cache_misses_total", "counter", "Project detail cache misses, including stale entries.", [({}, stats["misses"])]
+    yield "project_cache_stale_total", "counter", "Cached entries rejected because the project version changed.", [({}, stats["stale"])]
+    yield "project_cache_hit_ratio", "gauge", "Share of project detail lookups served from cache.", [({}, stats["hit_ratio"])]
+
+
+def _background():
+    jobs = project_jobs.stats()
+    yield "project_jobs_queue_depth", "gauge", "Projects waiting for background place validation.", [({}, jobs["queue_depth"])]
+    yield "project_jobs_processed_total", "counter", "Background project jobs by outcome.", [
+        ({"outcome": "processed"}, jobs["processed"]),
+        ({"outcome": "failed"}, jobs["failed"]),
+    ]
+    group_commit = group_committer.stats()
+    yield "group_commit_batches_total", "counter", "Place update transactions committed by the group committer.", [({}, group_commit["batches"])]
+    yield "group_commit_mutations_total", "counter", "Place updates committed by the group committer.", [({}, group_commit["mutations"])]
+    events = project_events.stats()
+    yield "project_event_subscribers", "gauge", "Open GET /projects/{id}/events streams.", [({}, events["subscribers"])]
+    yield "project_events_published_total", "counter", "Project change events published.", [({}, events["published"])]
+    catalog = artwork_catalog.stats()
+    yield "artwork_catalog_size", "gauge", "Artworks in the in-memory search index.", [({}, catalog["artworks"])]
+
+
+def _runtime():
+    stats = loop_monitor.stats()
+    if not stats["running"]:
+        return
+    yield "threadpool_size", "gauge", "AnyIO worker threads available to sync handlers.", [({}, stats["threadpool_size"])]
+    yield "threadpool_busy_threads", "gauge", "AnyIO worker threads in use.", [({}, stats["threadpool_busy"])]
+    yield "threadpool_waiting_tasks", "gauge", "Tasks waiting for a free AnyIO worker thread.", [({}, stats["threadpool_waiting"])]
+    yield "event_loop_stalls_total", "counter", "Event loop lags above LOOP_STALL_THRESHOLD_MS.", [({}, stats["stalls"])]
+
+
+registry.register_collector(_project_cache)
+registry.register_collector(_background)
+registry.register_collector(_runtime)
+
+
+def render_metrics() -> str:
+    return registry.render()
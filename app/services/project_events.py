@@ -0,0 +1,155 @@
+"""In-process pub/sub змін проекту для GET /projects/{id}/events (SSE).
+
+Підписник не має власної черги: усі читають спільний кільцевий буфер каналу проекту і чекають
+на один asyncio.Event, який публікація будить і замінює новим. Тож бездіяльне з'єднання - це
+лише корутина з курсором, а подія серіалізується один раз для всіх підписників.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class ProjectEvent:
+    seq: int
+    event: str
+    # Готовий SSE-кадр: форматується один раз при публікації
+    frame: str
+
+
+class _Channel:
+    __slots__ = ("buffer", "floor", "waiter", "subscribers")
+
+    def __init__(self, buffer_size: int, floor: int):
+        self.buffer: deque[ProjectEvent] = deque(maxlen=buffer_size)
+        # Події з seq <= floor могли бути втрачені (витіснені з буфера чи разом з каналом)
+        self.floor = floor
+        self.waiter: asyncio.Event | None = None
+        self.subscribers = 0
+
+
+class ProjectEventBus:
+    def __init__(self, buffer_size: int = 100, max_channels: int = 10000):
+        self.buffer_size = buffer_size
+        self.max_channels = max_channels
+        # Id подій мають вигляд "<epoch>-<seq>": після рестарту старий Last-Event-ID не сплутати з новим
+        self.epoch = format(time.time_ns() // 1000, "x")
+        self._seq = 0
+        self._evicted_through = 0
+        self._channels: OrderedDict[int, _Channel] = OrderedDict()
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.published = 0
+
+    def _channel(self, project_id: int) -> _Channel:
+        channel = self._channels.get(project_id)
+        if channel is None:
+            channel = self._channels[project_id] = _Channel(self.buffer_size, self._evicted_through)
+            self._evict()
+        self._channels.move_to_end(project_id)
+        return channel
+
+    def _evict(self) -> None:
+        # Найдавніші канали без підписників; канали з підписниками лишаються
+        excess = len(self._channels) - self.max_channels
+        for project_id in list(self._channels):
+            if excess <= 0:
+                break
+            channel = self._channels[project_id]
+            if channel.subscribers:
+                continue
+            if channel.buffer:
+                self._evicted_through = max(self._evicted_through, channel.buffer[-1].seq)
+            del self._channels[project_id]
+            excess -= 1
+
+    def publish(self, project_id: int, event: str, data: dict) -> None:
+        """Опублікувати подію; безпечно викликати з потоків threadpool"""
+        payload = json.dumps(data, separators=(",", ":"), default=str)
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            channel = self._channel(project_id)
+            if len(channel.buffer) == channel.buffer.maxlen:
+                channel.floor = channel.buffer[0].seq
+            channel.buffer.append(ProjectEvent(seq, event, f"id: {self.epoch}-{seq}\nevent: {event}\ndata: {payload}\n\n"))
+            self.published += 1
+            notify = channel.subscribers > 0
+        if notify and self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake, channel)
+
+    @staticmethod
+    def _wake(channel: _Channel) -> None:
+        if channel.waiter is not None:
+            channel.waiter.set()
+            channel.waiter = None
+
+    def _parse_last_event_id(self, last_event_id: str | None) -> int | None:
+        """seq з Last-Event-ID цього процесу; -1 - id з іншого запуску, None - без id.
+
+        -1 менше за будь-який floor (і 0), тож для чужого id subscribe завжди починає з reset.
+        """
+        if not last_event_id:
+            return None
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return -1
+        return int(seq)
+
+    async def subscribe(self, project_id: int, last_event_id: str | None, heartbeat_seconds: float) -> AsyncIterator[ProjectEvent | None]:
+        """Події проекту після last_event_id; None - час надіслати heartbeat.
+
+        Якщо частина подій уже витіснена з буфера або id з іншого запуску процесу, першою
+        приходить подія reset: клієнт має перечитати проект цілком.
+        """
+        self._loop = asyncio.get_running_loop()
+        with self._lock:
+            channel = self._channel(project_id)
+            channel.subscribers += 1
+            cursor = self._parse_last_event_id(last_event_id)
+            if cursor is None:
+                cursor = self._seq
+        try:
+            while True:
+                with self._lock:
+                    lost = cursor < channel.floor
+                    events = [e for e in channel.buffer if e.seq > cursor]
+                    if channel.waiter is None:
+                        channel.waiter = asyncio.Event()
+                    waiter = channel.waiter
+                if lost:
+                    seq = events[0].seq - 1 if events else channel.floor
+                    yield ProjectEvent(seq, "reset", f"id: {self.epoch}-{seq}\nevent: reset\ndata: {{\"project_id\":{project_id}}}\n\n")
+                for event in events:
+                    yield event
+                    if event.event == "project_deleted":
+                        return
+                if events or lost:
+                    cursor = events[-1].seq if events else channel.floor
+                    continue
+                try:
+                    await asyncio.wait_for(waiter.wait(), heartbeat_seconds)
+                except TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                channel.subscribers -= 1
+                if not channel.subscribers:
+                    channel.waiter = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "channels": len(self._channels),
+                "subscribers": sum(c.subscribers for c in self._channels.values()),
+                "buffered_events": sum(len(c.buffer) for c in self._channels.values()),
+                "published": self.published,
+            }
+
+
+project_events = ProjectEventBus(settings.project_events_buffer_size)
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.cache import project_cache
+from app.core.config import settings
+from app.models import Project, ProjectPlace
+from .artic_service import ArticUnavailable, get_artworks
+from .project_service import touch_project
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class ProjectJobQueue:
+    """Обмежена черга перевірки місць для проектів, створених асинхронно.
+
+    Задача - id проекту в статусі pending; воркер розв'язує його місця в ArtIC і переводить
+    проект в active або failed. Сам стан зберігається в БД, тож після рестарту pending-проекти
+    ставляться в чергу заново. Поки ArtIC недоступний, проект лишається pending і повертається
+    в чергу з експоненційною затримкою; failed - лише для id, яких ArtIC справді не знайшов.
+    """
+
+    def __init__(self):
+        self._queue: asyncio.Queue | None = None
+        self._workers: list[asyncio.Task] = []
+        self._retries: set[asyncio.TimerHandle] = set()
+        self.max_size = 0
+        self.in_progress = 0
+        self.processed = 0
+        self.failed = 0
+        self.retried = 0
+
+    def start(self, workers: int, max_size: int) -> None:
+        self.max_size = max_size
+        self._queue = asyncio.Queue(maxsize=max_size)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(workers)]
+
+    async def stop(self) -> None:
+        # Відкладені повтори не втрачаються: pending-проекти ставляться в чергу після рестарту
+        for handle in self._retries:
+            handle.cancel()
+        self._retries.clear()
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def has_capacity(self) -> bool:
+        return self._queue is not None and not self._queue.full()
+
+    def enqueue(self, project_id: int, session_factory: sessionmaker, attempt: int = 0) -> None:
+        if self._queue is None:
+            raise QueueFullError("Job queue is not running")
+        try:
+            self._queue.put_nowait((project_id, session_factory, attempt))
+        except asyncio.QueueFull:
+            raise QueueFullError("Job queue is full")
+
+    def _schedule_retry(self, project_id: int, session_factory: sessionmaker, attempt: int) -> None:
+        delay = min(settings.project_job_retry_base_seconds * 2 ** attempt, settings.project_job_retry_max_seconds)
+        handle = None
+
+        def retry() -> None:
+            self._retries.discard(handle)
+            try:
+                self.enqueue(project_id, session_factory, attempt + 1)
+            except QueueFullError:
+                # Черга переповнена: пробуємо пізніше з тією ж затримкою
+                self._schedule_retry(project_id, session_factory, attempt)
+
+        handle = asyncio.get_running_loop().call_later(delay, retry)
+        self._retries.add(handle)
+        logger.warning(f"ArtIC API unavailable, project {project_id} stays pending, retry in {delay:.0f} s")
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.depth,
+            "max_size": self.max_size,
+            "workers": len(self._workers),
+            "in_progress": self.in_progress,
+            "processed": self.processed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "waiting_retry": len(self._retries),
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            project_id, session_factory, attempt = await self._queue.get()
+            self.in_progress += 1
+            try:
+                if not await process_pending_project(session_factory, project_id):
+                    self.failed += 1
+                self.processed += 1
+            except ArticUnavailable:
+                self.retried += 1
+                self._schedule_retry(project_id, session_factory, attempt)
+            except Exception:
+                self.failed += 1
+                logger.exception(f"Project job {project_id} crashed")
+            finally:
+                self.in_progress -= 1
+                self._queue.task_done()
+
+
+def _load_external_ids(session_factory: sessionmaker, project_id: int) -> list[str] | None:
+    db: Session = session_factory()
+    try:
+        status = db.scalar(select(Project.status).where(Project.id == project_id))
+        if status != "pending":
+            return None
+        return list(db.scalars(select(ProjectPlace.external_id).where(ProjectPlace.project_id == project_id)))
+    finally:
+        db.close()
+
+
+def _finish(session_factory: sessionmaker, project_id: int, artworks: dict[str, dict]) -> bool:
+    db: Session = session_factory()
+    try:
+        project = db.get(Project, project_id)
+        if project is None or project.status != "pending":
+            return True
+
+        missing = [p.external_id for p in project.places if p.external_id not in artworks]
+        if missing:
+            project.status = "failed"
+            project.status_detail = f"Place with external_id '{missing[0]}' not found in ArtIC API. Please check the ID is valid."
+        else:
+            for place in project.places:
+                place.title = artworks[place.external_id].get("title")
+            project.status = "active"
+            project.status_detail = None
+        touch_project(project)
+        db.commit()
+        project_cache.invalidate(project_id)
+        return not missing
+    finally:
+        db.close()
+
+
+async def process_pending_project(session_factory: sessionmaker, project_id: int) -> bool:
+    """Перевірити місця pending-проекту; True, якщо проект став active.
+
+    ArticUnavailable, якщо ArtIC не відповів: проект лишається pending.
+    """
+    # БД - у threadpool, щоб не блокувати цикл подій; з'єднання не тримається під час запиту в ArtIC
+    external_ids = await asyncio.to_thread(_load_external_ids, session_factory, project_id)
+    if external_ids is None:
+        return True
+
+    artworks = await get_artworks(external_ids, strict=True)
+    return await asyncio.to_thread(_finish, session_factory, project_id, artworks)
+
+
+def pending_project_ids(session_factory: sessionmaker) -> list[int]:
+    db: Session = session_factory()
+    try:
+        return list(db.scalars(select(Project.id).where(Project.status == "pending").order_by(Project.id)))
+    finally:
+        db.close()
+
+
+project_jobs = ProjectJobQueue()
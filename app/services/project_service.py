@@ -1,29 +1,84 @@
+import logging
 from datetime import datetime, timezone
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, object_session
+from app.core.cache import project_cache
+from app.core.config import settings
+from app.core.tracing import traced
 from app.models import Project, ProjectPlace
 from app.crud import project as project_crud
 from app.crud import place as place_crud
-from app.crud.base import create
-from .artic_service import get_artwork
+from app.crud.base import create, delete
+from app.schemas import PlaceCreate, PlaceOut, ProjectOut, ProjectDetailOut
+from .artic_service import ArticUnavailable, get_artwork, get_artworks
+from .stats_service import StatsDelta, record as record_stats
+from .project_events import project_events
 
-MAX_PLACES = 10
+logger = logging.getLogger(__name__)
 
+@traced()
 def recompute_completed(project: Project) -> None:
-    if not project.places:
-        project.completed = False
+    db = object_session(project)
+    if db is None:
+        project.completed = bool(project.places) and all(p.visited for p in project.places)
         return
-    project.completed = all(p.visited for p in project.places)
+    # Незбережені зміни місць мають потрапити в EXISTS-запит
+    db.flush()
+    project.completed = place_crud.is_completed(db, project.id)
 
+def _recompute_completed(project: Project, delta: StatsDelta) -> None:
+    was_completed = project.completed
+    recompute_completed(project)
+    delta.completed_changed(was_completed, project.completed)
+
+@traced()
+def touch_project(project: Project) -> None:
+    """Позначити проект зміненим: нова версія для ETag і час для інкрементального експорту"""
+    # SQL-вираз, а не project.version + 1, щоб паралельні зміни не губили інкремент
+    project.version = Project.version + 1
+    project.updated_at = datetime.now(timezone.utc)
+
+@traced()
 def can_delete(project: Project) -> bool:
-    return not any(p.visited for p in project.places)
+    db = object_session(project)
+    if db is None:
+        return not any(p.visited for p in project.places)
+    return not place_crud.has_visited(db, project.id)
 
-async def create_project_with_places(db: Session, project: Project, places_payload):
-    places_payload = places_payload or []
+@traced()
+def project_detail(db: Session, project: Project) -> ProjectDetailOut:
+    """Проект з першими PROJECT_DETAIL_PLACES_LIMIT місцями і загальною кількістю місць"""
+    limit = settings.project_detail_places_limit
+    places = place_crud.list_for_project(db, project.id, limit, 0, sort="id")
+    total = len(places) if len(places) < limit else place_crud.count_for_project(db, project.id)
+    return ProjectDetailOut(
+        **ProjectOut.model_validate(project).model_dump(),
+        places=[PlaceOut.model_validate(p) for p in places],
+        places_total=total,
+    )
+
+@traced()
+def publish_place(event: str, place: ProjectPlace, completed: bool) -> None:
+    """Подія місця для підписників GET /projects/{id}/events (після коміту)"""
+    project_events.publish(place.project_id, event, {
+        "project_id": place.project_id,
+        "completed": completed,
+        "place": PlaceOut.model_validate(place).model_dump(mode="json"),
+    })
+
+ARTIC_UNAVAILABLE = "ArtIC API is unavailable, retry later"
+
+def _not_found_in_artic(external_id: str) -> HTTPException:
+    return HTTPException(404, f"Place with external_id '{external_id}' not found in ArtIC API. Please check the ID is valid.")
+
+@traced()
+def validate_places_payload(places_payload) -> list[PlaceCreate]:
+    places_payload = [PlaceCreate.model_validate(p) for p in places_payload or []]
     if not places_payload:
         raise HTTPException(422, "Project must have at least 1 place")
-    if not (1 <= len(places_payload) <= MAX_PLACES):
-        raise HTTPException(422, "Project must have 1..10 places")
+    if not (1 <= len(places_payload) <= settings.max_places_per_project):
+        raise HTTPException(422, f"Project must have 1..{settings.max_places_per_project} places")
 
     seen = set()
     for p in places_payload:
@@ -31,9 +86,16 @@ async def create_project_with_places(db: Session, project: Project, places_paylo
             raise HTTPException(409, "Duplicate external_id in request")
         seen.add(p.external_id)
 
+    return places_payload
+
+@traced()
+async def create_project_with_places(db: Session, project: Project, places_payload):
+    places_payload = validate_places_payload(places_payload)
+
+    for p in places_payload:
         artwork = await get_artwork(p.external_id)
         if not artwork:
-            raise HTTPException(404, f"Place with external_id '{p.external_id}' not found in ArtIC API. Please check the ID is valid.")
+            raise _not_found_in_artic(p.external_id)
 
         project.places.append(ProjectPlace(
             external_id=p.external_id,
@@ -41,44 +103,279 @@ async def create_project_with_places(db: Session, project: Project, places_paylo
             notes=p.notes,
         ))
 
+    delta = StatsDelta()
+    delta.project_created(p.external_id for p in places_payload)
+    record_stats(db, delta)
     return create(db, project)
 
-async def add_place(db: Session, project: Project, external_id: str, notes: str | None):
-    if place_crud.count_for_project(db, project.id) >= MAX_PLACES:
-        raise HTTPException(409, "Project already has 10 places")
+@traced()
+def create_pending_project(db: Session, project: Project, places_payload) -> Project:
+    """Зберегти проект зі статусом pending; назви місць заповнить фоновий воркер"""
+    places_payload = validate_places_payload(places_payload)
+
+    project.status = "pending"
+    for p in places_payload:
+        project.places.append(ProjectPlace(external_id=p.external_id, notes=p.notes))
+
+    delta = StatsDelta()
+    delta.project_created(p.external_id for p in places_payload)
+    record_stats(db, delta)
+    return create(db, project)
+
+@traced()
+async def resolve_places_batch(items, trust_titles: bool = False):
+    """Розв'язати назви місць для багатьох проектів одним пакетним запитом до ArtIC.
+
+    items - список (key, payload, places). Повертає (resolved, errors), де resolved -
+    список (key, payload, places, titles), а errors - список (key, HTTPException).
+    Якщо trust_titles, місця з уже заданим title не перевіряються в ArtIC.
+    ArticUnavailable, якщо ArtIC не відповів: такі id невідомі, а не відсутні.
+    """
+    def needs_lookup(p) -> bool:
+        return not (trust_titles and getattr(p, "title", None))
+
+    external_ids = {p.external_id for _, _, places in items for p in places if needs_lookup(p)}
+    artworks = await get_artworks(sorted(external_ids), strict=True) if external_ids else {}
+
+    resolved, errors = [], []
+    for key, payload, places in items:
+        missing = next((p.external_id for p in places if needs_lookup(p) and p.external_id not in artworks), None)
+        if missing is not None:
+            errors.append((key, _not_found_in_artic(missing)))
+            continue
+        titles = [p.title if not needs_lookup(p) else artworks[p.external_id].get("title") for p in places]
+        resolved.append((key, payload, places, titles))
+
+    return resolved, errors
+
+@traced()
+def store_projects(db: Session, items) -> list[int]:
+    """Вставити проекти з розв'язаними місцями однією транзакцією (executemany).
+
+    items - список (payload, places, titles). Повертає id проектів у порядку items.
+    """
+    try:
+        project_ids = project_crud.bulk_insert(db, [
+            {"name": payload.name, "description": payload.description, "start_date": payload.start_date, "completed": False}
+            for payload, _, _ in items
+        ])
+        place_crud.bulk_insert(db, [
+            {
+                "project_id": project_id,
+                "external_id": p.external_id,
+                "title": title,
+                "notes": p.notes,
+                "visited": False,
+            }
+            for project_id, (_, places, titles) in zip(project_ids, items)
+            for p, title in zip(places, titles)
+        ])
+        delta = StatsDelta()
+        for _, places, _ in items:
+            delta.project_created(p.external_id for p in places)
+        record_stats(db, delta)
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+    return project_ids
+
+@traced()
+async def create_projects_bulk(db: Session, payloads) -> list[dict]:
+    results: list[dict] = [{"index": i, "status_code": 201, "id": None, "detail": None} for i in range(len(payloads))]
+    valid = []
+
+    for i, payload in enumerate(payloads):
+        try:
+            valid.append((i, payload, validate_places_payload(payload.places)))
+        except HTTPException as e:
+            results[i].update(status_code=e.status_code, detail=e.detail)
+
+    # Один пакетний запит до ArtIC на всі унікальні external_id з усього батчу
+    try:
+        resolved, errors = await resolve_places_batch(valid)
+    except ArticUnavailable:
+        # Не 404: id можуть бути правильними, клієнт має повторити ці елементи пізніше
+        for i, _, _ in valid:
+            results[i].update(status_code=503, detail=ARTIC_UNAVAILABLE)
+        return results
+    for i, e in errors:
+        results[i].update(status_code=e.status_code, detail=e.detail)
 
-    if place_crud.exists_external(db, project.id, external_id):
+    chunk_size = max(1, settings.bulk_chunk_size)
+    for start in range(0, len(resolved), chunk_size):
+        chunk = resolved[start:start + chunk_size]
+        try:
+            project_ids = store_projects(db, [(payload, places, titles) for _, payload, places, titles in chunk])
+        except SQLAlchemyError:
+            logger.exception("Failed to store bulk projects chunk")
+            for i, _, _, _ in chunk:
+                results[i].update(status_code=500, detail="Failed to store project")
+            continue
+
+        for project_id, (i, _, _, _) in zip(project_ids, chunk):
+            results[i]["id"] = project_id
+
+    return results
+
+def _check_can_add(db: Session, project_id: int, external_id: str) -> None:
+    if place_crud.count_for_project(db, project_id) >= settings.max_places_per_project:
+        raise HTTPException(409, f"Project already has {settings.max_places_per_project} places")
+
+    if place_crud.exists_external(db, project_id, external_id):
         raise HTTPException(409, "Place already exists in this project")
 
+@traced()
+async def add_place(db: Session, project: Project, external_id: str, notes: str | None):
+    project_id = project.id
+
+    # Перша коротка транзакція: дешеві перевірки, після чого з'єднання повертається в пул,
+    # щоб не тримати його під час запиту до ArtIC (до 10 секунд)
+    try:
+        _check_can_add(db, project_id, external_id)
+    finally:
+        db.rollback()
+
     artwork = await get_artwork(external_id)
     if not artwork:
         raise HTTPException(404, f"Place with external_id '{external_id}' not found in ArtIC API. Please check the ID is valid.")
 
+    # Друга коротка транзакція: повторні перевірки (стан міг змінитися за час запиту), вставка,
+    # completed і статистика - одним комітом
+    project = db.get(Project, project_id)
+    if project is None:
+        # Проект видалили, поки чекали на ArtIC
+        raise HTTPException(404, "Project not found")
+    _check_can_add(db, project_id, external_id)
+
     place = ProjectPlace(
-        project_id=project.id,
+        project_id=project_id,
         external_id=external_id,
         title=artwork.get("title"),
         notes=notes,
     )
-    create(db, place)
-
-    db.refresh(project)
-    recompute_completed(project)
+    db.add(place)
+    delta = StatsDelta()
+    delta.place_added(external_id)
+    _recompute_completed(project, delta)
+    record_stats(db, delta)
+    touch_project(project)
+    completed = project.completed
     db.commit()
+    project_cache.invalidate(project_id)
+    publish_place("place_added", place, completed)
 
     return place
 
-def update_place(db: Session, project: Project, place: ProjectPlace, notes, visited):
+def _apply_place_update(place: ProjectPlace, notes, visited, delta: StatsDelta) -> None:
     if notes is not None:
         place.notes = notes
 
     if visited is not None:
+        was_visited, old_visited_at = place.visited, place.visited_at
         place.visited = visited
         place.visited_at = datetime.now(timezone.utc) if visited else None
+        delta.visit_changed(was_visited, old_visited_at, visited, place.visited_at)
 
-    db.refresh(project)
-    recompute_completed(project)
+@traced()
+def update_place(db: Session, project: Project, place: ProjectPlace, notes, visited):
+    delta = StatsDelta()
+    _apply_place_update(place, notes, visited, delta)
+    project_id = place.project_id
+
+    _recompute_completed(project, delta)
+    touch_project(project)
+    record_stats(db, delta)
+    completed = project.completed
     db.commit()
+    project_cache.invalidate(project_id)
     db.refresh(place)
+    publish_place("place_updated", place, completed)
 
     return place
+
+@traced()
+def update_places(db: Session, project: Project, updates) -> list[ProjectPlace]:
+    project_id = project.id
+    place_ids = [u.id for u in updates]
+    if len(set(place_ids)) != len(place_ids):
+        raise HTTPException(409, "Duplicate place id in request")
+
+    places = {p.id: p for p in place_crud.get_many_for_project(db, project_id, place_ids)}
+    missing = [pid for pid in place_ids if pid not in places]
+    if missing:
+        raise HTTPException(404, f"Places not found: {', '.join(map(str, missing))}")
+
+    delta = StatsDelta()
+    for u in updates:
+        _apply_place_update(places[u.id], u.notes, u.visited, delta)
+
+    # Одна транзакція і один перерахунок completed на весь пакет
+    _recompute_completed(project, delta)
+    touch_project(project)
+    record_stats(db, delta)
+    completed = project.completed
+    db.commit()
+    project_cache.invalidate(project_id)
+
+    # Один запит замість N refresh-ів після expire_on_commit
+    places = {p.id: p for p in place_crud.get_many_for_project(db, project_id, place_ids)}
+    for pid in place_ids:
+        publish_place("place_updated", places[pid], completed)
+    return [places[pid] for pid in place_ids]
+
+@traced()
+def apply_place_mutations(db: Session, mutations) -> list:
+    """Застосувати зміни місць з різних запитів однією транзакцією (group commit).
+
+    mutations - список (project_id, place_id, notes, visited). Для кожної повертає оновлене
+    місце або HTTPException; помилка однієї зміни не зачіпає решту.
+    """
+    project_ids = {project_id for project_id, _, _, _ in mutations}
+    # Два запити на весь пакет: проекти і лише змінювані місця (не всі місця проектів)
+    projects = {p.id: p for p in project_crud.get_many(db, project_ids)}
+    places = {place.id: place for place in place_crud.get_many_by_ids(db, [place_id for _, place_id, _, _ in mutations])}
+
+    results, touched = [], set()
+    delta = StatsDelta()
+    for project_id, place_id, notes, visited in mutations:
+        if project_id not in projects:
+            results.append(HTTPException(404, "Project not found"))
+            continue
+        place = places.get(place_id)
+        if place is None or place.project_id != project_id:
+            results.append(HTTPException(404, "Place not found"))
+            continue
+        _apply_place_update(place, notes, visited, delta)
+        touched.add(project_id)
+        results.append(place)
+
+    for project_id in touched:
+        _recompute_completed(projects[project_id], delta)
+        touch_project(projects[project_id])
+
+    if touched:
+        record_stats(db, delta)
+        completed = {project_id: projects[project_id].completed for project_id in touched}
+        db.commit()
+        for project_id in touched:
+            project_cache.invalidate(project_id)
+        # Оновлені значення (visited_at тощо) одним запитом після expire_on_commit
+        place_crud.get_many_by_ids(db, [r.id for r in results if isinstance(r, ProjectPlace)])
+        for result in results:
+            if isinstance(result, ProjectPlace):
+                publish_place("place_updated", result, completed[result.project_id])
+
+    return results
+
+@traced()
+def remove_project(db: Session, project: Project) -> None:
+    """Видалити проект разом з його внеском у статистику"""
+    project_id = project.id
+    delta = StatsDelta()
+    delta.project_deleted(project, place_crud.list_stats_rows(db, project_id))
+    record_stats(db, delta)
+    place_crud.delete_for_project(db, project_id)
+    delete(db, project)
+    project_cache.invalidate(project_id)
+    project_events.publish(project_id, "project_deleted", {"project_id": project_id})
@@ -0,0 +1,189 @@
+"""Знімки таблиць у Parquet для офлайн-аналітики.
+
+Рядки читаються keyset-пачками, кожна в окремій короткій транзакції, тож знімок не тримає
+блокування SQLite і не заважає записам API. Для кожного набору зберігається водяний знак
+(останній експортований updated_at): наступний запуск пише лише новий розділ з рядками, зміненими
+після нього, тож змінений рядок з'являється ще раз, і актуальна версія - в останньому розділі.
+pyarrow - опційна залежність.
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from sqlalchemy import Table, Integer, String, Text, Boolean, Date, DateTime
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import ColumnElement
+from app.crud import snapshot as snapshot_crud
+from app.models import Project, ProjectPlace, Artwork
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pip install pyarrow
+    pa = pq = None
+
+STATE_FILE = "_state.json"
+
+
+class SnapshotUnavailable(RuntimeError):
+    pass
+
+
+class SnapshotInProgress(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class SnapshotSource:
+    table: Table
+    # Колонка водяного знака: id для незмінних рядків, час зміни для тих, що оновлюються
+    key: ColumnElement
+    where: ColumnElement | None = None
+    # Hive-розділ за датою колонки (name=YYYY-MM-DD); рядки без дати - в __HIVE_DEFAULT_PARTITION__
+    partition_by_date: tuple[str, ColumnElement] | None = None
+
+
+SOURCES = {
+    "projects": SnapshotSource(Project.__table__, Project.__table__.c.updated_at),
+    "project_places": SnapshotSource(ProjectPlace.__table__, ProjectPlace.__table__.c.updated_at),
+    # Без фільтра visited: скасоване відвідування теж має потрапити в новий розділ
+    "place_visits": SnapshotSource(
+        ProjectPlace.__table__,
+        ProjectPlace.__table__.c.updated_at,
+        partition_by_date=("visited_date", ProjectPlace.__table__.c.visited_at),
+    ),
+    "artworks": SnapshotSource(Artwork.__table__, Artwork.__table__.c.updated_at),
+}
+
+_snapshot_lock = threading.Lock()
+
+
+def _arrow_type(column):
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column.type, Date):
+        return pa.date32()
+    if isinstance(column.type, (String, Text)):
+        return pa.string()
+    raise TypeError(f"No Parquet type for column {column}")
+
+
+def _schema(table: Table):
+    return pa.schema([pa.field(c.name, _arrow_type(c), nullable=c.nullable) for c in table.columns])
+
+
+def _encode(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def _decode(value, column):
+    if value is not None and isinstance(column.type, (Date, DateTime)):
+        return datetime.fromisoformat(value) if isinstance(column.type, DateTime) else date.fromisoformat(value)
+    return value
+
+
+def _load_state(out_dir: str) -> dict:
+    try:
+        with open(os.path.join(out_dir, STATE_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _save_state(out_dir: str, state: dict) -> None:
+    path = os.path.join(out_dir, STATE_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def _export_source(session_factory: sessionmaker, out_dir: str, name: str, source: SnapshotSource, after: tuple | None, chunk_size: int, run_id: str):
+    schema = _schema(source.table)
+    writers: dict[str, "pq.ParquetWriter"] = {}
+    paths: dict[str, str] = {}
+    rows_total = 0
+
+    def writer_for(subdir: str):
+        if subdir not in writers:
+            directory = os.path.join(out_dir, name, subdir)
+            os.makedirs(directory, exist_ok=True)
+            paths[subdir] = os.path.join(directory, f"part-{run_id}.parquet")
+            writers[subdir] = pq.ParquetWriter(paths[subdir] + ".tmp", schema, compression="zstd")
+        return writers[subdir]
+
+    try:
+        while True:
+            db = session_factory()
+            try:
+                rows = snapshot_crud.fetch_after(db, source.table, source.key, after, chunk_size, source.where)
+            finally:
+                # Коротка транзакція на пачку: між пачками БД вільна для записів
+                db.close()
+            if not rows:
+                break
+
+            if source.partition_by_date:
+                partition, column = source.partition_by_date
+                groups: dict[str, list[dict]] = {}
+                for row in rows:
+                    value = row[column.name]
+                    day = value.date().isoformat() if value is not None else "__HIVE_DEFAULT_PARTITION__"
+                    groups.setdefault(f"{partition}={day}", []).append(row)
+            else:
+                groups = {"": rows}
+            for subdir, group in groups.items():
+                writer_for(subdir).write_table(pa.Table.from_pylist(group, schema=schema))
+
+            rows_total += len(rows)
+            last = rows[-1]
+            after = (last[source.key.name], last["id"])
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    # Файли з'являються під остаточними іменами лише повністю записаними
+    for path in paths.values():
+        os.replace(path + ".tmp", path)
+    return rows_total, sorted(os.path.relpath(p, out_dir) for p in paths.values()), after
+
+
+def export_snapshot(
+    session_factory: sessionmaker,
+    out_dir: str,
+    tables: list[str] | None = None,
+    chunk_size: int = 10000,
+    full: bool = False,
+) -> dict:
+    """Дописати в out_dir новий розділ кожного набору; full - ігнорувати водяні знаки"""
+    if pa is None:
+        raise SnapshotUnavailable("Parquet snapshots require pyarrow (pip install pyarrow)")
+    names = tables or list(SOURCES)
+    unknown = set(names) - set(SOURCES)
+    if unknown:
+        raise ValueError(f"Unknown snapshot tables: {', '.join(sorted(unknown))}")
+    if not _snapshot_lock.acquire(blocking=False):
+        raise SnapshotInProgress("Another snapshot is already running")
+
+    try:
+        os.makedirs(out_dir, exist_ok=True)
+        state = {} if full else _load_state(out_dir)
+        run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        report = {}
+        for name in names:
+            source = SOURCES[name]
+            watermark = state.get(name)
+            after = (_decode(watermark["key"], source.key), watermark["id"]) if watermark else None
+            rows, files, after = _export_source(session_factory, out_dir, name, source, after, chunk_size, run_id)
+            if after is not None:
+                state[name] = {"key": _encode(after[0]), "id": after[1]}
+                # Стан після кожного набору: перерваний знімок не повторює готові
+                _save_state(out_dir, state)
+            report[name] = {"rows": rows, "files": files, "watermark": state.get(name)}
+        return report
+    finally:
+        _snapshot_lock.release()
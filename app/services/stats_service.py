@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy.orm import Session, sessionmaker
+from app.crud import stats as stats_crud
+from app.models import Project, ProjectPlace
+
+logger = logging.getLogger(__name__)
+
+
+class StatsDelta:
+    """Зміни зведених таблиць від однієї операції; записуються в її ж транзакції"""
+
+    def __init__(self):
+        self.counters: Counter[str] = Counter()
+        self.days: Counter[date] = Counter()
+        self.artworks: Counter[str] = Counter()
+
+    def project_created(self, external_ids) -> None:
+        self.counters["projects_total"] += 1
+        for external_id in external_ids:
+            self.place_added(external_id)
+
+    def project_deleted(self, project: Project, places) -> None:
+        """places - місця проекту (або рядки з external_id, visited, visited_at)"""
+        self.counters["projects_total"] -= 1
+        if project.completed:
+            self.counters["projects_completed"] -= 1
+        for place in places:
+            self.counters["places_total"] -= 1
+            self.artworks[place.external_id] -= 1
+            self.visit_changed(place.visited, place.visited_at, False, None)
+
+    def place_added(self, external_id: str) -> None:
+        self.counters["places_total"] += 1
+        self.artworks[external_id] += 1
+
+    def visit_changed(self, was_visited: bool, old_visited_at, visited: bool, visited_at) -> None:
+        # Повторне visited=true переносить відвідування на сьогодні
+        if was_visited and old_visited_at is not None:
+            self.days[old_visited_at.date()] -= 1
+        if visited and visited_at is not None:
+            self.days[visited_at.date()] += 1
+        self.counters["places_visited"] += int(visited) - int(was_visited)
+
+    def completed_changed(self, was_completed: bool, completed: bool) -> None:
+        self.counters["projects_completed"] += int(completed) - int(was_completed)
+
+
+def record(db: Session, delta: StatsDelta) -> None:
+    """Застосувати delta (без commit: комітить операція, що її створила)"""
+    counters = {k: v for k, v in delta.counters.items() if v}
+    days = {k: v for k, v in delta.days.items() if v}
+    artworks = {k: v for k, v in delta.artworks.items() if v}
+    if counters:
+        stats_crud.add_counters(db, counters)
+    if days:
+        stats_crud.add_daily_visits(db, days)
+    if artworks:
+        stats_crud.add_artwork_places(db, artworks)
+
+
+def get_stats(db: Session, days: int, top: int) -> dict:
+    counters = stats_crud.get_counters(db)
+    since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+    total = counters["projects_total"]
+    return {
+        **counters,
+        "completion_rate": round(counters["projects_completed"] / total, 4) if total else 0.0,
+        "visits_per_day": [{"day": day, "visits": visits} for day, visits in stats_crud.get_daily_visits(db, since)],
+        "top_artworks": [
+            {"external_id": external_id, "title": title, "places": places}
+            for external_id, title, places in stats_crud.get_top_artworks(db, top)
+        ],
+    }
+
+
+def reconcile(session_factory: sessionmaker) -> dict:
+    """Перерахувати зведені таблиці з нуля; повертає розбіжності, які довелось виправити.
+
+    Читання і перезапис - в одній транзакції під блокуванням запису, тож дельти паралельних
+    операцій не губляться між підрахунком і replace_all.
+    """
+    db = session_factory()
+    try:
+        stats_crud.lock_for_write(db)
+        counters, days, artworks = stats_crud.compute_actual(db)
+        current = stats_crud.get_counters(db)
+        drift = {name: counters[name] - current[name] for name in counters if counters[name] != current[name]}
+        stats_crud.replace_all(db, counters, days, artworks)
+        db.commit()
+        return drift
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def reconcile_loop(session_factory: sessionmaker, interval_seconds: float) -> None:
+    """Звірка при старті і далі періодично (запускається в lifespan)"""
+    while True:
+        try:
+            drift = await asyncio.to_thread(reconcile, session_factory)
+            if drift:
+                logger.warning(f"Stats drift corrected: {drift}")
+        except Exception:
+            logger.exception("Failed to reconcile stats")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,66 @@
+"""Бенчмарк in-memory пошуку артефактів (GET /artworks/search) без HTTP.
+
+Запуск: python -m benchmarks.artwork_search --artworks 100000 --queries 1000 --words 50000
+"""
+import argparse
+import itertools
+import random
+import statistics
+import string
+import time
+from app.services.artwork_catalog import ArtworkIndex
+
+def vocabulary(rng: random.Random, size: int) -> tuple[list[str], list[float]]:
+    """Випадкові слова 3-10 літер із розподілом, близьким до Ципфа, як у природних назвах"""
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(size)]
+    return words, list(itertools.accumulate(1 / rank for rank in range(1, size + 1)))
+
+
+def phrase(rng: random.Random, vocab, words: int) -> str:
+    return " ".join(rng.choices(vocab[0], cum_weights=vocab[1], k=words))
+
+
+def typo(rng: random.Random, text: str) -> str:
+    i = rng.randrange(len(text))
+    return text[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + text[i + 1:]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--artworks", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--words", type=int, default=50000, help="Vocabulary size")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vocab = vocabulary(rng, args.words)
+    docs = [
+        (str(i), phrase(rng, vocab, rng.randint(1, 6)), phrase(rng, vocab, 2))
+        for i in range(args.artworks)
+    ]
+
+    index = ArtworkIndex()
+    started = time.perf_counter()
+    for artwork_id, title, artist in docs:
+        index.add(artwork_id, title, artist)
+    print(f"indexed {len(index)} artworks in {time.perf_counter() - started:.1f}s ({index.stats()['words']} distinct words)")
+
+    # Суміш: префікс назви, повне слово з помилкою, автор
+    queries = []
+    for _ in range(args.queries):
+        _, title, artist = rng.choice(docs)
+        queries.append(rng.choice([title[:rng.randint(3, 8)], typo(rng, title.split()[0]), artist]))
+
+    latencies = []
+    for q in queries:
+        started = time.perf_counter()
+        index.search(q, 10)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"queries={len(latencies)} p50={statistics.median(latencies):.2f}ms p95={p95:.2f}ms max={latencies[-1]:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
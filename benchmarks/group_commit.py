@@ -0,0 +1,109 @@
+"""Бенчмарк PATCH /projects/{id}/places/{place_id} з group commit і без нього.
+
+Запуск: python -m benchmarks.group_commit --requests 2000 --concurrency 50 --interval-ms 5
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.core.db import Base
+from app.deps.db import get_db, get_session_factory
+from app.main import create_app
+from app.models import Project, ProjectPlace
+from app.services.group_commit import group_committer
+
+
+def seed(SessionLocal, projects: int, places_per_project: int) -> list[tuple[int, int]]:
+    db = SessionLocal()
+    try:
+        rows = [
+            Project(name=f"Project {i}", places=[
+                ProjectPlace(external_id=str(j), title=f"Artwork {j}") for j in range(places_per_project)
+            ])
+            for i in range(projects)
+        ]
+        db.add_all(rows)
+        db.commit()
+        return [(p.id, place.id) for p in rows for place in p.places]
+    finally:
+        db.close()
+
+
+async def run(app, targets: list[tuple[int, int]], total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"X-API-Key": settings.api_key}
+    counter = iter(range(total))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            for i in counter:
+                project_id, place_id = targets[i % len(targets)]
+                response = await client.patch(
+                    f"/projects/{project_id}/places/{place_id}",
+                    json={"visited": i % 2 == 0, "notes": f"update {i}"},
+                    headers=headers,
+                )
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - started
+
+
+async def bench(args, grouped: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            connect_args={"check_same_thread": False, "timeout": 30},
+        )
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+        targets = seed(SessionLocal, args.projects, 10)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = create_app()
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_session_factory] = lambda: SessionLocal
+
+        if grouped:
+            group_committer.start(args.interval_ms, args.max_batch)
+        try:
+            elapsed = await run(app, targets, args.requests, args.concurrency)
+        finally:
+            stats = group_committer.stats()
+            await group_committer.stop()
+        engine.dispose()
+
+    mode = f"group commit ({args.interval_ms} ms, max {args.max_batch})" if grouped else "commit per request"
+    print(f"{mode}: {args.requests / elapsed:.0f} req/sec, elapsed={elapsed:.2f}s")
+    if grouped:
+        print(f"  batches={stats['batches']} avg_batch_size={stats['avg_batch_size']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--interval-ms", type=float, default=5)
+    parser.add_argument("--max-batch", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"requests={args.requests} concurrency={args.concurrency}")
+    asyncio.run(bench(args, grouped=False))
+    asyncio.run(bench(args, grouped=True))
+
+
+if __name__ == "__main__":
+    main()
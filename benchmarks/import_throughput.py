@@ -0,0 +1,79 @@
+"""Бенчмарк POST /projects/import на синтетичному NDJSON-файлі.
+
+Запуск: python -m benchmarks.import_throughput --rows 100000 --batch-size 1000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.core.db import Base
+from app.deps.db import get_db
+from app.main import create_app
+
+
+def write_synthetic_file(path: str, rows: int, places_per_project: int) -> None:
+    with open(path, "w") as f:
+        for i in range(rows):
+            f.write(json.dumps({
+                "name": f"Project {i}",
+                "description": "Synthetic project",
+                "start_date": "2024-06-01",
+                "places": [
+                    {"external_id": str(100000 + i * places_per_project + j), "title": f"Artwork {j}", "notes": "note"}
+                    for j in range(places_per_project)
+                ],
+            }) + "\n")
+
+
+def iter_file(path: str, chunk_size: int = 64 * 1024):
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--places", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "projects.ndjson")
+        write_synthetic_file(data_path, args.rows, args.places)
+
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = create_app()
+        app.dependency_overrides[get_db] = override_get_db
+        with TestClient(app) as client:
+            started = time.perf_counter()
+            response = client.post(
+                f"/projects/import?batch_size={args.batch_size}&skip_validation=true",
+                content=iter_file(data_path),
+                headers={"X-API-Key": settings.api_key, "Content-Type": "application/x-ndjson"},
+            )
+            elapsed = time.perf_counter() - started
+
+        report = response.json()
+        print(f"rows={args.rows} places/project={args.places} batch_size={args.batch_size}")
+        print(f"imported={report['imported']} failed={report['failed']} elapsed={elapsed:.2f}s")
+        print(f"throughput={report['imported'] / elapsed:.0f} rows/sec (server-side: {report['rows_per_sec']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Затримка операцій над проектом з 10 тис. місць.
+
+Запуск: python -m benchmarks.large_project --places 10000 --requests 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from unittest.mock import patch
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.cache import set_project_cache_backend
+from app.core.config import settings
+from app.core.db import Base
+from app.crud import place as place_crud
+from app.deps.db import get_db, get_session_factory
+from app.main import create_app
+from app.models import Project
+
+
+def seed(SessionLocal, places: int) -> tuple[int, int]:
+    db = SessionLocal()
+    try:
+        project = Project(name="Museum-wide tour")
+        db.add(project)
+        db.flush()
+        place_crud.bulk_insert(db, [
+            {"project_id": project.id, "external_id": str(i), "title": f"Artwork {i}", "visited": False}
+            for i in range(places)
+        ])
+        db.commit()
+        return project.id, place_crud.list_for_project(db, project.id, 1, 0, sort="id")[0].id
+    finally:
+        db.close()
+
+
+async def measure(client, requests: int, call) -> list[float]:
+    latencies = []
+    for i in range(requests):
+        started = time.perf_counter()
+        response = await call(i)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code < 500, response.text
+    return latencies
+
+
+async def bench(args) -> None:
+    settings.max_places_per_project = args.places + args.requests + 1
+    # Кеш деталей вимкнено: міряємо саму вибірку
+    set_project_cache_backend(None)
+
+    async def mock_artwork(external_id: str):
+        return {"id": int(external_id), "title": f"Artwork {external_id}"}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+        project_id, place_id = seed(SessionLocal, args.places)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = create_app()
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_session_factory] = lambda: SessionLocal
+        headers = {"X-API-Key": settings.api_key}
+        transport = httpx.ASGITransport(app=app)
+
+        scenarios = {
+            "GET /projects/{id}": lambda i: client.get(f"/projects/{project_id}", headers=headers),
+            "GET /projects/{id}/places": lambda i: client.get(f"/projects/{project_id}/places?limit=50&offset={i * 50 % args.places}", headers=headers),
+            "PATCH /projects/{id}/places/{place_id}": lambda i: client.patch(f"/projects/{project_id}/places/{place_id}", json={"visited": i % 2 == 0}, headers=headers),
+            "POST /projects/{id}/places": lambda i: client.post(f"/projects/{project_id}/places", json={"external_id": str(args.places + i)}, headers=headers),
+            "DELETE /projects/{id} (409)": lambda i: client.delete(f"/projects/{project_id}", headers=headers),
+        }
+        with patch("app.services.project_service.get_artwork", side_effect=mock_artwork):
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                # Хоча б одне відвідане місце, щоб DELETE відповідав 409
+                await client.patch(f"/projects/{project_id}/places/{place_id}", json={"visited": True}, headers=headers)
+                for name, call in scenarios.items():
+                    latencies = sorted(await measure(client, args.requests, call))
+                    p95 = latencies[int(len(latencies) * 0.95) - 1]
+                    print(f"{name:42} p50={statistics.median(latencies):.2f} ms p95={p95:.2f} ms")
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    print(f"places={args.places} requests={args.requests}")
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
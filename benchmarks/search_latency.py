@@ -0,0 +1,95 @@
+"""Бенчмарк GET /projects/search на синтетичній базі (за замовчуванням ~1.2 млн рядків).
+
+Запуск: python -m benchmarks.search_latency --projects 200000 --places 5 --queries 200
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import tempfile
+import time
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.core.db import Base
+from app.deps.db import get_db
+from app.main import create_app
+from app.models import Project, ProjectPlace
+
+COMMON_WORDS = [
+    "art", "museum", "gallery", "impressionist", "modern", "sculpture", "portrait", "landscape",
+    "chicago", "paris", "tour", "weekend", "garden", "rooftop", "family", "classic", "photo",
+    "renaissance", "baroque", "abstract", "street", "river", "night", "spring", "autumn",
+]
+# Словник із розподілом, близьким до Ципфа: кілька частих слів і довгий хвіст рідкісних
+WORDS = COMMON_WORDS + [f"{a}{b}" for a in ("ka", "lo", "mi", "ne", "ru", "sa", "to", "ve") for b in range(1000)]
+CUM_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(WORDS) + 1)))
+
+
+def phrase(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, cum_weights=CUM_WEIGHTS, k=words))
+
+
+def seed(engine, projects: int, places: int, chunk: int = 10000) -> None:
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        for start in range(0, projects, chunk):
+            ids = range(start + 1, min(start + chunk, projects) + 1)
+            conn.execute(insert(Project), [
+                {"id": i, "name": f"{phrase(rng, 2)} {i}", "description": phrase(rng, 8)} for i in ids
+            ])
+            conn.execute(insert(ProjectPlace), [
+                {"project_id": i, "external_id": str(j), "title": phrase(rng, 3), "notes": phrase(rng, 6)}
+                for i in ids for j in range(places)
+            ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=200000)
+    parser.add_argument("--places", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        started = time.perf_counter()
+        seed(engine, args.projects, args.places)
+        rows = args.projects * (1 + args.places)
+        print(f"seeded {rows} rows (with FTS triggers) in {time.perf_counter() - started:.1f}s")
+
+        SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = create_app()
+        app.dependency_overrides[get_db] = override_get_db
+        rng = random.Random(7)
+        # Суміш: часте слово, два слова, рідкісне слово, префікс
+        queries = [
+            rng.choice([rng.choice(COMMON_WORDS), phrase(rng, 2), rng.choice(WORDS), rng.choice(WORDS)[:3]])
+            for _ in range(args.queries)
+        ]
+        latencies = []
+        with TestClient(app) as client:
+            for q in queries:
+                started = time.perf_counter()
+                response = client.get("/projects/search", params={"q": q, "limit": 20}, headers={"X-API-Key": settings.api_key})
+                latencies.append((time.perf_counter() - started) * 1000)
+                response.raise_for_status()
+
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f"queries={len(latencies)} p50={statistics.median(latencies):.1f}ms p95={p95:.1f}ms max={latencies[-1]:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
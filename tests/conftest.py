@@ -1,10 +1,12 @@
 import pytest
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from unittest.mock import AsyncMock, patch
 from app.main import create_app
-from app.core.db import Base, init_db
+from app.core.db import Base, init_db, instrument_engine
 from app.core.config import settings
 
 
@@ -14,7 +16,13 @@ TEST_DATABASE_URL = "sqlite:///:memory:"
 @pytest.fixture(scope="function")
 def test_db():
     """Створює тестову базу даних для кожного тесту"""
-    engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+    # StaticPool: одне з'єднання на всі потоки, інакше кожен потік TestClient бачить порожню БД
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    instrument_engine(engine)
     TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
     
     # Імпортуємо моделі для створення таблиць
@@ -40,8 +48,11 @@ def client(test_db):
             pass
     
     app = create_app()
-    from app.deps.db import get_db
+    from app.deps.db import get_db, get_session_factory
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: sessionmaker(
+        bind=test_db.get_bind(), autocommit=False, autoflush=False
+    )
     
     with TestClient(app) as test_client:
         yield test_client
@@ -49,6 +60,51 @@ def client(test_db):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def explain_plan(test_db):
+    """План SQLite (EXPLAIN QUERY PLAN) для SQLAlchemy-запиту одним рядком"""
+    def explain(stmt) -> str:
+        compiled = stmt.compile(dialect=test_db.get_bind().dialect, compile_kwargs={"render_postcompile": True})
+        params = tuple(
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in (compiled.params[name] for name in compiled.positiontup)
+        )
+        rows = test_db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+        return " | ".join(row[-1] for row in rows)
+    return explain
+
+
+@pytest.fixture
+def query_budget(test_db):
+    """Бюджет SQL-запитів: with query_budget(2): client.get(...) падає, якщо запитів більше"""
+    engine = test_db.get_bind()
+
+    @contextmanager
+    def budget(max_queries: int):
+        statements: list[str] = []
+
+        def listener(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert len(statements) <= max_queries, (
+            f"{len(statements)} SQL statements, budget is {max_queries}:\n" + "\n".join(statements)
+        )
+    return budget
+
+
+@pytest.fixture(autouse=True)
+def reset_project_cache():
+    """Свіжий кеш деталей проекту для кожного тесту (id проектів повторюються між тестами)"""
+    from app.core.cache import LRUCacheBackend, set_project_cache_backend
+    set_project_cache_backend(LRUCacheBackend(settings.project_cache_size))
+    yield
+
+
 @pytest.fixture
 def api_key():
     """Повертає валідний API ключ"""
@@ -80,5 +136,5 @@ def mock_get_artwork(mock_artwork_response):
             "date_display": "2024"
         }
     
-    with patch("app.services.artic_service.get_artwork", side_effect=mock_artwork) as mock:
+    with patch("app.services.project_service.get_artwork", side_effect=mock_artwork) as mock:
         yield mock
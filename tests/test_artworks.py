@@ -0,0 +1,105 @@
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+from sqlalchemy.orm import sessionmaker
+from app.models import Artwork, Project, ProjectPlace
+from app.services.artic_service import ArticUnavailable, get_artworks
+from app.services.artwork_catalog import ArtworkCatalog, ArtworkIndex
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    """Порожній каталог замість спільного"""
+    catalog = ArtworkCatalog()
+    monkeypatch.setattr("app.routes.artworks.artwork_catalog", catalog)
+    monkeypatch.setattr("app.services.artic_service.artwork_catalog", catalog)
+    catalog.add([
+        {"id": 27992, "title": "A Sunday on La Grande Jatte — 1884", "artist_title": "Georges Seurat"},
+        {"id": 28560, "title": "The Bedroom", "artist_title": "Vincent van Gogh"},
+        {"id": 111628, "title": "Nighthawks", "artist_title": "Edward Hopper"},
+        {"id": 16568, "title": "Water Lilies", "artist_title": "Claude Monet"},
+    ])
+    return catalog
+
+
+def ids(results):
+    return [r["external_id"] for r in results]
+
+
+def test_index_prefix_typo_and_artist(catalog):
+    """Тест префіксного пошуку, помилок у слові і пошуку за автором"""
+    assert ids(catalog.search("night", 10)) == ["111628"]
+    assert ids(catalog.search("grande jat", 10)) == ["27992"]
+    assert ids(catalog.search("nighthawsk", 10)) == ["111628"]
+    assert ids(catalog.search("van gog", 10)) == ["28560"]
+    assert ids(catalog.search("monet lilies", 10)) == ["16568"]
+    assert catalog.search("zzzz", 10) == []
+
+
+def test_index_updates_incrementally():
+    """Тест що оновлення артефакту прибирає старі триграми"""
+    index = ArtworkIndex()
+    assert index.add("1", "Old Title", None) is True
+    assert index.add("1", "Old Title", None) is False
+    index.add("1", "New Name", None)
+    assert index.search("old title", 10) == []
+    assert ids(index.search("new name", 10)) == ["1"]
+    assert len(index) == 1
+
+
+def test_index_ignores_diacritics_and_case():
+    """Тест нормалізації регістру і діакритики"""
+    index = ArtworkIndex()
+    index.add("1", "Café Terrace", "Vincent van Gogh")
+    assert ids(index.search("CAFE", 10)) == ["1"]
+
+
+def test_search_endpoint(client, api_key, catalog):
+    """Тест GET /artworks/search"""
+    response = client.get("/artworks/search", params={"q": "bedr"}, headers={"X-API-Key": api_key})
+    assert response.status_code == 200
+    data = response.json()
+    assert data[0]["external_id"] == "28560"
+    assert data[0]["title"] == "The Bedroom"
+    assert data[0]["artist_title"] == "Vincent van Gogh"
+
+
+@pytest.mark.asyncio
+async def test_artic_responses_feed_catalog(catalog):
+    """Тест що артефакти з відповідей ArtIC потрапляють у каталог"""
+    response = httpx.Response(
+        200,
+        json={"data": [{"id": 20684, "title": "Paris Street; Rainy Day", "artist_title": "Gustave Caillebotte"}]},
+        request=httpx.Request("GET", "https://api.artic.edu/api/v1/artworks"),
+    )
+    with patch("httpx.AsyncClient.get", AsyncMock(return_value=response)):
+        await get_artworks(["20684"])
+
+    assert ids(catalog.search("caillebot", 10)) == ["20684"]
+    assert catalog.stats()["pending_writes"] == 5
+
+
+def test_catalog_flush_and_load(test_db, catalog):
+    """Тест запису каталогу в БД і відновлення індексу, включно з назвами з місць"""
+    factory = sessionmaker(bind=test_db.get_bind())
+    assert catalog.flush(factory) == 4
+    assert catalog.flush(factory) == 0
+    assert test_db.query(Artwork).count() == 4
+
+    test_db.add(Project(name="Trip", places=[ProjectPlace(external_id="20684", title="Paris Street; Rainy Day")]))
+    test_db.commit()
+
+    restored = ArtworkCatalog()
+    assert restored.load(factory) == 5
+    assert ids(restored.search("hopper", 10)) == ["111628"]
+    assert ids(restored.search("rainy", 10)) == ["20684"]
+
+
+@pytest.mark.asyncio
+async def test_get_artworks_strict_reports_unavailable(catalog):
+    """Тест що 5xx ArtIC у strict-режимі - ArticUnavailable, а не "id відсутні" """
+    response = httpx.Response(503, request=httpx.Request("GET", "https://api.artic.edu/api/v1/artworks"))
+    with patch("httpx.AsyncClient.get", AsyncMock(return_value=response)):
+        assert await get_artworks(["20684"]) == {}
+        with pytest.raises(ArticUnavailable):
+            await get_artworks(["20684"], strict=True)
@@ -0,0 +1,127 @@
+from unittest.mock import patch
+from app.services import batch_service
+
+
+def create_project(client, api_key):
+    return client.post(
+        "/projects",
+        json={"name": "Trip", "places": [{"external_id": "27992"}, {"external_id": "28560"}]},
+        headers={"X-API-Key": api_key}
+    ).json()
+
+
+def test_batch_mixed_requests_in_order(client, api_key, mock_get_artwork):
+    """Тест що під-запити виконуються по порядку і GET бачить попередній PATCH"""
+    project = create_project(client, api_key)
+    place_id = project["places"][0]["id"]
+
+    response = client.post("/batch", json={"requests": [
+        {"method": "PATCH", "path": f"/projects/{project['id']}/places/{place_id}", "body": {"visited": True}},
+        {"method": "GET", "path": f"/projects/{project['id']}/places/{place_id}"},
+        {"method": "GET", "path": f"/projects/{project['id']}"},
+        {"method": "GET", "path": f"/projects/{project['id']}/places/999"},
+        {"method": "GET", "path": "/projects?limit=1"},
+    ]}, headers={"X-API-Key": api_key})
+
+    assert response.status_code == 200
+    patched, place, detail, missing, listing = response.json()["responses"]
+    assert patched["status"] == 200 and patched["body"]["visited"] is True
+    assert place["body"]["visited"] is True
+    assert detail["status"] == 200
+    assert detail["headers"]["etag"]
+    assert detail["body"]["places"][0]["visited"] is True
+    assert missing["status"] == 404
+    assert missing["body"] == {"detail": "Place not found"}
+    assert [p["id"] for p in listing["body"]] == [project["id"]]
+
+
+def test_batch_sub_request_headers(client, api_key, mock_get_artwork):
+    """Тест що заголовки під-запиту (If-None-Match) доходять до endpoint-а"""
+    project = create_project(client, api_key)
+    etag = client.get(f"/projects/{project['id']}", headers={"X-API-Key": api_key}).headers["etag"]
+
+    response = client.post("/batch", json={"requests": [
+        {"method": "GET", "path": f"/projects/{project['id']}", "headers": {"If-None-Match": etag}},
+    ]}, headers={"X-API-Key": api_key})
+
+    assert response.json()["responses"][0]["status"] == 304
+    assert response.json()["responses"][0]["body"] is None
+
+
+def test_batch_validation_error_in_sub_request(client, api_key):
+    """Тест що невалідний під-запит повертає свій 422, а батч - 200"""
+    response = client.post("/batch", json={"requests": [
+        {"method": "POST", "path": "/projects", "body": {"name": ""}},
+    ]}, headers={"X-API-Key": api_key})
+
+    assert response.status_code == 200
+    assert response.json()["responses"][0]["status"] == 422
+
+
+def test_batch_requires_api_key(client):
+    """Тест що батч перевіряє API ключ"""
+    response = client.post("/batch", json={"requests": [{"method": "GET", "path": "/projects"}]})
+    assert response.status_code == 401
+
+
+def test_batch_rejects_nested_batch(client, api_key):
+    """Тест заборони вкладених батчів"""
+    response = client.post("/batch", json={"requests": [{"method": "POST", "path": "/batch", "body": {"requests": []}}]}, headers={"X-API-Key": api_key})
+    assert response.status_code == 422
+
+
+def test_batch_read_only_requests_run_concurrently(client, api_key, mock_get_artwork):
+    """Тест що суміжні GET-и відправляються разом, а PATCH - окремо"""
+    project = create_project(client, api_key)
+    place_id = project["places"][0]["id"]
+    groups = []
+    dispatch = batch_service._dispatch
+
+    async def tracking_dispatch(parent, sub, db):
+        groups.append((sub.method, db is not None))
+        return await dispatch(parent, sub, db)
+
+    with patch("app.services.batch_service._dispatch", side_effect=tracking_dispatch), \
+            patch("app.services.batch_service.asyncio.gather", wraps=batch_service.asyncio.gather) as gather:
+        client.post("/batch", json={"requests": [
+            {"method": "GET", "path": f"/projects/{project['id']}"},
+            {"method": "GET", "path": f"/projects/{project['id']}/places"},
+            {"method": "PATCH", "path": f"/projects/{project['id']}/places/{place_id}", "body": {"visited": True}},
+        ]}, headers={"X-API-Key": api_key})
+
+    assert gather.call_count == 1
+    assert len(gather.call_args.args) == 2
+    assert groups == [("GET", False), ("GET", False), ("PATCH", True)]
+
+
+def test_batch_rejects_event_stream(client, api_key):
+    """Тест що SSE-потік не можна викликати з батча"""
+    response = client.post("/batch", json={"requests": [{"method": "GET", "path": "/projects/1/events"}]}, headers={"X-API-Key": api_key})
+    assert response.status_code == 422
+
+
+def test_batch_failing_sub_request_does_not_fail_batch(client, api_key, mock_get_artwork):
+    """Тест що необроблений виняток під-запиту дає йому 500, а решта батча виконується"""
+    project = create_project(client, api_key)
+
+    with patch("app.routes.projects.project_crud.list_all", side_effect=RuntimeError("boom")):
+        response = client.post("/batch", json={"requests": [
+            {"method": "GET", "path": "/projects"},
+            {"method": "PATCH", "path": f"/projects/{project['id']}", "body": {"name": "Renamed"}},
+            {"method": "GET", "path": f"/projects/{project['id']}"},
+        ]}, headers={"X-API-Key": api_key})
+
+    assert response.status_code == 200
+    failed, patched, detail = response.json()["responses"]
+    assert failed["status"] == 500
+    assert patched["status"] == 200
+    assert detail["body"]["name"] == "Renamed"
+
+
+def test_batch_rejects_invalid_sub_request_headers(client, api_key):
+    """Тест що заголовки, які не закодувати в latin-1, відхиляються валідацією"""
+    for headers in ({"X-Foo": "✓"}, {"X-Foo": "a\r\nX-Injected: 1"}, {"Bad Name": "1"}):
+        response = client.post("/batch", json={"requests": [
+            {"method": "GET", "path": "/projects", "headers": headers},
+        ]}, headers={"X-API-Key": api_key})
+        assert response.status_code == 422
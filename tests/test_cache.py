@@ -0,0 +1,124 @@
+import pytest
+from app.core.cache import CacheBackend, LRUCacheBackend, ProjectDetailCache, project_cache, set_project_cache_backend
+
+
+class SharedCacheStandIn(CacheBackend):
+    """Локальна заміна спільного бекенду (Redis тощо)"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def clear(self):
+        self.data.clear()
+
+
+def test_lru_backend_evicts_least_recently_used():
+    """Тест витіснення найдавніше використаного запису"""
+    backend = LRUCacheBackend(maxsize=2)
+    backend.set("a", b"1")
+    backend.set("b", b"2")
+    backend.get("a")
+    backend.set("c", b"3")
+
+    assert backend.get("a") == b"1"
+    assert backend.get("b") is None
+    assert len(backend) == 2
+
+
+def test_project_cache_version_mismatch_is_stale():
+    """Тест що запис іншої версії не віддається і рахується як stale"""
+    cache = ProjectDetailCache(LRUCacheBackend(maxsize=10))
+    cache.set(1, 3, b'{"id": 1}')
+
+    assert cache.get(1, 3) == b'{"id": 1}'
+    assert cache.get(1, 4) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["stale"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_get_project_served_from_cache(client, api_key, mock_get_artwork, test_db):
+    """Тест що повторний GET /projects/{id} віддається з кешу без запитів до project_places"""
+    from sqlalchemy import event
+
+    backend = SharedCacheStandIn()
+    set_project_cache_backend(backend)
+
+    create_response = client.post(
+        "/projects",
+        json={"name": "Cached", "places": [{"external_id": "27992"}]},
+        headers={"X-API-Key": api_key}
+    )
+    project_id = create_response.json()["id"]
+
+    first = client.get(f"/projects/{project_id}", headers={"X-API-Key": api_key})
+    assert len(backend.data) == 1
+
+    statements = []
+    engine = test_db.get_bind()
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        second = client.get(f"/projects/{project_id}", headers={"X-API-Key": api_key})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert second.json() == first.json()
+    assert second.headers["etag"] == first.headers["etag"]
+    assert not any("project_places" in s for s in statements)
+    assert project_cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("mutation", ["patch_project", "patch_place", "bulk_patch_places", "add_place", "delete"])
+def test_write_paths_invalidate_cache(client, api_key, mock_get_artwork, mutation):
+    """Тест що кожен шлях запису інвалідує кеш деталей проекту"""
+    create_response = client.post(
+        "/projects",
+        json={"name": "Cached", "places": [{"external_id": "27992"}]},
+        headers={"X-API-Key": api_key}
+    )
+    project_id = create_response.json()["id"]
+    place_id = create_response.json()["places"][0]["id"]
+    client.get(f"/projects/{project_id}", headers={"X-API-Key": api_key})
+    headers = {"X-API-Key": api_key}
+
+    if mutation == "patch_project":
+        client.patch(f"/projects/{project_id}", json={"name": "Renamed"}, headers=headers)
+    elif mutation == "patch_place":
+        client.patch(f"/projects/{project_id}/places/{place_id}", json={"notes": "x"}, headers=headers)
+    elif mutation == "bulk_patch_places":
+        client.patch(f"/projects/{project_id}/places", json={"places": [{"id": place_id, "notes": "x"}]}, headers=headers)
+    elif mutation == "add_place":
+        client.post(f"/projects/{project_id}/places", json={"external_id": "28560"}, headers=headers)
+    else:
+        client.delete(f"/projects/{project_id}", headers=headers)
+
+    stats = project_cache.stats()
+    assert stats["invalidations"] == 1
+    assert stats["stale"] == 0
+
+    response = client.get(f"/projects/{project_id}", headers=headers)
+    if mutation == "delete":
+        assert response.status_code == 404
+    else:
+        assert response.status_code == 200
+        assert project_cache.stats()["misses"] == 2
+
+
+def test_cache_stats_endpoint(client, api_key):
+    """Тест endpoint зі статистикою кешу"""
+    response = client.get("/admin/cache", headers={"X-API-Key": api_key})
+    assert response.status_code == 200
+    assert set(response.json()) >= {"hit_ratio", "stale", "invalidations", "max_hit_age_seconds"}
@@ -0,0 +1,56 @@
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import Session
+from app.core.db import Base, upgrade_schema
+from app.models import Project
+from app.crud import project as project_crud
+
+# Схема першої версії: без status, status_detail, version, updated_at і нових індексів
+_BASELINE_DDL = [
+    """CREATE TABLE projects (
+        id INTEGER NOT NULL PRIMARY KEY,
+        name VARCHAR(200) NOT NULL,
+        description TEXT,
+        start_date DATE,
+        completed BOOLEAN NOT NULL
+    )""",
+    """CREATE TABLE project_places (
+        id INTEGER NOT NULL PRIMARY KEY,
+        project_id INTEGER NOT NULL REFERENCES projects (id),
+        external_id VARCHAR(64) NOT NULL,
+        title VARCHAR(300),
+        notes TEXT,
+        visited BOOLEAN NOT NULL,
+        visited_at DATETIME,
+        CONSTRAINT uq_project_external UNIQUE (project_id, external_id)
+    )""",
+    "INSERT INTO projects (id, name, completed) VALUES (1, 'Old trip', 0)",
+    "INSERT INTO project_places (id, project_id, external_id, title, visited) VALUES (1, 1, '27992', 'A Sunday', 0)",
+]
+
+
+def test_upgrade_baseline_database(tmp_path):
+    """Тест оновлення бази, створеної першою версією: колонки додаються, дані читаються"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        for statement in _BASELINE_DDL:
+            connection.exec_driver_sql(statement)
+
+    with engine.begin() as connection:
+        Base.metadata.create_all(bind=connection)
+        added = upgrade_schema(connection)
+    assert added == ["projects.status", "projects.status_detail", "projects.version", "projects.updated_at", "project_places.updated_at"]
+    indexes = {i["name"] for i in inspect(engine).get_indexes("project_places")}
+    assert "ix_project_places_project_id" in indexes
+
+    with Session(engine) as db:
+        project = db.get(Project, 1)
+        assert (project.status, project.version, project.status_detail) == ("active", 1, None)
+        assert project.updated_at.year > 1970
+        assert [p["id"] for p in project_crud.list_all(db, limit=10, offset=0, fields=["id", "status"])] == [1]
+        assert [p.id for p in project.places] == [1]
+        assert project.places[0].updated_at.year > 1970
+
+    # Повторний запуск нічого не змінює
+    with engine.begin() as connection:
+        assert upgrade_schema(connection) == []
+    engine.dispose()
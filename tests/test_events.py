@@ -0,0 +1,131 @@
+import asyncio
+import json
+import threading
+import tracemalloc
+from app.services.project_events import ProjectEventBus, project_events
+
+
+def read_events(lines, until: str) -> list[tuple[str, dict]]:
+    """Події SSE-потоку (event, data) до події until включно"""
+    events, name = [], None
+    for line in lines:
+        if line.startswith("event: "):
+            name = line.removeprefix("event: ")
+        elif line.startswith("data: "):
+            events.append((name, json.loads(line.removeprefix("data: "))))
+            if name == until:
+                return events
+    raise AssertionError(f"stream ended before {until}")
+
+
+def test_project_events_stream(client, api_key, mock_get_artwork):
+    """Тест що зміни проекту приходять у SSE-потік, а Last-Event-ID відновлює пропущене"""
+    headers = {"X-API-Key": api_key}
+    project = client.post("/projects", json={"name": "Trip", "places": [{"external_id": "27992"}]}, headers=headers).json()
+    place_id = project["places"][0]["id"]
+    resume_from = f"{project_events.epoch}-{project_events._seq}"
+
+    client.patch(f"/projects/{project['id']}/places/{place_id}", json={"notes": "Closed on Mondays"}, headers=headers)
+    client.post(f"/projects/{project['id']}/places", json={"external_id": "28560"}, headers=headers)
+    client.patch(f"/projects/{project['id']}", json={"name": "Renamed"}, headers=headers)
+
+    # TestClient повертає відповідь лише після кінця потоку: видалення з іншого потоку під час
+    # підписки приходить живою подією і завершує потік
+    deleter = threading.Timer(0.2, client.delete, args=(f"/projects/{project['id']}",), kwargs={"headers": headers})
+    deleter.start()
+    with client.stream("GET", f"/projects/{project['id']}/events", headers={**headers, "Last-Event-ID": resume_from}) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = read_events(response.iter_lines(), until="project_deleted")
+    deleter.join()
+
+    assert [name for name, _ in events] == ["place_updated", "place_added", "project_updated", "project_deleted"]
+    assert events[0][1]["place"]["notes"] == "Closed on Mondays"
+    assert events[0][1]["completed"] is False
+    assert events[1][1]["place"]["external_id"] == "28560"
+    assert events[2][1]["name"] == "Renamed"
+
+
+def test_project_events_not_found(client, api_key):
+    """Тест потоку подій неіснуючого проекту"""
+    assert client.get("/projects/999/events", headers={"X-API-Key": api_key}).status_code == 404
+    assert client.get("/projects/999/events").status_code == 401
+
+
+async def next_frame(stream):
+    return await asyncio.wait_for(anext(stream), 1)
+
+
+async def test_resume_and_reset_after_buffer_overflow():
+    """Тест відновлення з Last-Event-ID і події reset, коли пропущене вже витіснене з буфера"""
+    bus = ProjectEventBus(buffer_size=3)
+    for i in range(5):
+        bus.publish(1, "place_updated", {"i": i})
+    bus.publish(2, "place_updated", {"i": 99})
+
+    stream = bus.subscribe(1, f"{bus.epoch}-3", heartbeat_seconds=10)
+    assert [(await next_frame(stream)).seq for _ in range(2)] == [4, 5]
+
+    stream = bus.subscribe(1, f"{bus.epoch}-1", heartbeat_seconds=10)
+    reset = await next_frame(stream)
+    assert reset.event == "reset"
+    assert [(await next_frame(stream)).seq for _ in range(3)] == [3, 4, 5]
+
+    # id з попереднього запуску процесу
+    stream = bus.subscribe(1, "0-4", heartbeat_seconds=10)
+    assert (await next_frame(stream)).event == "reset"
+
+
+async def test_reset_for_id_from_previous_run():
+    """Тест що id з іншого запуску дає reset, навіть якщо буфер каналу нічого не витісняв"""
+    bus = ProjectEventBus(buffer_size=10)
+    bus.publish(1, "place_updated", {"i": 0})
+
+    stream = bus.subscribe(1, "0-1", heartbeat_seconds=10)
+    reset = await next_frame(stream)
+    assert reset.event == "reset"
+    assert reset.seq == 0
+    assert (await next_frame(stream)).seq == 1
+
+    # id каналу без подій теж чужий
+    stream = bus.subscribe(2, "0-7", heartbeat_seconds=10)
+    assert (await next_frame(stream)).event == "reset"
+
+
+async def test_live_events_and_heartbeat():
+    """Тест що підписник отримує нові події з інших потоків і heartbeat у тиші"""
+    bus = ProjectEventBus()
+    bus.publish(1, "place_updated", {"old": True})
+    stream = bus.subscribe(1, None, heartbeat_seconds=0.05)
+
+    assert await next_frame(stream) is None
+    pending = asyncio.ensure_future(next_frame(stream))
+    await asyncio.sleep(0.01)
+    await asyncio.to_thread(bus.publish, 1, "place_updated", {"new": True})
+    event = await pending
+    assert event.event == "place_updated"
+    assert '"new":true' in event.frame
+    await stream.aclose()
+    assert bus.stats()["subscribers"] == 0
+
+
+async def test_idle_subscribers_are_cheap():
+    """Тест що тисячі бездіяльних підписників займають мало пам'яті і будяться однією подією"""
+    bus = ProjectEventBus()
+    subscribers = 2000
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    streams = [bus.subscribe(1, None, heartbeat_seconds=60) for _ in range(subscribers)]
+    tasks = [asyncio.ensure_future(anext(stream)) for stream in streams]
+    await asyncio.sleep(0.05)
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / subscribers
+    tracemalloc.stop()
+
+    assert bus.stats()["subscribers"] == subscribers
+    assert per_subscriber < 8 * 1024
+
+    bus.publish(1, "project_updated", {"name": "Renamed"})
+    events = await asyncio.wait_for(asyncio.gather(*tasks), 1)
+    assert {event.seq for event in events} == {1}
+    for stream in streams:
+        await stream.aclose()
@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import sessionmaker
+from app.models import Project, ProjectPlace
+from app.services.group_commit import GroupCommitter
+
+
+@pytest.fixture
+def project_with_places(test_db):
+    """Проект з трьома місцями напряму в БД"""
+    project = Project(name="Trip", places=[ProjectPlace(external_id=str(i), title=f"Art {i}") for i in range(3)])
+    test_db.add(project)
+    test_db.commit()
+    return project.id, [place.id for place in project.places]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_share_one_commit(test_db, project_with_places):
+    """Тест що паралельні зміни комітяться одним пакетом і кожен запит отримує своє місце"""
+    project_id, place_ids = project_with_places
+    factory = sessionmaker(bind=test_db.get_bind())
+    committer = GroupCommitter()
+    committer.start(interval_ms=50, max_batch=100)
+    try:
+        results = await asyncio.gather(*(
+            committer.submit(factory, project_id, place_id, f"note {place_id}", True) for place_id in place_ids
+        ))
+    finally:
+        await committer.stop()
+
+    assert committer.batches == 1
+    assert [r["id"] for r in results] == place_ids
+    assert all(r["visited"] and r["visited_at"] for r in results)
+
+    test_db.expire_all()
+    project = test_db.get(Project, project_id)
+    assert project.completed is True
+    assert project.version == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_mutation_does_not_affect_batch(test_db, project_with_places):
+    """Тест що помилка однієї зміни (чуже місце) не скасовує решту пакета"""
+    project_id, place_ids = project_with_places
+    factory = sessionmaker(bind=test_db.get_bind())
+    committer = GroupCommitter()
+    committer.start(interval_ms=50, max_batch=100)
+    try:
+        results = await asyncio.gather(
+            committer.submit(factory, project_id, place_ids[0], None, True),
+            committer.submit(factory, project_id + 1, place_ids[1], None, True),
+            committer.submit(factory, project_id, 999, None, True),
+            return_exceptions=True,
+        )
+    finally:
+        await committer.stop()
+
+    assert results[0]["visited"] is True
+    assert isinstance(results[1], HTTPException) and results[1].detail == "Project not found"
+    assert isinstance(results[2], HTTPException) and results[2].detail == "Place not found"
+    test_db.expire_all()
+    assert test_db.get(ProjectPlace, place_ids[0]).visited is True
+    assert test_db.get(Project, project_id).completed is False
+
+
+@pytest.mark.asyncio
+async def test_max_batch_splits_batches(test_db, project_with_places):
+    """Тест що пакет не перевищує max_batch"""
+    project_id, place_ids = project_with_places
+    factory = sessionmaker(bind=test_db.get_bind())
+    committer = GroupCommitter()
+    committer.start(interval_ms=50, max_batch=2)
+    try:
+        await asyncio.gather(*(committer.submit(factory, project_id, place_id, None, True) for place_id in place_ids))
+    finally:
+        await committer.stop()
+
+    assert committer.batches == 2
+    assert committer.mutations == 3
+
+
+def test_patch_place_through_group_commit(client, api_key, mock_get_artwork, monkeypatch):
+    """Тест що PATCH місця йде через group commit, коли він увімкнений"""
+    project = client.post(
+        "/projects",
+        json={"name": "Trip", "places": [{"external_id": "27992"}]},
+        headers={"X-API-Key": api_key}
+    ).json()
+    place_id = project["places"][0]["id"]
+
+    committer = GroupCommitter()
+    monkeypatch.setattr("app.routes.places.group_committer", committer)
+    # Стартуємо в циклі подій TestClient через перший запит
+    with client:
+        client.portal.call(committer.start, 1, 100)
+        response = client.patch(
+            f"/projects/{project['id']}/places/{place_id}",
+            json={"visited": True},
+            headers={"X-API-Key": api_key}
+        )
+        missing = client.patch(
+            f"/projects/{project['id']}/places/999",
+            json={"visited": True},
+            headers={"X-API-Key": api_key}
+        )
+        client.portal.call(committer.stop)
+
+    assert response.status_code == 200
+    assert response.json()["visited"] is True
+    assert missing.status_code == 404
+    assert committer.batches == 2
+    assert client.get(f"/projects/{project['id']}", headers={"X-API-Key": api_key}).json()["completed"] is True
+
+
+def test_group_commit_stats(client, api_key):
+    """Тест статистики group commit в admin"""
+    response = client.get("/admin/group-commit", headers={"X-API-Key": api_key})
+    assert response.status_code == 200
+    assert response.json()["enabled"] is False
@@ -0,0 +1,187 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from unittest.mock import patch
+from app.crud import idempotency as idempotency_crud
+from app.models import IdempotencyKey
+from app.services.idempotency_service import run_idempotent
+
+
+def test_create_project_replayed_with_same_key(client, api_key, mock_get_artwork):
+    """Тест що повтор з тим самим Idempotency-Key повертає першу відповідь без повторних викликів ArtIC"""
+    payload = {"name": "Trip", "places": [{"external_id": "27992"}]}
+    headers = {"X-API-Key": api_key, "Idempotency-Key": "abc-1"}
+
+    first = client.post("/projects", json=payload, headers=headers)
+    second = client.post("/projects", json=payload, headers=headers)
+
+    assert first.status_code == second.status_code == 201
+    assert second.json() == first.json()
+    assert second.headers["idempotent-replayed"] == "true"
+    assert mock_get_artwork.call_count == 1
+    assert len(client.get("/projects", headers={"X-API-Key": api_key}).json()) == 1
+
+
+def test_idempotency_key_reused_with_different_body(client, api_key, mock_get_artwork):
+    """Тест що той самий ключ з іншим тілом відхиляється"""
+    headers = {"X-API-Key": api_key, "Idempotency-Key": "abc-2"}
+    client.post("/projects", json={"name": "A", "places": [{"external_id": "27992"}]}, headers=headers)
+
+    response = client.post("/projects", json={"name": "B", "places": [{"external_id": "27992"}]}, headers=headers)
+    assert response.status_code == 422
+
+
+def test_add_place_failed_response_not_stored(client, api_key, mock_get_artwork):
+    """Тест що помилкова відповідь не зберігається і запит можна повторити з тим самим ключем"""
+    project_id = client.post(
+        "/projects",
+        json={"name": "Trip", "places": [{"external_id": "27992"}]},
+        headers={"X-API-Key": api_key}
+    ).json()["id"]
+    headers = {"X-API-Key": api_key, "Idempotency-Key": "place-1"}
+
+    async def artic_down(external_id: str):
+        return None
+
+    with patch("app.services.project_service.get_artwork", side_effect=artic_down):
+        response = client.post(f"/projects/{project_id}/places", json={"external_id": "28560"}, headers=headers)
+    assert response.status_code == 404
+
+    response = client.post(f"/projects/{project_id}/places", json={"external_id": "28560"}, headers=headers)
+    assert response.status_code == 201
+    replay = client.post(f"/projects/{project_id}/places", json={"external_id": "28560"}, headers=headers)
+    assert replay.status_code == 201
+    assert replay.json()["id"] == response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_wait_for_in_flight(test_db):
+    """Тест що паралельні дублікати чекають на перший запит, а не виконують handler заново"""
+    calls = 0
+
+    async def handler():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return 201, {"id": 1}
+
+    responses = await asyncio.gather(*(
+        run_idempotent(test_db, "same", "POST /projects", "hash", handler) for _ in range(5)
+    ))
+
+    assert calls == 1
+    assert {r.status_code for r in responses} == {201}
+    assert sum(1 for r in responses if r.headers.get("idempotent-replayed")) == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_share_error(test_db):
+    """Тест що дублікати отримують ту саму помилку, а ключ не зберігається"""
+    async def handler():
+        await asyncio.sleep(0.01)
+        raise HTTPException(404, "not found")
+
+    results = await asyncio.gather(
+        *(run_idempotent(test_db, "err", "POST /projects", "hash", handler) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, HTTPException) and r.status_code == 404 for r in results)
+    assert idempotency_crud.get_valid(test_db, "err", "POST /projects", datetime.now(timezone.utc)) is None
+
+
+def test_purge_expired_keys(test_db):
+    """Тест видалення прострочених ключів"""
+    now = datetime.now(timezone.utc)
+    for key, expires_at in [("old", now - timedelta(seconds=1)), ("fresh", now + timedelta(hours=1))]:
+        test_db.add(IdempotencyKey(key=key, scope="POST /projects", request_hash="h", status_code=201, body="{}", expires_at=expires_at))
+    test_db.commit()
+
+    assert idempotency_crud.get_valid(test_db, "old", "POST /projects", now) is None
+    assert idempotency_crud.purge_expired(test_db, now) == 1
+    assert idempotency_crud.get_valid(test_db, "fresh", "POST /projects", now) is not None
+
+
+def test_reserve_keeps_valid_record_and_replaces_expired(test_db):
+    """Тест що reserve не займає чинний ключ іншого процесу, а прострочений - замінює"""
+    now = datetime.now(timezone.utc)
+
+    def record(key, expires_at):
+        return IdempotencyKey(key=key, scope="POST /projects", request_hash="h", status_code=201, body='{"first":true}', expires_at=expires_at)
+
+    test_db.add_all([record("valid", now + timedelta(hours=1)), record("expired", now - timedelta(seconds=1))])
+    test_db.commit()
+
+    expires_at = now + timedelta(minutes=1)
+    assert not idempotency_crud.reserve(test_db, "valid", "POST /projects", "h2", now, expires_at)
+    assert idempotency_crud.reserve(test_db, "expired", "POST /projects", "h2", now, expires_at)
+
+    assert idempotency_crud.get_valid(test_db, "valid", "POST /projects", now).body == '{"first":true}'
+    reserved = idempotency_crud.get_valid(test_db, "expired", "POST /projects", now)
+    assert (reserved.status_code, reserved.request_hash) == (idempotency_crud.PENDING, "h2")
+
+
+@pytest.mark.asyncio
+async def test_key_reserved_before_handler_runs(test_db):
+    """Тест що ключ резервується в БД до виконання handler, а дублікат з іншого процесу отримує 409"""
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def handler():
+        started.set()
+        await release.wait()
+        return 201, {"id": 1}
+
+    first = asyncio.create_task(run_idempotent(test_db, "k", "POST /projects", "hash", handler))
+    await started.wait()
+    reserved = idempotency_crud.get_valid(test_db, "k", "POST /projects", datetime.now(timezone.utc))
+    assert reserved.status_code == idempotency_crud.PENDING
+
+    # Інший процес не бачить _in_flight цього процесу - лише рядок у БД
+    with patch("app.services.idempotency_service._in_flight", {}):
+        with pytest.raises(HTTPException) as exc:
+            await run_idempotent(test_db, "k", "POST /projects", "hash", handler)
+    assert exc.value.status_code == 409
+    assert exc.value.headers["Retry-After"] == "1"
+
+    release.set()
+    assert (await first).status_code == 201
+    stored = idempotency_crud.get_valid(test_db, "k", "POST /projects", datetime.now(timezone.utc))
+    assert (stored.status_code, stored.body) == (201, '{"id": 1}')
+
+
+@pytest.mark.asyncio
+async def test_duplicates_rerun_when_first_request_cancelled(test_db):
+    """Тест що після скасування першого запиту дублікати не падають з CancelledError, а виконують його самі"""
+    calls = 0
+    started = asyncio.Event()
+
+    async def handler():
+        nonlocal calls
+        calls += 1
+        started.set()
+        await asyncio.sleep(0.05)
+        return 201, {"id": calls}
+
+    first = asyncio.create_task(run_idempotent(test_db, "c", "POST /projects", "hash", handler))
+    await started.wait()
+    waiters = [asyncio.create_task(run_idempotent(test_db, "c", "POST /projects", "hash", handler)) for _ in range(3)]
+    await asyncio.sleep(0)
+    first.cancel()
+
+    responses = await asyncio.gather(*waiters)
+    assert first.cancelled()
+    assert calls == 2
+    assert {r.status_code for r in responses} == {201}
+    assert sum(1 for r in responses if r.headers.get("idempotent-replayed")) == 2
+
+
+def test_async_flag_is_part_of_request_hash(client, api_key, mock_get_artwork):
+    """Тест що той самий ключ і тіло з іншим ?async= не повертають чужу відповідь"""
+    payload = {"name": "Trip", "places": [{"external_id": "27992"}]}
+    headers = {"X-API-Key": api_key, "Idempotency-Key": "abc-async"}
+
+    assert client.post("/projects", json=payload, headers=headers).status_code == 201
+    response = client.post("/projects?async=true", json=payload, headers=headers)
+    assert response.status_code == 422
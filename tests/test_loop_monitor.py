@@ -0,0 +1,56 @@
+import asyncio
+import logging
+import time
+import anyio.to_thread
+from app.core.config import settings
+from app.middleware.active_requests import active_requests
+from app.services.loop_monitor import LoopMonitor
+
+
+async def test_stall_is_attributed_to_route(caplog):
+    """Тест що зависання loop логується з маршрутом і місцем у коді"""
+    monitor = LoopMonitor()
+    monitor.start(interval=0.02, stall_threshold_ms=50)
+    task = asyncio.current_task()
+    active_requests[task] = {"type": "http", "method": "POST", "path": "/projects/import"}
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.services.loop_monitor"):
+            await asyncio.sleep(0.05)
+            time.sleep(0.3)  # блокуючий виклик в async-коді
+            await asyncio.sleep(0.05)
+    finally:
+        active_requests.pop(task, None)
+        await monitor.stop()
+
+    stats = monitor.stats()
+    assert stats["stalls"] == 1
+    assert stats["last_stall"]["lag_ms"] >= 200
+    assert stats["last_stall"]["route"] == "POST unmatched"
+    assert stats["last_stall"]["location"] is None  # тест поза app/
+    assert any("Event loop blocked for over" in r.message for r in caplog.records)
+    assert any("Event loop stalled for" in r.message and "POST unmatched" in r.message for r in caplog.records)
+
+
+async def test_threadpool_saturation():
+    """Тест що черга до threadpool AnyIO помічається"""
+    limiter = anyio.CapacityLimiter(2)
+    monitor = LoopMonitor()
+    monitor.start(interval=0.01, stall_threshold_ms=1000)
+    monitor._limiter = limiter
+    try:
+        await asyncio.gather(*(anyio.to_thread.run_sync(time.sleep, 0.1, limiter=limiter) for _ in range(4)))
+    finally:
+        await monitor.stop()
+
+    stats = monitor.stats()
+    assert stats["threadpool_size"] == 2
+    assert stats["threadpool_max_busy"] == 2
+    assert stats["threadpool_saturations"] >= 1
+
+
+def test_runtime_endpoint(client, api_key):
+    """Тест GET /admin/runtime: монітор запущений у lifespan, розмір threadpool з налаштувань"""
+    data = client.get("/admin/runtime", headers={"X-API-Key": api_key}).json()
+    assert data["running"] is True
+    assert data["threadpool_size"] == settings.threadpool_size
+    assert data["active_requests"] == {"GET /admin/runtime": 1}
@@ -0,0 +1,65 @@
+from unittest.mock import AsyncMock, patch
+import httpx
+from app.core.metrics import MetricsRegistry, http_requests, http_request_duration, artic_requests
+from app.services.artic_service import get_artwork
+
+
+def test_registry_renders_prometheus_text():
+    """Тест формату: мітки з екрануванням, кумулятивні бакети, _sum і _count"""
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs.", ("queue",))
+    histogram = registry.histogram("job_seconds", "Job latency.", buckets=(0.1, 1.0))
+    counter.inc('a"b')
+    counter.inc('a"b', amount=2)
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value)
+    registry.register_collector(lambda: [("queue_depth", "gauge", "Depth.", [({"queue": "x"}, 4)])])
+
+    text = registry.render()
+    assert '# TYPE jobs_total counter\njobs_total{queue="a\\"b"} 3\n' in text
+    assert 'job_seconds_bucket{le="0.1"} 1\n' in text
+    assert 'job_seconds_bucket{le="1"} 3\n' in text
+    assert 'job_seconds_bucket{le="+Inf"} 4\n' in text
+    assert "job_seconds_sum 4.05\njob_seconds_count 4\n" in text
+    assert '# TYPE queue_depth gauge\nqueue_depth{queue="x"} 4\n' in text
+
+
+def test_metrics_endpoint(client, api_key, mock_get_artwork):
+    """Тест що запити рахуються за шаблоном маршруту, а не за шляхом"""
+    headers = {"X-API-Key": api_key}
+    route = ("GET", "/projects/{project_id}", "200")
+    before = http_requests.value(*route)
+    observed = http_request_duration.count("GET", "/projects/{project_id}")
+    project = client.post("/projects", json={"name": "A", "places": [{"external_id": "27992"}]}, headers=headers).json()
+    client.get(f"/projects/{project['id']}", headers=headers)
+    client.get(f"/projects/{project['id']}", headers=headers)
+    client.get("/no/such/path")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert http_requests.value(*route) == before + 2
+    assert http_request_duration.count("GET", "/projects/{project_id}") == observed + 2
+    assert http_requests.value("GET", "unmatched", "404") >= 1
+    assert http_requests.value("POST", "/projects", "201") >= 1
+
+    text = response.text
+    assert f'http_requests_total{{method="GET",route="/projects/{{project_id}}",status="200"}} {before + 2}\n' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/projects/{project_id}",le="+Inf"}' in text
+    # Сам scrape ще виконується
+    assert "http_requests_in_flight 1\n" in text
+    assert "project_cache_hit_ratio 0.5\n" in text
+    assert "# TYPE db_pool_checkout_wait_seconds histogram" in text
+    assert f"/projects/{project['id']}" not in text
+
+
+async def test_artic_outcomes_are_counted():
+    """Тест лічильників результатів викликів ArtIC"""
+    not_found = httpx.Response(404, request=httpx.Request("GET", "https://api.artic.edu/api/v1/artworks/1"))
+    before = artic_requests.value("artwork", "not_found"), artic_requests.value("artwork", "timeout")
+    with patch("httpx.AsyncClient.get", AsyncMock(return_value=not_found)):
+        assert await get_artwork("1") is None
+    with patch("httpx.AsyncClient.get", AsyncMock(side_effect=httpx.ConnectTimeout("timed out"))):
+        assert await get_artwork("1") is None
+    after = artic_requests.value("artwork", "not_found"), artic_requests.value("artwork", "timeout")
+    assert after == (before[0] + 1, before[1] + 1)
@@ -1,5 +1,9 @@
 import pytest
+from datetime import datetime
+from sqlalchemy import event
 from unittest.mock import AsyncMock, patch
+from app.crud import place as place_crud
+from app.models import ProjectPlace
 
 
 @pytest.fixture
@@ -91,7 +95,7 @@ def test_add_place_invalid_external_id(client, api_key, project_with_place, mock
     async def return_none(external_id: str):
         return None
     
-    with patch("app.services.artic_service.get_artwork", side_effect=return_none):
+    with patch("app.services.project_service.get_artwork", side_effect=return_none):
         response = client.post(
             f"/projects/{project_id}/places",
             json={"external_id": "invalid", "notes": "Test"},
@@ -269,3 +273,200 @@ def test_update_place_not_found(client, api_key, project_with_place):
         headers={"X-API-Key": api_key}
     )
     assert response.status_code == 404
+
+
+def test_bulk_update_places(client, api_key, mock_get_artwork):
+    """Тест пакетного оновлення місць з одним перерахунком completed"""
+    create_response = client.post(
+        "/projects",
+        json={
+            "name": "Test Project",
+            "places": [
+                {"external_id": "27992", "notes": "Place 1"},
+                {"external_id": "28560", "notes": "Place 2"}
+            ]
+        },
+        headers={"X-API-Key": api_key}
+    )
+    project_id = create_response.json()["id"]
+    place_ids = [p["id"] for p in create_response.json()["places"]]
+
+    response = client.patch(
+        f"/projects/{project_id}/places",
+        json={"places": [
+            {"id": place_ids[1], "visited": True, "notes": "Done"},
+            {"id": place_ids[0], "visited": True}
+        ]},
+        headers={"X-API-Key": api_key}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [p["id"] for p in data] == [place_ids[1], place_ids[0]]
+    assert all(p["visited"] and p["visited_at"] for p in data)
+    assert data[0]["notes"] == "Done"
+    assert data[1]["notes"] == "Place 1"
+
+    get_response = client.get(f"/projects/{project_id}", headers={"X-API-Key": api_key})
+    assert get_response.json()["completed"] is True
+
+
+def test_bulk_update_places_unknown_place(client, api_key, mock_get_artwork, project_with_place):
+    """Тест що пакетне оновлення нічого не змінює, якщо хоча б одне місце не знайдено"""
+    project_id, place_id = project_with_place
+
+    response = client.patch(
+        f"/projects/{project_id}/places",
+        json={"places": [{"id": place_id, "visited": True}, {"id": 999, "visited": True}]},
+        headers={"X-API-Key": api_key}
+    )
+    assert response.status_code == 404
+    assert "999" in response.json()["detail"]
+
+    place = client.get(f"/projects/{project_id}/places/{place_id}", headers={"X-API-Key": api_key}).json()
+    assert place["visited"] is False
+
+
+def test_bulk_update_places_duplicate_ids(client, api_key, mock_get_artwork, project_with_place):
+    """Тест пакетного оновлення з дублікатами id"""
+    project_id, place_id = project_with_place
+
+    response = client.patch(
+        f"/projects/{project_id}/places",
+        json={"places": [{"id": place_id, "visited": True}, {"id": place_id, "notes": "x"}]},
+        headers={"X-API-Key": api_key}
+    )
+    assert response.status_code == 409
+
+
+def test_bulk_update_places_limit(client, api_key, mock_get_artwork, project_with_place, monkeypatch):
+    """Тест що пакет більший за MAX_PLACES_PER_PROJECT відхиляється до валідації елементів"""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "max_places_per_project", 2)
+    project_id, place_id = project_with_place
+
+    response = client.patch(
+        f"/projects/{project_id}/places",
+        json={"places": [{"id": place_id}, {"id": "bad"}, {"id": place_id + 1}]},
+        headers={"X-API-Key": api_key}
+    )
+    assert response.status_code == 422
+    [error] = response.json()["detail"]
+    assert "At most 2 places" in error["msg"]
+
+
+def test_list_places_etag_not_modified(client, api_key, mock_get_artwork, project_with_place):
+    """Тест ETag та 304 для GET /projects/{id}/places"""
+    project_id, _ = project_with_place
+
+    response = client.get(f"/projects/{project_id}/places", headers={"X-API-Key": api_key})
+    etag = response.headers["etag"]
+
+    response = client.get(f"/projects/{project_id}/places", headers={"X-API-Key": api_key, "If-None-Match": f'W/{etag}, "other"'})
+    assert response.status_code == 304
+
+    # Інша сторінка чи фільтр - інший ETag, а не 304 на чужу відповідь
+    for query in ("offset=1", "visited=true", "sort=id", "limit=10"):
+        response = client.get(f"/projects/{project_id}/places?{query}", headers={"X-API-Key": api_key, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+    # Ті самі параметри в нормалізованому вигляді - той самий ETag
+    response = client.get(f"/projects/{project_id}/places?sort=-id&offset=0&limit=50", headers={"X-API-Key": api_key, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    client.post(
+        f"/projects/{project_id}/places",
+        json={"external_id": "28560"},
+        headers={"X-API-Key": api_key}
+    )
+    response = client.get(f"/projects/{project_id}/places", headers={"X-API-Key": api_key, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+
+def test_list_places_filters_and_sort(client, api_key, mock_get_artwork, test_db):
+    """Тест фільтрів visited, visited_at і сортування списку місць"""
+    project = client.post(
+        "/projects",
+        json={"name": "Trip", "places": [{"external_id": "27992"}, {"external_id": "28560"}, {"external_id": "111628"}]},
+        headers={"X-API-Key": api_key}
+    ).json()
+    first, second, third = [p["id"] for p in project["places"]]
+    for place_id, visited_at in [(first, datetime(2024, 6, 1, 10)), (third, datetime(2024, 6, 3, 10))]:
+        place = test_db.get(ProjectPlace, place_id)
+        place.visited, place.visited_at = True, visited_at
+    test_db.commit()
+
+    def ids(query):
+        response = client.get(f"/projects/{project['id']}/places?{query}", headers={"X-API-Key": api_key})
+        assert response.status_code == 200
+        return [p["id"] for p in response.json()]
+
+    assert ids("visited=false") == [second]
+    assert ids("visited=true&sort=visited_at") == [first, third]
+    assert ids("visited_from=2024-06-02T00:00:00") == [third]
+    assert ids("visited_to=2024-06-02T00:00:00&sort=-visited_at") == [first]
+
+
+@pytest.mark.parametrize("filters, index", [
+    ({"visited": True, "sort": "-visited_at"}, "ix_project_places_project_visited"),
+    ({"visited": True, "visited_from": datetime(2024, 1, 1)}, "ix_project_places_project_visited"),
+    ({"visited_from": datetime(2024, 1, 1), "visited_to": datetime(2024, 12, 31)}, "ix_project_places_project_visited_at"),
+    ({"sort": "visited_at"}, "ix_project_places_project_visited_at"),
+    ({"sort": "-id"}, "ix_project_places_project_id"),
+])
+def test_list_places_uses_index(explain_plan, filters, index):
+    """Тест що фільтри місць проекту обслуговуються композитними індексами"""
+    plan = explain_plan(place_crud.list_for_project_stmt(1, **filters).limit(50))
+    assert f"USING INDEX {index} " in plan
+
+
+def test_completion_check_uses_index(explain_plan):
+    """Тест що перевірка completed - пошук по індексу, а не обхід місць проекту"""
+    plan = explain_plan(place_crud.is_completed_stmt(1))
+    assert plan.count("SEARCH project_places USING") == 2
+    assert "USING INDEX ix_project_places_project_visited (project_id=? AND visited=?)" in plan
+    assert "SCAN project_places" not in plan
+
+
+@pytest.fixture
+def large_project(client, api_key, mock_get_artwork, test_db, monkeypatch):
+    """Проект з 10 тис. місць (місця вставляються напряму, без ArtIC)"""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "max_places_per_project", 20000)
+    project = client.post("/projects", json={"name": "Museum-wide", "places": [{"external_id": "0"}]}, headers={"X-API-Key": api_key}).json()
+    place_crud.bulk_insert(test_db, [
+        {"project_id": project["id"], "external_id": str(i), "title": f"Artwork {i}", "visited": False}
+        for i in range(1, 10000)
+    ])
+    test_db.commit()
+    return project
+
+
+def test_large_project_mutations_do_not_load_all_places(client, api_key, large_project, test_db):
+    """Тест що зміни проекту з 10 тис. місць не завантажують його місця"""
+    headers = {"X-API-Key": api_key}
+    project_id = large_project["id"]
+    place_id = large_project["places"][0]["id"]
+    loaded = []
+
+    def on_load(target, context):
+        loaded.append(target.id)
+
+    event.listen(ProjectPlace, "load", on_load)
+    try:
+        response = client.patch(f"/projects/{project_id}/places/{place_id}", json={"visited": True}, headers=headers)
+        assert response.status_code == 200
+        response = client.patch(f"/projects/{project_id}/places", json={"places": [{"id": place_id, "notes": "Seen"}]}, headers=headers)
+        assert response.status_code == 200
+        response = client.post(f"/projects/{project_id}/places", json={"external_id": "10001"}, headers=headers)
+        assert response.status_code == 201
+        assert client.delete(f"/projects/{project_id}", headers=headers).status_code == 409
+    finally:
+        event.remove(ProjectPlace, "load", on_load)
+    # Лише змінювані й додане місця, а не 10 тис.
+    assert len(loaded) <= 5
+
+    detail = client.get(f"/projects/{project_id}", headers=headers).json()
+    assert detail["places_total"] == 10001
+    assert len(detail["places"]) == 100
+    assert detail["completed"] is False
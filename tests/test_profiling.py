@@ -0,0 +1,55 @@
+import time
+from app.core.config import settings
+from app.core.profiler import profile_store
+from app.crud import project as project_crud
+
+
+def test_no_profile_without_header(client, api_key):
+    """Тест що без X-Profile профіль не створюється"""
+    profile_store.clear()
+    response = client.get("/projects", headers={"X-API-Key": api_key})
+    assert "X-Profile-Id" not in response.headers
+    assert profile_store.list() == []
+
+
+def test_profile_requires_api_key(client):
+    """Тест що X-Profile без правильного ключа ігнорується"""
+    profile_store.clear()
+    response = client.get("/health", headers={"X-Profile": "1", "X-API-Key": "wrong"})
+    assert "X-Profile-Id" not in response.headers
+    assert profile_store.list() == []
+
+
+def test_profile_sync_handler(client, api_key, monkeypatch):
+    """Тест профілю sync-обробника: стеки потоку threadpool доступні для завантаження"""
+    profile_store.clear()
+    monkeypatch.setattr(settings, "profile_sample_interval_ms", 1)
+    list_all = project_crud.list_all
+
+    def slow_list_all(*args, **kwargs):
+        time.sleep(0.05)
+        return list_all(*args, **kwargs)
+
+    monkeypatch.setattr(project_crud, "list_all", slow_list_all)
+    headers = {"X-API-Key": api_key}
+
+    response = client.get("/projects", headers={**headers, "X-Profile": "1"})
+    assert response.status_code == 200
+    assert response.json() == []
+    profile_id = response.headers["X-Profile-Id"]
+
+    [summary] = client.get("/admin/profiles", headers=headers).json()
+    assert summary["id"] == profile_id
+    assert summary["route"] == "/projects"
+    assert summary["status_code"] == 200
+    assert summary["samples"] > 0
+
+    response = client.get(f"/admin/profiles/{profile_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    lines = response.text.splitlines()
+    assert any("list_projects (app/routes/projects.py)" in line and "slow_list_all (tests/test_profiling.py)" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+
+    assert client.get("/admin/profiles/unknown", headers=headers).status_code == 404
@@ -1,6 +1,10 @@
 import pytest
 from datetime import date
 from unittest.mock import AsyncMock, patch
+from sqlalchemy import event
+from app.crud import project as project_crud
+from app.crud import place as place_crud
+from app.models import Project
 
 
 @pytest.fixture
@@ -86,7 +90,7 @@ def test_create_project_invalid_external_id(client, api_key, mock_get_artwork):
     async def return_none(external_id: str):
         return None
     
-    with patch("app.services.artic_service.get_artwork", side_effect=return_none):
+    with patch("app.services.project_service.get_artwork", side_effect=return_none):
         response = client.post(
             "/projects",
             json={
@@ -124,6 +128,126 @@ def test_list_projects_with_data(client, api_key, mock_get_artwork, project_data
     assert data[0]["name"] == project_data["name"]
 
 
+def test_list_projects_sparse_fields(client, api_key, mock_get_artwork, project_data, test_db):
+    """Тест що ?fields= обрізає і відповідь, і SELECT"""
+    client.post("/projects", json=project_data, headers={"X-API-Key": api_key})
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(test_db.get_bind(), "before_cursor_execute", listener)
+    try:
+        response = client.get("/projects?fields=name,completed", headers={"X-API-Key": api_key})
+    finally:
+        event.remove(test_db.get_bind(), "before_cursor_execute", listener)
+
+    assert response.status_code == 200
+    assert response.json() == [{"id": 1, "name": project_data["name"], "completed": False}]
+    assert len(statements) == 1
+    assert "description" not in statements[0]
+    assert "project_places" not in statements[0]
+
+
+def test_list_projects_unknown_field(client, api_key):
+    """Тест невідомого поля в ?fields="""
+    response = client.get("/projects?fields=name,budget", headers={"X-API-Key": api_key})
+    assert response.status_code == 422
+    assert "budget" in response.json()["detail"]
+
+
+def test_list_projects_filters_and_sort(client, api_key, mock_get_artwork, test_db):
+    """Тест фільтрів completed, start_date, name_prefix і сортування"""
+    for name, start in [("Paris", "2024-05-01"), ("Pisa", "2024-07-01"), ("Rome", "2024-06-01")]:
+        client.post("/projects", json={"name": name, "start_date": start, "places": [{"external_id": "27992"}]}, headers={"X-API-Key": api_key})
+    test_db.get(Project, 2).completed = True
+    test_db.commit()
+
+    def names(query):
+        response = client.get(f"/projects?fields=name&{query}", headers={"X-API-Key": api_key})
+        assert response.status_code == 200
+        return [p["name"] for p in response.json()]
+
+    assert names("name_prefix=P&sort=name") == ["Paris", "Pisa"]
+    assert names("start_date_from=2024-06-01&sort=start_date") == ["Rome", "Pisa"]
+    assert names("start_date_to=2024-06-30&sort=-start_date") == ["Rome", "Paris"]
+    assert names("completed=false") == ["Rome", "Paris"]
+    assert names("completed=true") == ["Pisa"]
+    assert client.get("/projects?sort=budget", headers={"X-API-Key": api_key}).status_code == 422
+
+
+def test_name_prefix_ending_with_last_code_points(test_db):
+    """Тест name_prefix, що закінчується на U+10FFFF чи U+D7FF: межа діапазону не виходить за Unicode"""
+    names = ["a\U0010ffff", "a\U0010ffffz", "b", "\ud7ffx", "\ue000"]
+    test_db.add_all([Project(name=name) for name in names])
+    test_db.commit()
+
+    def found(prefix):
+        rows = project_crud.list_all(test_db, limit=10, offset=0, fields=["id", "name"], name_prefix=prefix, sort="name")
+        return [row["name"] for row in rows]
+
+    assert found("a\U0010ffff") == ["a\U0010ffff", "a\U0010ffffz"]
+    assert found("\U0010ffff") == []
+    assert found("\ud7ff") == ["\ud7ffx"]
+
+
+@pytest.mark.parametrize("filters, index", [
+    ({"completed": False, "start_date_from": date(2024, 1, 1)}, "ix_projects_completed_start_date"),
+    ({"start_date_from": date(2024, 1, 1), "start_date_to": date(2024, 12, 31)}, "ix_projects_start_date"),
+    ({"name_prefix": "Chi"}, "ix_projects_name"),
+    ({"sort": "name"}, "ix_projects_name"),
+])
+def test_list_projects_uses_index(explain_plan, filters, index):
+    """Тест що фільтри списку проектів обслуговуються індексами, а не повним скануванням"""
+    plan = explain_plan(project_crud.list_stmt(["id", "name"], **filters).limit(20))
+    assert index in plan
+    if "sort" in filters:
+        # Порядок береться з індексу, без окремого сортування
+        assert "TEMP B-TREE" not in plan
+
+
+def test_list_projects_include_places(client, api_key, mock_get_artwork, project_data, test_db):
+    """Тест що ?include=places вантажить місця всієї сторінки одним запитом"""
+    for _ in range(3):
+        client.post("/projects", json=project_data, headers={"X-API-Key": api_key})
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(test_db.get_bind(), "before_cursor_execute", listener)
+    try:
+        response = client.get("/projects?include=places&fields=name", headers={"X-API-Key": api_key})
+    finally:
+        event.remove(test_db.get_bind(), "before_cursor_execute", listener)
+
+    data = response.json()
+    assert response.status_code == 200
+    # сторінка проектів, кількість місць, самі місця
+    assert len(statements) == 3
+    assert [p["id"] for p in data] == [3, 2, 1]
+    assert all(set(p) == {"id", "name", "places", "places_total"} for p in data)
+    assert all(len(p["places"]) == len(project_data["places"]) for p in data)
+    assert all(place["project_id"] == p["id"] for p in data for place in p["places"])
+
+
+def test_list_projects_include_places_is_capped(client, api_key, mock_get_artwork, project_data, test_db, monkeypatch):
+    """Тест що ?include=places вбудовує не більше PROJECT_DETAIL_PLACES_LIMIT місць на проект і places_total"""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "project_detail_places_limit", 1)
+    client.post("/projects", json=project_data, headers={"X-API-Key": api_key})
+    client.post("/projects", json={"name": "Single", "places": [{"external_id": "27992"}]}, headers={"X-API-Key": api_key})
+
+    response = client.get("/projects?include=places&fields=name", headers={"X-API-Key": api_key})
+
+    single, full = response.json()
+    assert [p["external_id"] for p in single["places"]] == ["27992"]
+    assert single["places_total"] == 1
+    assert [p["external_id"] for p in full["places"]] == [project_data["places"][0]["external_id"]]
+    assert full["places_total"] == len(project_data["places"])
+
+
+def test_include_places_limits_each_project_by_index(explain_plan):
+    """Тест що перші місця кожного проекту беруться LIMIT-ом по індексу, без читання всіх місць"""
+    plan = explain_plan(place_crud.list_for_projects_stmt([1, 2, 3], 100))
+    assert "CORRELATED LIST SUBQUERY" in plan
+    assert "ix_project_places_project_id" in plan
+
+
 def test_get_project_not_found(client, api_key):
     """Тест отримання неіснуючого проекту"""
     response = client.get("/projects/999", headers={"X-API-Key": api_key})
@@ -232,3 +356,361 @@ def test_delete_project_not_found(client, api_key):
     """Тест видалення неіснуючого проекту"""
     response = client.delete("/projects/999", headers={"X-API-Key": api_key})
     assert response.status_code == 404
+
+
+@pytest.fixture
+def mock_get_artworks():
+    """Мок пакетного get_artworks: знаходить лише числові id"""
+    async def mock_artworks(external_ids, strict=False):
+        return {i: {"id": int(i), "title": f"Artwork {i}"} for i in external_ids if i.isdigit()}
+
+    with patch("app.services.project_service.get_artworks", side_effect=mock_artworks) as mock:
+        yield mock
+
+
+def test_bulk_create_projects(client, api_key, mock_get_artworks):
+    """Тест пакетного створення проектів з результатом для кожного елемента"""
+    payload = {"projects": [
+        {"name": "P1", "places": [{"external_id": "27992"}, {"external_id": "28560"}]},
+        {"name": "P2", "places": []},
+        {"name": "P3", "places": [{"external_id": "27992"}, {"external_id": "27992"}]},
+        {"name": "P4", "places": [{"external_id": "invalid"}]},
+        {"name": "P5", "places": [{"external_id": "28560", "notes": "n"}]},
+    ]}
+    response = client.post("/projects/bulk", json=payload, headers={"X-API-Key": api_key})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 3
+    assert [r["status_code"] for r in data["results"]] == [201, 422, 409, 404, 201]
+
+    # Усі external_id батчу розв'язуються одним викликом
+    mock_get_artworks.assert_called_once()
+    assert sorted(mock_get_artworks.call_args.args[0]) == ["27992", "28560", "invalid"]
+
+    p1 = client.get(f"/projects/{data['results'][0]['id']}", headers={"X-API-Key": api_key}).json()
+    assert p1["name"] == "P1"
+    assert [p["title"] for p in p1["places"]] == ["Artwork 27992", "Artwork 28560"]
+    p5 = client.get(f"/projects/{data['results'][4]['id']}", headers={"X-API-Key": api_key}).json()
+    assert p5["places"][0]["notes"] == "n"
+
+
+def test_bulk_create_projects_artic_unavailable(client, api_key, mock_get_artworks):
+    """Тест що під час збою ArtIC елементи отримують 503, а не 404, і нічого не створюється"""
+    from app.services.artic_service import ArticUnavailable
+
+    mock_get_artworks.side_effect = ArticUnavailable("ArtIC API responded with HTTP 429")
+    payload = {"projects": [
+        {"name": "P1", "places": [{"external_id": "27992"}]},
+        {"name": "P2", "places": []},
+    ]}
+    response = client.post("/projects/bulk", json=payload, headers={"X-API-Key": api_key})
+
+    data = response.json()
+    assert data["created"] == 0
+    assert [(r["status_code"], r["detail"]) for r in data["results"]] == [
+        (503, "ArtIC API is unavailable, retry later"),
+        (422, "Project must have at least 1 place"),
+    ]
+    assert mock_get_artworks.call_args.kwargs == {"strict": True}
+    assert client.get("/projects", headers={"X-API-Key": api_key}).json() == []
+
+
+def test_bulk_create_projects_chunked(client, api_key, mock_get_artworks, monkeypatch):
+    """Тест що вставка розбивається на транзакції за bulk_chunk_size"""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "bulk_chunk_size", 2)
+
+    payload = {"projects": [{"name": f"P{i}", "places": [{"external_id": str(27992 + i)}]} for i in range(5)]}
+    response = client.post("/projects/bulk", json=payload, headers={"X-API-Key": api_key})
+    assert response.status_code == 200
+    ids = [r["id"] for r in response.json()["results"]]
+    assert len(set(ids)) == 5
+
+    listed = client.get("/projects", headers={"X-API-Key": api_key}).json()
+    assert {p["name"] for p in listed} == {f"P{i}" for i in range(5)}
+
+
+def test_export_projects_ndjson(client, api_key, mock_get_artworks):
+    """Тест потокового NDJSON-експорту проектів з місцями"""
+    import json
+
+    payload = {"projects": [{"name": f"P{i}", "places": [{"external_id": str(27992 + i)}]} for i in range(5)]}
+    client.post("/projects/bulk", json=payload, headers={"X-API-Key": api_key})
+
+    response = client.get("/projects/export?batch_size=2", headers={"X-API-Key": api_key})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["name"] for r in rows] == [f"P{i}" for i in range(5)]
+    assert all(len(r["places"]) == 1 and r["updated_at"] for r in rows)
+
+
+def test_export_projects_gzip_since(client, api_key, mock_get_artwork, project_data):
+    """Тест інкрементального експорту з gzip"""
+    import gzip
+    import json
+
+    client.post("/projects", json={**project_data, "name": "Old"}, headers={"X-API-Key": api_key})
+    first = client.post("/projects", json=project_data, headers={"X-API-Key": api_key}).json()
+    exported = client.get("/projects/export", headers={"X-API-Key": api_key}).text.splitlines()
+    since = json.loads(exported[-1])["updated_at"]
+
+    second = client.post("/projects", json={**project_data, "name": "Second"}, headers={"X-API-Key": api_key}).json()
+    client.patch(f"/projects/{first['id']}", json={"name": "Renamed"}, headers={"X-API-Key": api_key})
+
+    # Тільки проекти, змінені після першого експорту
+    response = client.get(
+        "/projects/export",
+        params={"since": since, "gzip": "true"},
+        headers={"X-API-Key": api_key}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    rows = [json.loads(line) for line in gzip.decompress(response.content).splitlines()]
+    assert {r["id"] for r in rows} == {first["id"], second["id"]}
+
+    later = max(r["updated_at"] for r in rows)
+    response = client.get("/projects/export", params={"since": later}, headers={"X-API-Key": api_key})
+    assert len(response.text.splitlines()) == 1
+
+
+def test_import_projects_ndjson(client, api_key, mock_get_artworks):
+    """Тест імпорту NDJSON пачками з помилками по рядках"""
+    import json
+
+    lines = [
+        json.dumps({"name": "P1", "places": [{"external_id": "27992"}]}),
+        json.dumps({"name": "P2", "places": []}),
+        "not json",
+        "",
+        json.dumps({"name": "P3", "places": [{"external_id": "invalid"}]}),
+        json.dumps({"name": "P4", "places": [{"external_id": "28560", "notes": "n"}]}),
+    ]
+    response = client.post(
+        "/projects/import?batch_size=2&import_id=test-import",
+        content="\n".join(lines).encode(),
+        headers={"X-API-Key": api_key, "Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "completed"
+    assert data["imported"] == 2
+    assert data["failed"] == 3
+    assert [e["line"] for e in data["errors"]] == [2, 3, 5]
+    assert data["last_line"] == 6
+
+    progress = client.get("/projects/import/test-import", headers={"X-API-Key": api_key}).json()
+    assert progress["imported"] == 2
+
+    listed = client.get("/projects", headers={"X-API-Key": api_key}).json()
+    assert {p["name"] for p in listed} == {"P1", "P4"}
+
+
+def test_import_projects_stops_while_artic_unavailable(client, api_key, mock_get_artworks):
+    """Тест що збій ArtIC зупиняє імпорт з 503 до нерозв'язаної пачки, а продовження її імпортує"""
+    import json
+    from app.services.artic_service import ArticUnavailable
+
+    resolve = mock_get_artworks.side_effect
+    mock_get_artworks.side_effect = [{"27992": {"id": 27992, "title": "Artwork"}}, ArticUnavailable("ArtIC API responded with HTTP 503")]
+    body = "\n".join(json.dumps({"name": f"P{i}", "places": [{"external_id": "27992"}]}) for i in range(1, 5)).encode()
+
+    response = client.post("/projects/import?batch_size=2", content=body, headers={"X-API-Key": api_key})
+    assert response.status_code == 503
+    data = response.json()
+    assert (data["status"], data["last_line"], data["imported"], data["failed"]) == ("failed", 2, 2, 0)
+    assert data["detail"] == "ArtIC API is unavailable, resume from line 3"
+
+    mock_get_artworks.side_effect = resolve
+    response = client.post("/projects/import?batch_size=2&resume_from=3", content=body, headers={"X-API-Key": api_key})
+    assert response.status_code == 200
+    assert response.json()["imported"] == 2
+    listed = client.get("/projects", headers={"X-API-Key": api_key}).json()
+    assert sorted(p["name"] for p in listed) == ["P1", "P2", "P3", "P4"]
+
+
+async def test_iter_lines_drops_oversized_lines():
+    """Тест що рядок, довший за ліміт, не буферизується навіть розбитий на багато чанків"""
+    from app.services.import_service import iter_lines
+
+    async def chunks():
+        for chunk in [b"ab\ncd", b"efgh", b"ijk\n", b"x" * 10, b"\nok\nlast", b"x" * 10]:
+            yield chunk
+
+    assert [item async for item in iter_lines(chunks(), max_line_bytes=5)] == [
+        (1, b"ab"), (2, None), (3, None), (4, b"ok"), (5, None),
+    ]
+
+
+def test_import_projects_oversized_line(client, api_key, mock_get_artworks, monkeypatch):
+    """Тест що задовгий рядок імпорту - помилка цього рядка, решта імпортується"""
+    import json
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "import_max_line_bytes", 100)
+
+    lines = [
+        json.dumps({"name": "P1", "places": [{"external_id": "27992"}]}),
+        json.dumps({"name": "x" * 200, "places": [{"external_id": "27992"}]}),
+        json.dumps({"name": "P3", "places": [{"external_id": "28560"}]}),
+    ]
+    response = client.post("/projects/import", content="\n".join(lines).encode(), headers={"X-API-Key": api_key})
+
+    data = response.json()
+    assert (data["imported"], data["last_line"]) == (2, 3)
+    assert data["errors"] == [{"line": 2, "detail": "Line is longer than 100 bytes"}]
+
+
+def test_import_projects_resume_and_skip_validation(client, api_key, mock_get_artworks):
+    """Тест продовження імпорту з resume_from та без перевірки в ArtIC"""
+    import json
+
+    lines = [json.dumps({"name": f"P{i}", "places": [{"external_id": f"x{i}", "title": f"Title {i}"}]}) for i in range(4)]
+    response = client.post(
+        "/projects/import?resume_from=3&skip_validation=true",
+        content="\n".join(lines).encode(),
+        headers={"X-API-Key": api_key}
+    )
+    data = response.json()
+    assert data["imported"] == 2
+    assert data["failed"] == 0
+    mock_get_artworks.assert_not_called()
+
+    listed = client.get("/projects", headers={"X-API-Key": api_key}).json()
+    assert {p["name"] for p in listed} == {"P2", "P3"}
+    detail = client.get(f"/projects/{listed[0]['id']}", headers={"X-API-Key": api_key}).json()
+    assert detail["places"][0]["title"] == "Title 3"
+
+
+def test_get_project_etag_not_modified(client, api_key, mock_get_artwork, project_data, test_db):
+    """Тест ETag та 304 для GET /projects/{id} одним запитом до БД"""
+    from sqlalchemy import event
+
+    create_response = client.post("/projects", json=project_data, headers={"X-API-Key": api_key})
+    project_id = create_response.json()["id"]
+    place_id = create_response.json()["places"][0]["id"]
+
+    response = client.get(f"/projects/{project_id}", headers={"X-API-Key": api_key})
+    etag = response.headers["etag"]
+
+    statements = []
+    engine = test_db.get_bind()
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = client.get(f"/projects/{project_id}", headers={"X-API-Key": api_key, "If-None-Match": etag})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+    assert len(statements) == 1
+    assert "project_places" not in statements[0]
+
+    # Зміна місця змінює версію проекту
+    client.patch(f"/projects/{project_id}/places/{place_id}", json={"visited": True}, headers={"X-API-Key": api_key})
+    response = client.get(f"/projects/{project_id}", headers={"X-API-Key": api_key, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+    # Як і зміна самого проекту
+    etag = response.headers["etag"]
+    client.patch(f"/projects/{project_id}", json={"name": "Renamed"}, headers={"X-API-Key": api_key})
+    response = client.get(f"/projects/{project_id}", headers={"X-API-Key": api_key, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Renamed"
+
+
+def wait_for_status(client, api_key, project_id, timeout=5.0):
+    import time
+    from app.services.project_jobs import project_jobs
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        data = client.get(f"/projects/{project_id}/status", headers={"X-API-Key": api_key}).json()
+        # Тестова БД - одне з'єднання на всі потоки, тож запит бачить і незакомічений status;
+        # чекаємо, поки воркер закомітить усю задачу
+        if data["status"] != "pending" and not project_jobs.in_progress:
+            return client.get(f"/projects/{project_id}/status", headers={"X-API-Key": api_key}).json()
+        time.sleep(0.02)
+    raise AssertionError("Project is still pending")
+
+
+def test_create_project_async(client, api_key, project_data):
+    """Тест асинхронного створення: 202, pending, потім active з назвами місць"""
+    async def mock_artworks(external_ids, strict=False):
+        return {i: {"id": int(i), "title": f"Artwork {i}"} for i in external_ids}
+
+    with patch("app.services.project_jobs.get_artworks", side_effect=mock_artworks):
+        response = client.post("/projects?async=true", json=project_data, headers={"X-API-Key": api_key})
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status"] == "pending"
+        assert data["status_url"] == f"/projects/{data['id']}/status"
+
+        status_data = wait_for_status(client, api_key, data["id"])
+
+    assert status_data == {"id": data["id"], "status": "active", "detail": None}
+    project = client.get(f"/projects/{data['id']}", headers={"X-API-Key": api_key}).json()
+    assert project["status"] == "active"
+    assert [p["title"] for p in project["places"]] == ["Artwork 27992", "Artwork 28560"]
+
+
+def test_create_project_async_failed(client, api_key, project_data):
+    """Тест що проект з невідомим місцем переходить у failed з причиною"""
+    async def mock_artworks(external_ids, strict=False):
+        return {"27992": {"id": 27992, "title": "Artwork"}}
+
+    with patch("app.services.project_jobs.get_artworks", side_effect=mock_artworks):
+        project_id = client.post("/projects?async=true", json=project_data, headers={"X-API-Key": api_key}).json()["id"]
+        status_data = wait_for_status(client, api_key, project_id)
+
+    assert status_data["status"] == "failed"
+    assert "28560" in status_data["detail"]
+
+
+def test_create_project_async_retries_while_artic_unavailable(client, api_key, project_data, monkeypatch):
+    """Тест що недоступність ArtIC лишає проект pending і повторює перевірку, а не робить його failed"""
+    from app.core.config import settings
+    from app.services.artic_service import ArticUnavailable
+    monkeypatch.setattr(settings, "project_job_retry_base_seconds", 0.05)
+    calls = []
+
+    async def mock_artworks(external_ids, strict=False):
+        calls.append(strict)
+        if len(calls) < 3:
+            raise ArticUnavailable("ArtIC API responded with HTTP 503")
+        return {i: {"id": int(i), "title": f"Artwork {i}"} for i in external_ids}
+
+    with patch("app.services.project_jobs.get_artworks", side_effect=mock_artworks):
+        project_id = client.post("/projects?async=true", json=project_data, headers={"X-API-Key": api_key}).json()["id"]
+        status_data = wait_for_status(client, api_key, project_id)
+
+    assert status_data["status"] == "active"
+    assert calls == [True, True, True]
+    assert client.get("/admin/jobs", headers={"X-API-Key": api_key}).json()["retried"] == 2
+
+
+def test_create_project_async_validates_payload_synchronously(client, api_key):
+    """Тест що помилки payload повертаються одразу, без фонової задачі"""
+    response = client.post(
+        "/projects?async=true",
+        json={"name": "Test", "places": [{"external_id": "1"}, {"external_id": "1"}]},
+        headers={"X-API-Key": api_key}
+    )
+    assert response.status_code == 409
+    assert client.get("/projects", headers={"X-API-Key": api_key}).json() == []
+
+
+def test_create_project_async_queue_full(client, api_key, project_data, monkeypatch):
+    """Тест 503, коли черга фонових задач заповнена"""
+    from app.services.project_jobs import project_jobs
+    monkeypatch.setattr(project_jobs, "has_capacity", lambda: False)
+
+    response = client.post("/projects?async=true", json=project_data, headers={"X-API-Key": api_key})
+    assert response.status_code == 503
+    assert client.get("/projects", headers={"X-API-Key": api_key}).json() == []
+
+    stats = client.get("/admin/jobs", headers={"X-API-Key": api_key}).json()
+    assert stats["queue_depth"] == 0
+    assert stats["workers"] > 0
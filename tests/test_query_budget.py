@@ -0,0 +1,70 @@
+import logging
+import pytest
+from app.core.config import settings
+
+
+@pytest.fixture
+def project(client, api_key, mock_get_artwork):
+    response = client.post("/projects", json={"name": "Trip", "places": [{"external_id": "27992"}, {"external_id": "28560"}]}, headers={"X-API-Key": api_key})
+    return response.json()
+
+
+@pytest.mark.parametrize("method, path, body, budget", [
+    ("GET", "/projects", None, 1),
+    ("GET", "/projects?include=places", None, 3),
+    ("GET", "/projects/{id}", None, 3),
+    ("GET", "/projects/{id}/places", None, 2),
+    ("GET", "/projects/search?q=trip", None, 2),
+    ("GET", "/stats", None, 3),
+    ("POST", "/projects", {"name": "New", "places": [{"external_id": "27992"}, {"external_id": "28560"}]}, 7),
+    ("POST", "/projects/{id}/places", {"external_id": "111628"}, 12),
+    ("PATCH", "/projects/{id}", {"name": "Renamed"}, 4),
+    ("PATCH", "/projects/{id}/places/{place_id}", {"visited": True}, 8),
+    ("PATCH", "/projects/{id}/places", {"places": [{"id": "{place_id}", "notes": "Closed on Mondays"}]}, 6),
+    ("DELETE", "/projects/{id}", None, 7),
+])
+def test_endpoint_query_budget(client, api_key, project, query_budget, method, path, body, budget):
+    """Тест бюджету SQL-запитів ендпоінтів: зайвий lazy load чи refresh ламає тест"""
+    ids = {"id": project["id"], "place_id": project["places"][0]["id"]}
+    if body is not None and "places" in body and method == "PATCH":
+        body = {"places": [{**p, "id": ids["place_id"]} for p in body["places"]]}
+    with query_budget(budget):
+        response = client.request(method, path.format(**ids), json=body, headers={"X-API-Key": api_key})
+    assert response.status_code < 300
+
+
+def test_query_budget_reports_statements(client, api_key, project, query_budget):
+    """Тест що перевищення бюджету показує виконані запити"""
+    with pytest.raises(AssertionError, match="(?s)budget is 1:.*FROM projects"):
+        with query_budget(1):
+            client.get(f"/projects/{project['id']}", headers={"X-API-Key": api_key})
+
+
+def test_query_stats_headers_in_debug(client, api_key, project, monkeypatch):
+    """Тест заголовків зі статистикою БД у debug-режимі"""
+    headers = {"X-API-Key": api_key}
+    assert "X-DB-Queries" not in client.get("/projects", headers=headers).headers
+
+    monkeypatch.setattr(settings, "debug", True)
+    response = client.get("/projects?include=places", headers=headers)
+    assert response.headers["X-DB-Queries"] == "3"
+    assert float(response.headers["X-DB-Time-Ms"]) > 0
+
+    # Запити під-запитів батча додаються до батча
+    response = client.post("/batch", json={"requests": [
+        {"method": "GET", "path": "/projects"},
+        {"method": "GET", "path": "/projects?include=places"},
+    ]}, headers=headers)
+    assert response.json()["responses"][1]["headers"]["x-db-queries"] == "3"
+    assert response.headers["X-DB-Queries"] == "4"
+
+
+def test_repeated_statement_is_logged(client, api_key, project, monkeypatch, caplog):
+    """Тест попередження про можливий N+1"""
+    monkeypatch.setattr(settings, "query_repeat_warn_threshold", 1)
+    with caplog.at_level(logging.INFO, logger="app.db"):
+        client.post("/projects", json={"name": "New", "places": [{"external_id": "27992"}, {"external_id": "28560"}]}, headers={"X-API-Key": api_key})
+
+    assert any("POST /projects 201: 7 queries" in r.message for r in caplog.records)
+    warning = next(r for r in caplog.records if r.name == "app.db" and r.levelno == logging.WARNING)
+    assert "repeated one statement 2 times, possible N+1: INSERT INTO project_places" in warning.message
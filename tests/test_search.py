@@ -0,0 +1,86 @@
+from sqlalchemy import insert
+from app.crud.search import match_terms
+from app.models import Project, ProjectPlace
+
+
+def seed(test_db):
+    test_db.add_all([
+        Project(name="Chicago Art Tour", description="Impressionists and modern art", places=[
+            ProjectPlace(external_id="27992", title="A Sunday on La Grande Jatte", notes="Seurat, must see"),
+        ]),
+        Project(name="Paris Museums", description="Louvre and Orsay", places=[
+            ProjectPlace(external_id="28560", title="The Bedroom", notes="Compare with the Chicago version"),
+        ]),
+        Project(name="Київ", description="Музеї та галереї", places=[
+            ProjectPlace(external_id="111628", title="Nighthawks", notes=None),
+        ]),
+    ])
+    test_db.commit()
+
+
+def search(client, api_key, q, **params):
+    response = client.get("/projects/search", params={"q": q, **params}, headers={"X-API-Key": api_key})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_search_ranks_name_matches_first(client, api_key, test_db):
+    """Тест що збіг у назві проекту важить більше за збіг у нотатках місця"""
+    seed(test_db)
+    results = search(client, api_key, "chicago")
+    assert [r["name"] for r in results] == ["Chicago Art Tour", "Paris Museums"]
+    assert results[0]["score"] > results[1]["score"]
+
+
+def test_search_place_text_prefix_and_unicode(client, api_key, test_db):
+    """Тест пошуку по назвах місць, префіксу останнього слова і кирилиці"""
+    seed(test_db)
+    assert [r["name"] for r in search(client, api_key, "grande jat")] == ["Chicago Art Tour"]
+    assert [r["name"] for r in search(client, api_key, "музе")] == ["Київ"]
+    assert search(client, api_key, "sunday bedroom") == []
+
+
+def test_search_terms_match_across_project_and_places(client, api_key, test_db):
+    """Тест що слова запиту можуть збігтися в різних рядках: у проекті й у його місцях"""
+    seed(test_db)
+    assert [r["name"] for r in search(client, api_key, "paris bedroom")] == ["Paris Museums"]
+    assert [r["name"] for r in search(client, api_key, "impressionists seurat")] == ["Chicago Art Tour"]
+    # Слова з різних проектів проект не проходить
+    assert search(client, api_key, "paris seurat") == []
+
+
+def test_search_pagination(client, api_key, test_db):
+    """Тест limit/offset"""
+    seed(test_db)
+    first = search(client, api_key, "chicago", limit=1)
+    second = search(client, api_key, "chicago", limit=1, offset=1)
+    assert [r["id"] for r in first + second] == [r["id"] for r in search(client, api_key, "chicago")]
+
+
+def test_search_index_follows_writes(client, api_key, mock_get_artwork, test_db):
+    """Тест що індекс синхронізується при створенні, зміні, bulk insert і видаленні"""
+    project_id = client.post(
+        "/projects",
+        json={"name": "Spring trip", "places": [{"external_id": "27992", "notes": "rooftop garden"}]},
+        headers={"X-API-Key": api_key}
+    ).json()["id"]
+    assert [r["id"] for r in search(client, api_key, "rooftop")] == [project_id]
+
+    client.patch(f"/projects/{project_id}", json={"name": "Autumn trip"}, headers={"X-API-Key": api_key})
+    assert search(client, api_key, "spring") == []
+    assert [r["id"] for r in search(client, api_key, "autumn")] == [project_id]
+
+    test_db.execute(insert(Project), [{"name": "Bulk imported voyage"}])
+    test_db.commit()
+    assert [r["name"] for r in search(client, api_key, "voyage")] == ["Bulk imported voyage"]
+
+    client.delete(f"/projects/{project_id}", headers={"X-API-Key": api_key})
+    assert search(client, api_key, "autumn") == []
+    assert search(client, api_key, "rooftop") == []
+
+
+def test_search_query_syntax_is_not_interpreted(client, api_key, test_db):
+    """Тест що оператори FTS5 у запиті не ламають пошук"""
+    seed(test_db)
+    assert match_terms('art OR "louvre" NEAR(') == ['"art"', '"OR"', '"louvre"', '"NEAR"*']
+    assert search(client, api_key, '"*:()') == []
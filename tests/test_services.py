@@ -1,7 +1,10 @@
+import asyncio
 import pytest
 from datetime import datetime, timezone
 from fastapi import HTTPException
+from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
+from app.core.db import Base
 from app.models import Project, ProjectPlace
 from app.services.project_service import (
     recompute_completed,
@@ -247,3 +250,57 @@ def test_update_place_recomputes_completed(test_db):
     update_place(test_db, project, place2, notes=None, visited=True)
     test_db.refresh(project)
     assert project.completed is True  # Всі відвідані
+
+
+@pytest.mark.asyncio
+async def test_add_place_releases_connection_during_artic_call(tmp_path):
+    """Тест що з'єднання повернуто в пул, поки триває запит до ArtIC"""
+    # Звичайний QueuePool (не StaticPool з test_db), щоб рахувати видані з'єднання
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    Base.metadata.create_all(bind=engine)
+    checked_out_during_call = []
+
+    async def artwork_checking_pool(external_id: str):
+        checked_out_during_call.append(engine.pool.checkedout())
+        await asyncio.sleep(0)
+        checked_out_during_call.append(engine.pool.checkedout())
+        return {"id": 27992, "title": "Test Artwork"}
+
+    db = Session(bind=engine)
+    try:
+        project = Project(name="Test", description="Test")
+        create(db, project)
+        assert engine.pool.checkedout() == 1
+
+        with patch("app.services.project_service.get_artwork", side_effect=artwork_checking_pool):
+            place = await add_place(db, project, "27992", "Test notes")
+        assert place.id is not None
+    finally:
+        db.close()
+        engine.dispose()
+
+    assert checked_out_during_call == [0, 0]
+
+
+@pytest.mark.asyncio
+async def test_add_place_project_deleted_during_artic_call(test_db):
+    """Тест що проект, видалений під час запиту до ArtIC, дає 404, а не місце без проекту"""
+    project = Project(name="Test", description="Test")
+    create(test_db, project)
+    project_id = project.id
+
+    async def artwork_while_deleting(external_id: str):
+        other = Session(bind=test_db.get_bind())
+        other.delete(other.get(Project, project_id))
+        other.commit()
+        other.close()
+        return {"id": 27992, "title": "Test Artwork"}
+
+    with patch("app.services.project_service.get_artwork", side_effect=artwork_while_deleting):
+        with pytest.raises(HTTPException) as exc:
+            await add_place(test_db, project, "27992", None)
+
+    assert exc.value.status_code == 404
+    assert exc.value.detail == "Project not found"
+    test_db.rollback()
+    assert test_db.query(ProjectPlace).filter_by(project_id=project_id).count() == 0
@@ -0,0 +1,86 @@
+import pytest
+from app.core.config import settings
+from app.core.slow_queries import SlowQueryLog, fingerprint, slow_query_log
+
+
+@pytest.fixture
+def slow_log(monkeypatch):
+    monkeypatch.setattr(settings, "slow_query_log_enabled", True)
+    slow_query_log.reset()
+    yield slow_query_log
+    slow_query_log.reset()
+
+
+@pytest.mark.parametrize("statement, expected", [
+    ("SELECT * FROM projects WHERE id = 12", "SELECT * FROM projects WHERE id = ?"),
+    ("SELECT * FROM projects  WHERE name = 'O''Hare'\n  LIMIT 10", "SELECT * FROM projects WHERE name = ? LIMIT ?"),
+    ("SELECT * FROM t WHERE id IN (?, ?, ?)", "SELECT * FROM t WHERE id IN (...)"),
+    ("SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s)", "SELECT * FROM t WHERE id IN (...)"),
+    ("SELECT * FROM t WHERE id = $1 AND x = :x", "SELECT * FROM t WHERE id = ? AND x = ?"),
+    ("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)", "INSERT INTO t (a, b) VALUES (?, ?), ..."),
+    ("SELECT anon_1.id FROM t AS anon_1 -- comment", "SELECT anon_1.id FROM t AS anon_1"),
+])
+def test_fingerprint(statement, expected):
+    """Тест нормалізації запиту у відбиток"""
+    assert fingerprint(statement) == expected
+
+
+def test_evicts_least_recently_seen_fingerprint():
+    """Тест обмеження кількості відбитків: витісняється найдавніше бачений, а не новий дешевий"""
+    log = SlowQueryLog(max_fingerprints=2)
+    log.record(None, "SELECT 1 FROM a", (), 0.5, False, threshold_ms=10000)
+    log.record(None, "SELECT 1 FROM b", (), 0.9, False, threshold_ms=10000)
+    log.record(None, "SELECT 1 FROM a", (), 0.5, False, threshold_ms=10000)
+    log.record(None, "SELECT 1 FROM c", (), 0.1, False, threshold_ms=10000)
+    # Новий дешевий відбиток переживає появу наступного і накопичує статистику
+    log.record(None, "SELECT 1 FROM c", (), 0.1, False, threshold_ms=10000)
+    log.record(None, "SELECT 1 FROM d", (), 0.2, False, threshold_ms=10000)
+
+    assert {r["fingerprint"]: r["calls"] for r in log.report()} == {"SELECT ? FROM c": 2, "SELECT ? FROM d": 1}
+    assert log.stats() == {"fingerprints": 2, "evicted": 2}
+
+
+def test_disabled_by_default(client, api_key):
+    """Тест що без SLOW_QUERY_LOG_ENABLED нічого не збирається"""
+    slow_query_log.reset()
+    client.get("/projects", headers={"X-API-Key": api_key})
+
+    data = client.get("/admin/slow-queries", headers={"X-API-Key": api_key}).json()
+    assert data["enabled"] is False
+    assert data["statements"] == []
+
+
+def test_aggregates_and_captures_plan(client, api_key, mock_get_artwork, slow_log, monkeypatch):
+    """Тест агрегації за відбитком і EXPLAIN QUERY PLAN для повільних запитів"""
+    headers = {"X-API-Key": api_key}
+    ids = [client.post("/projects", json={"name": f"Trip {i}", "places": [{"external_id": "27992"}]}, headers=headers).json()["id"] for i in range(3)]
+    slow_log.reset()
+
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 10000)
+    for project_id in ids[:2]:
+        client.get(f"/projects/{project_id}/places", headers=headers)
+    # Поріг 0: кожен запит повільний
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0)
+    client.get(f"/projects/{ids[2]}/places", headers=headers)
+
+    data = client.get("/admin/slow-queries?sort=calls", headers=headers).json()
+    assert data["enabled"] is True
+    places = next(s for s in data["statements"] if s["fingerprint"].startswith("SELECT project_places.id"))
+    assert places["calls"] == 3
+    assert places["slow_calls"] == 1
+    assert places["mean_ms"] <= places["max_ms"] <= places["total_ms"]
+    assert any("USING INDEX" in line for line in places["plan"])
+    assert places["plan_ms"] is not None
+
+    response = client.delete("/admin/slow-queries", headers=headers)
+    assert response.status_code == 204
+    assert slow_log.stats()["fingerprints"] == 0
+
+
+def test_slow_query_is_logged(client, api_key, slow_log, monkeypatch, caplog):
+    """Тест попередження в лог про повільний запит"""
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0)
+    with caplog.at_level("WARNING", logger="app.db"):
+        client.get("/projects", headers={"X-API-Key": api_key})
+
+    assert any(r.message.startswith("Slow query") and "FROM projects" in r.message for r in caplog.records)
@@ -0,0 +1,103 @@
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.cli import main
+from app.core.config import settings
+from app.models import Artwork
+from app.services import snapshot_service
+from app.services.snapshot_service import export_snapshot
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def read_dataset(out_dir, name):
+    """Усі розділи набору одним списком рядків, відсортованим за id"""
+    rows = pq.read_table(out_dir / name).to_pylist()
+    return sorted(rows, key=lambda row: row["id"])
+
+
+def create_projects(client, api_key, count):
+    return [
+        client.post("/projects", json={"name": f"P{i}", "places": [{"external_id": "27992"}, {"external_id": "28560"}]}, headers={"X-API-Key": api_key}).json()
+        for i in range(count)
+    ]
+
+
+def test_snapshot_exports_in_chunks_and_increments(client, api_key, mock_get_artwork, test_db, tmp_path):
+    """Тест що знімок пишеться пачками, а повторний запуск додає лише нові рядки"""
+    factory = sessionmaker(bind=test_db.get_bind())
+    create_projects(client, api_key, 3)
+
+    report = export_snapshot(factory, str(tmp_path), chunk_size=2)
+    assert report["projects"]["rows"] == 3
+    assert report["project_places"]["rows"] == 6
+    assert report["place_visits"]["rows"] == 6
+    assert pq.ParquetFile(tmp_path / report["project_places"]["files"][0]).metadata.num_row_groups == 3
+    assert pq.ParquetFile(tmp_path / report["projects"]["files"][0]).metadata.row_group(0).column(0).compression == "ZSTD"
+
+    new = create_projects(client, api_key, 1)[0]
+    place_id = new["places"][0]["id"]
+    client.patch(f"/projects/{new['id']}/places/{place_id}", json={"visited": True}, headers={"X-API-Key": api_key})
+
+    report = export_snapshot(factory, str(tmp_path), chunk_size=2)
+    assert report["projects"]["rows"] == 1
+    assert report["project_places"]["rows"] == 2
+    assert report["place_visits"]["rows"] == 2
+    assert report["artworks"]["rows"] == 0
+
+    assert len(read_dataset(tmp_path, "projects")) == 4
+    assert [row["id"] for row in read_dataset(tmp_path, "project_places")] == list(range(1, 9))
+    today = datetime.now(timezone.utc).date().isoformat()
+    assert any(f.startswith(f"place_visits/visited_date={today}/") for f in report["place_visits"]["files"])
+    assert [row["id"] for row in read_dataset(tmp_path, "place_visits") if row["visited"]] == [place_id]
+
+    # Змінене місце (тут - скасоване відвідування) експортується ще раз, хоч його id і старий
+    client.patch(f"/projects/{new['id']}/places/{place_id}", json={"visited": False, "notes": "later"}, headers={"X-API-Key": api_key})
+    report = export_snapshot(factory, str(tmp_path))
+    assert report["projects"]["rows"] == 1
+    assert report["project_places"]["rows"] == 1
+    assert [f.split("/")[1] for f in report["place_visits"]["files"]] == ["visited_date=__HIVE_DEFAULT_PARTITION__"]
+    latest = pq.read_table(tmp_path / report["project_places"]["files"][0]).to_pylist()
+    assert [(row["id"], row["visited"], row["notes"]) for row in latest] == [(place_id, False, "later")]
+
+    # Нічого нового - нових файлів теж немає
+    report = export_snapshot(factory, str(tmp_path))
+    assert all(entry["rows"] == 0 and entry["files"] == [] for entry in report.values())
+
+
+def test_snapshot_full_and_artworks(test_db, tmp_path):
+    """Тест повного знімка каталогу артефактів"""
+    factory = sessionmaker(bind=test_db.get_bind())
+    test_db.add_all([Artwork(id="27992", title="A Sunday on La Grande Jatte", artist_title="Georges Seurat"), Artwork(id="28560", title="The Bedroom")])
+    test_db.commit()
+
+    export_snapshot(factory, str(tmp_path), tables=["artworks"])
+    report = export_snapshot(factory, str(tmp_path), tables=["artworks"], full=True)
+    assert report["artworks"]["rows"] == 2
+    assert len(read_dataset(tmp_path, "artworks")) == 4
+
+    with pytest.raises(ValueError):
+        export_snapshot(factory, str(tmp_path), tables=["users"])
+
+
+def test_snapshot_endpoint(client, api_key, mock_get_artwork, tmp_path, monkeypatch):
+    """Тест адмін-ендпоінта знімка"""
+    monkeypatch.setattr(settings, "snapshot_dir", str(tmp_path))
+    create_projects(client, api_key, 1)
+
+    response = client.post("/admin/snapshot", params={"tables": ["projects"]}, headers={"X-API-Key": api_key})
+    assert response.status_code == 200
+    assert list(response.json()) == ["projects"]
+    assert response.json()["projects"]["rows"] == 1
+
+    assert client.post("/admin/snapshot", headers={}).status_code == 401
+
+    monkeypatch.setattr(snapshot_service, "pa", None)
+    assert client.post("/admin/snapshot", headers={"X-API-Key": api_key}).status_code == 501
+
+
+def test_snapshot_cli_rejects_running_snapshot(tmp_path, capsys):
+    """Тест що CLI не запускає другий знімок паралельно"""
+    with snapshot_service._snapshot_lock:
+        assert main(["snapshot", "--out", str(tmp_path)]) == 1
+    assert "already running" in capsys.readouterr().err
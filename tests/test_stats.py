@@ -0,0 +1,107 @@
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.db import Base
+from app.crud import stats as stats_crud
+from app.models import StatsCounter, DailyVisits, ArtworkPlaceCount
+from app.services.stats_service import reconcile
+
+
+def summary_tables(test_db):
+    """Вміст зведених таблиць у форматі compute_actual"""
+    test_db.expire_all()
+    counters = stats_crud.get_counters(test_db)
+    days = {day: visits for day, visits in test_db.execute(select(DailyVisits.day, DailyVisits.visits)) if visits}
+    artworks = {k: v for k, v in test_db.execute(select(ArtworkPlaceCount.external_id, ArtworkPlaceCount.places)) if v}
+    return counters, days, artworks
+
+
+def test_stats_follow_every_mutation(client, api_key, mock_get_artwork, test_db):
+    """Тест що інкрементальні оновлення збігаються з повним перерахунком після різних змін"""
+    headers = {"X-API-Key": api_key}
+    first = client.post("/projects", json={"name": "A", "places": [{"external_id": "27992"}, {"external_id": "28560"}]}, headers=headers).json()
+    second = client.post("/projects", json={"name": "B", "places": [{"external_id": "27992"}]}, headers=headers).json()
+
+    async def mock_artworks(external_ids, strict=False):
+        return {i: {"id": int(i), "title": f"Artwork {i}"} for i in external_ids}
+
+    with patch("app.services.project_service.get_artworks", side_effect=mock_artworks):
+        client.post("/projects/bulk", json={"projects": [{"name": "C", "places": [{"external_id": "27992"}]}]}, headers=headers)
+
+    place_a1, place_a2 = [p["id"] for p in first["places"]]
+    client.post(f"/projects/{second['id']}/places", json={"external_id": "111628"}, headers=headers)
+    client.patch(f"/projects/{first['id']}/places/{place_a1}", json={"visited": True}, headers=headers)
+    client.patch(f"/projects/{first['id']}/places", json={"places": [{"id": place_a2, "visited": True}]}, headers=headers)
+    client.patch(f"/projects/{first['id']}/places/{place_a1}", json={"visited": True}, headers=headers)
+    client.patch(f"/projects/{first['id']}/places/{place_a2}", json={"visited": False}, headers=headers)
+    client.patch(f"/projects/{first['id']}/places/{place_a2}", json={"visited": True}, headers=headers)
+    client.delete(f"/projects/{second['id']}", headers=headers)
+
+    assert summary_tables(test_db) == stats_crud.compute_actual(test_db)
+
+    stats = client.get("/stats", headers=headers).json()
+    assert stats["projects_total"] == 2
+    assert stats["projects_completed"] == 1
+    assert stats["completion_rate"] == 0.5
+    assert stats["places_total"] == 3
+    assert stats["places_visited"] == 2
+    assert stats["visits_per_day"] == [{"day": datetime.now(timezone.utc).date().isoformat(), "visits": 2}]
+    assert stats["top_artworks"][0] == {"external_id": "27992", "title": None, "places": 2}
+
+
+def test_reconcile_corrects_drift(client, api_key, mock_get_artwork, test_db):
+    """Тест що звірка виправляє розбіжності"""
+    client.post("/projects", json={"name": "A", "places": [{"external_id": "27992"}]}, headers={"X-API-Key": api_key})
+    test_db.merge(StatsCounter(name="projects_total", value=42))
+    test_db.add(DailyVisits(day=date(2020, 1, 1), visits=5))
+    test_db.commit()
+
+    drift = reconcile(sessionmaker(bind=test_db.get_bind()))
+
+    assert drift == {"projects_total": -41}
+    assert summary_tables(test_db) == stats_crud.compute_actual(test_db)
+    assert reconcile(sessionmaker(bind=test_db.get_bind())) == {}
+
+
+def test_stats_query_count_does_not_depend_on_data(client, api_key, mock_get_artwork, test_db):
+    """Тест що /stats - три запити до зведених таблиць, без сканування projects/project_places"""
+    for i in range(5):
+        client.post("/projects", json={"name": f"P{i}", "places": [{"external_id": "27992"}]}, headers={"X-API-Key": api_key})
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(test_db.get_bind(), "before_cursor_execute", listener)
+    try:
+        assert client.get("/stats", headers={"X-API-Key": api_key}).status_code == 200
+    finally:
+        event.remove(test_db.get_bind(), "before_cursor_execute", listener)
+
+    assert len(statements) == 3
+    assert not any("FROM projects" in s or "FROM project_places" in s for s in statements)
+
+
+def test_reconcile_holds_write_lock_while_computing(tmp_path):
+    """Тест що під час підрахунку звірки інша операція не може записати"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.db'}", connect_args={"timeout": 0})
+    Base.metadata.create_all(engine)
+    blocked = []
+    compute_actual = stats_crud.compute_actual
+
+    def concurrent_write(db):
+        with engine.connect() as other:
+            try:
+                other.execute(insert(StatsCounter).values(name="projects_total", value=1))
+                other.commit()
+            except OperationalError as e:
+                blocked.append(str(e.orig))
+        return compute_actual(db)
+
+    with patch("app.services.stats_service.stats_crud.compute_actual", side_effect=concurrent_write):
+        reconcile(sessionmaker(bind=engine))
+
+    assert blocked == ["database is locked"]
+    with Session(engine) as db:
+        assert stats_crud.get_counters(db)["projects_total"] == 0
+    engine.dispose()
@@ -0,0 +1,104 @@
+import json
+import httpx
+import pytest
+from app.core.config import settings
+from app.core.tracing import parse_traceparent, tracer
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+@pytest.fixture
+def tracing(monkeypatch, tmp_path):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(settings, "tracing_enabled", True)
+    tracer.configure(True, 1000, str(path))
+    yield path
+    tracer.close()
+    tracer.configure(False)
+
+
+@pytest.fixture
+def artic_requests(monkeypatch):
+    """Підміна HTTP-клієнта ArtIC: справжній get_artwork, без мережі"""
+    sent = []
+
+    async def fake_get(self, url, **kwargs):
+        sent.append((url, kwargs.get("headers", {})))
+        external_id = url.rsplit("/", 1)[-1]
+        return httpx.Response(200, json={"data": {"id": int(external_id), "title": f"Artwork {external_id}"}})
+
+    monkeypatch.setattr(httpx.AsyncClient, "get", fake_get)
+    return sent
+
+
+@pytest.mark.parametrize("value, expected", [
+    (f"00-{TRACE_ID}-00f067aa0ba902b7-01", (TRACE_ID, "00f067aa0ba902b7")),
+    (f"00-{TRACE_ID.upper()}-00f067aa0ba902b7-00", (TRACE_ID, "00f067aa0ba902b7")),
+    (f"00-{'0' * 32}-00f067aa0ba902b7-01", None),
+    (f"01-{TRACE_ID}-00f067aa0ba902b7-01", None),
+    ("garbage", None),
+    (None, None),
+])
+def test_parse_traceparent(value, expected):
+    """Тест розбору заголовка W3C traceparent"""
+    assert parse_traceparent(value) == expected
+
+
+def test_create_project_trace(tracing, client, api_key, artic_requests):
+    """Тест трасування POST /projects: сервіс, виклики ArtIC і SQL під спаном запиту"""
+    headers = {"X-API-Key": api_key}
+    response = client.post("/projects", json={"name": "Trip", "places": [{"external_id": "27992"}, {"external_id": "28560"}]}, headers=headers)
+    assert response.status_code == 201
+    trace_id = parse_traceparent(response.headers["traceparent"])[0]
+
+    spans = client.get(f"/admin/traces/{trace_id}", headers=headers).json()
+    by_name = {}
+    for span in spans:
+        by_name.setdefault(span["name"], []).append(span)
+    root = by_name["HTTP POST /projects"][0]
+    service = by_name["project_service.create_project_with_places"][0]
+    artic = by_name["artic.get_artwork"]
+
+    assert root["parent_id"] is None
+    assert root["attributes"]["http.status_code"] == 201
+    assert service["parent_id"] == root["span_id"]
+    assert [a["attributes"]["external_id"] for a in artic] == ["27992", "28560"]
+    assert all(a["parent_id"] == service["span_id"] for a in artic)
+    assert any("INSERT INTO project_places" in q["attributes"]["db.statement"] for q in by_name["db.query"])
+
+    # Вихідні запити в ArtIC несуть контекст свого спану
+    sent_parents = [parse_traceparent(h["traceparent"]) for _, h in artic_requests]
+    assert sent_parents == [(trace_id, a["span_id"]) for a in artic]
+
+    [summary] = [t for t in client.get("/admin/traces", headers=headers).json() if t["trace_id"] == trace_id]
+    assert summary["root"]["name"] == "HTTP POST /projects"
+    assert summary["spans"] == len(spans)
+
+    tracer.close()
+    exported = [json.loads(line) for line in tracing.read_text().splitlines()]
+    assert {s["span_id"] for s in spans} <= {s["span_id"] for s in exported if s["trace_id"] == trace_id}
+
+
+def test_incoming_traceparent_continues_trace(tracing, client, api_key):
+    """Тест продовження траси клієнта"""
+    headers = {"X-API-Key": api_key, "traceparent": f"00-{TRACE_ID}-00f067aa0ba902b7-01"}
+    response = client.get("/projects", headers=headers)
+    assert parse_traceparent(response.headers["traceparent"])[0] == TRACE_ID
+    # Спан запиту з віддаленим батьком теж скидає файл, без tracer.close()
+    exported = [json.loads(line) for line in tracing.read_text().splitlines()]
+
+    spans = client.get(f"/admin/traces/{TRACE_ID}", headers={"X-API-Key": api_key}).json()
+    root = next(s for s in spans if s["name"] == "HTTP GET /projects")
+    assert root["parent_id"] == "00f067aa0ba902b7"
+    assert any(s["name"] == "db.query" and s["parent_id"] == root["span_id"] for s in spans)
+    assert root["span_id"] in {s["span_id"] for s in exported}
+
+    [summary] = [t for t in client.get("/admin/traces", headers={"X-API-Key": api_key}).json() if t["trace_id"] == TRACE_ID]
+    assert summary["root"]["name"] == "HTTP GET /projects"
+
+
+def test_tracing_disabled_by_default(client, api_key):
+    """Тест що без TRACING_ENABLED заголовок traceparent не додається"""
+    response = client.get("/projects", headers={"X-API-Key": api_key})
+    assert "traceparent" not in response.headers
+    assert client.get(f"/admin/traces/{TRACE_ID}", headers={"X-API-Key": api_key}).status_code == 404